@@ -0,0 +1,280 @@
+"""Module that measures how long the screens take to render on synthetic data, without a terminal
+
+Run it as `python -m calcure.benchmark`, it prints one JSON line per view, scenario, and dataset.
+With `--allocations=500` it instead prints the memory allocated per frame of a journal of 500 tasks,
+with and without the cache of formatted views, counting blocks that are still used at the end of the frame."""
+
+import sys
+import json
+import time
+import random
+import getopt
+import datetime
+
+from calcure.headless import FakeWindow, headless_curses
+from calcure.data import *
+
+
+# Numbers of events and tasks in each dataset:
+DATASETS = {
+        "small":  (1000, 100),
+        "medium": (10000, 1000),
+        "large":  (100000, 10000),
+        }
+
+# Data starts on a fixed date, so that every run renders the same:
+START_DATE = datetime.date(2024, 1, 1)
+DAYS_OF_DATA = 2*365
+
+
+def generate_events(number, seed=1, start_date=START_DATE):
+    """Create events spread over two years, with some repeated for a long time"""
+    rng = random.Random(seed)
+    user_events = Events()
+    frequencies = [Frequency.DAILY, Frequency.WEEKLY, Frequency.MONTHLY, Frequency.YEARLY]
+    statuses = [Status.NORMAL]*8 + [Status.DONE, Status.IMPORTANT, Status.UNIMPORTANT]
+    for item_id in range(number):
+        date = start_date + datetime.timedelta(days=rng.randrange(DAYS_OF_DATA))
+
+        # About one event in a hundred repeats, up to a thousand times:
+        if rng.random() < 0.01:
+            frequency = rng.choice(frequencies)
+            repetition = rng.randint(2, 1000)
+        else:
+            frequency = Frequency.ONCE
+            repetition = 1
+        name = f"Event {item_id} {rng.choice(['meeting', 'flight', 'call', 'lunch', 'review'])}"
+        user_events.items.append(UserEvent(item_id, date.year, date.month, date.day, name, repetition,
+                                           frequency, rng.choice(statuses), rng.random() < 0.05))
+    user_events.changed = False
+    return user_events
+
+
+def generate_tasks(number, seed=2, start_date=START_DATE):
+    """Create tasks with subtasks, deadlines, and timers"""
+    rng = random.Random(seed)
+    user_tasks = Tasks()
+    statuses = [Status.NORMAL]*6 + [Status.DONE, Status.IMPORTANT, Status.UNIMPORTANT]
+    started = int(time.time()) - 3600
+    for item_id in range(number):
+        prefix = rng.choice(["", "", "", "--", "----"])
+        name = f"{prefix}Task {item_id} {rng.choice(['write', 'read', 'fix', 'buy', 'plan'])}"
+
+        # Some tasks have timers, which are paused or still counting:
+        chance = rng.random()
+        if chance < 0.02:
+            stamps = [started]
+        elif chance < 0.1:
+            stamps = [started, started + rng.randrange(3600)]
+        else:
+            stamps = []
+
+        # Some tasks have deadlines:
+        if rng.random() < 0.2:
+            date = start_date + datetime.timedelta(days=rng.randrange(DAYS_OF_DATA))
+            year, month, day = date.year, date.month, date.day
+        else:
+            year, month, day = 0, 0, 0
+        user_tasks.items.append(Task(item_id, name, rng.choice(statuses), Timer(stamps),
+                                     rng.random() < 0.05, year, month, day))
+    user_tasks.changed = False
+    return user_tasks
+
+
+def percentile(times, fraction):
+    """Find the time below which the fraction of the sorted times are"""
+    index = max(0, min(len(times) - 1, int(len(times)*fraction + 0.5) - 1))
+    return times[index]
+
+
+def measure(view, screen, step, frames):
+    """Render the view for a number of frames, changing the screen before each of them, and summarize the times"""
+    times = []
+    for frame in range(frames + 1):
+        if frame > 0:
+            step(screen)
+        start = time.perf_counter()
+        screen.update_frame()
+        view.fill_background()
+        view.render()
+        times.append((time.perf_counter() - start)*1000)
+
+    # The first frame builds the caches, so it is reported separately:
+    first_time = times.pop(0)
+    times.sort()
+    return {
+            "frames":   frames,
+            "first_ms": round(first_time, 3),
+            "mean_ms":  round(sum(times)/len(times), 3),
+            "p99_ms":   round(percentile(times, 0.99), 3),
+            "max_ms":   round(times[-1], 3),
+            }
+
+
+def measure_allocations(view, screen, frames):
+    """Render the view for a number of frames and summarize the memory allocated while each of them is drawn"""
+    import tracemalloc
+    import calcure.headless
+
+    # The first frame builds the caches, so it is not counted:
+    screen.update_frame()
+    view.fill_background()
+    view.render()
+
+    # Traces are cleared before each frame, so that only blocks allocated during the frame are counted,
+    # except those of the fake window, which a terminal would not allocate:
+    fake_window = [tracemalloc.Filter(False, calcure.headless.__file__)]
+    sizes = []
+    blocks = []
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            screen.update_frame()
+            tracemalloc.clear_traces()
+            view.fill_background()
+            view.render()
+            statistics = tracemalloc.take_snapshot().filter_traces(fake_window).statistics("filename")
+            sizes.append(sum(statistic.size for statistic in statistics))
+            blocks.append(sum(statistic.count for statistic in statistics))
+    finally:
+        tracemalloc.stop()
+    return {
+            "frames":      frames,
+            "mean_kib":    round(sum(sizes)/len(sizes)/1024, 1),
+            "max_kib":     round(max(sizes)/1024, 1),
+            "mean_blocks": round(sum(blocks)/len(blocks), 1),
+            }
+
+
+class DisabledViewCache:
+    """Cache that formats every item again in every frame, keeping the views only until the next one"""
+
+    def __init__(self):
+        self.views = []
+
+    def new_frame(self):
+        self.views = []
+
+    def get(self, key):
+        return None
+
+    def add(self, key, view):
+        self.views.append(view)
+        return view
+
+
+def allocation_scenarios(user_tasks, weather, screen, window):
+    """Yield the journal view with and without the cache of formatted task views"""
+    from calcure.interface import JournalScreenView
+
+    journal_view = JournalScreenView(window, 0, 0, weather, user_tasks, screen)
+    yield "journal", True, journal_view
+    journal_view = JournalScreenView(window, 0, 0, weather, user_tasks, screen)
+    journal_view.view_cache = DisabledViewCache()
+    yield "journal", False, journal_view
+
+
+def scenarios(user_events, user_tasks, weather, screen, window):
+    """Yield the views with the ways the screen changes between their frames"""
+    from calcure.interface import MonthlyScreenView, DailyScreenView, JournalScreenView
+
+    month_models = MonthModelCache(user_events, user_tasks, Events(), Birthdays())
+    monthly_view = MonthlyScreenView(window, 0, 0, weather, month_models, screen)
+    daily_view = DailyScreenView(window, 0, 0, weather, month_models, screen)
+    journal_view = JournalScreenView(window, 0, 0, weather, user_tasks, screen)
+
+    def page_down(screen):
+        screen.journal_offset += screen.y_max - 3
+        if screen.journal_offset >= len(user_tasks.items):
+            screen.journal_offset = 0
+
+    yield "monthly", "redraw", monthly_view, lambda screen: None
+    yield "monthly", "navigate", monthly_view, lambda screen: screen.next_month()
+    yield "daily", "redraw", daily_view, lambda screen: None
+    yield "daily", "navigate", daily_view, lambda screen: screen.next_day()
+    yield "journal", "redraw", journal_view, lambda screen: None
+    yield "journal", "scroll", journal_view, page_down
+
+
+def run(dataset_names, frames, y_max, x_max, output=sys.stdout):
+    """Measure all scenarios on the datasets and print the results as JSON lines"""
+    from calcure.screen import Screen
+    from calcure.weather import Weather
+
+    with headless_curses(y_max, x_max):
+        for name in dataset_names:
+            number_of_events, number_of_tasks = DATASETS[name]
+            user_events = generate_events(number_of_events)
+            user_tasks = generate_tasks(number_of_tasks)
+            window = FakeWindow(y_max, x_max)
+            weather = Weather("")
+            screen = Screen(window, False, AppState.CALENDAR, False, 25, False)
+
+            for view_name, scenario, view, step in scenarios(user_events, user_tasks, weather, screen, window):
+                screen.year, screen.month, screen.day = 2024, 6, 15
+                screen.journal_offset = 0
+                screen.calendar_state = CalState.DAILY if view_name == "daily" else CalState.MONTHLY
+                result = {"view": view_name, "scenario": scenario, "dataset": name,
+                          "events": number_of_events, "tasks": number_of_tasks}
+                result.update(measure(view, screen, step, frames))
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+
+
+def run_allocations(number_of_tasks, frames, x_max, output=sys.stdout):
+    """Measure memory allocated per frame of the journal with all tasks shown, with and without the view cache"""
+    from calcure.screen import Screen
+    from calcure.weather import Weather
+
+    # Screen is tall enough for every task to be drawn in every frame:
+    y_max = number_of_tasks + 10
+    with headless_curses(y_max, x_max):
+        user_tasks = generate_tasks(number_of_tasks)
+        window = FakeWindow(y_max, x_max)
+        screen = Screen(window, False, AppState.JOURNAL, False, 25, False)
+        for view_name, view_cache, view in allocation_scenarios(user_tasks, Weather(""), screen, window):
+            result = {"view": view_name, "scenario": "allocations", "tasks": number_of_tasks, "view_cache": view_cache}
+            result.update(measure_allocations(view, screen, frames))
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+
+def cli():
+    """Read the options of the benchmark and run it"""
+    usage = ("Usage: python -m calcure.benchmark [--datasets=small,medium,large] [--frames=200] [--size=40x120]\n"
+             "       python -m calcure.benchmark --allocations=500 [--frames=200] [--size=40x120]")
+    try:
+        opts, _ = getopt.getopt(sys.argv[1:], "h", ["datasets=", "frames=", "size=", "allocations=", "help"])
+    except getopt.GetoptError as error:
+        sys.exit(f"{error}\n{usage}")
+
+    dataset_names = list(DATASETS)
+    frames = 200
+    y_max, x_max = 40, 120
+    journal_tasks = None
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            print(usage)
+            return
+        try:
+            if opt == "--datasets":
+                dataset_names = [name.strip() for name in arg.split(",")]
+                unknown = [name for name in dataset_names if name not in DATASETS]
+                if unknown:
+                    sys.exit(f"Unknown datasets: {', '.join(unknown)}\n{usage}")
+            elif opt == "--frames":
+                frames = max(1, int(arg))
+            elif opt == "--size":
+                y_max, x_max = (int(number) for number in arg.lower().split("x"))
+            elif opt == "--allocations":
+                journal_tasks = max(1, int(arg))
+        except ValueError:
+            sys.exit(f"Invalid value of {opt}: {arg}\n{usage}")
+    if journal_tasks:
+        run_allocations(journal_tasks, frames, x_max)
+    else:
+        run(dataset_names, frames, y_max, x_max)
+
+
+if __name__ == "__main__":
+    cli()
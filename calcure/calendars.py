@@ -4,8 +4,6 @@ import enum
 import datetime
 from itertools import repeat
 
-import jdatetime
-
 
 class Calendar:
     """
@@ -21,6 +19,7 @@ class Calendar:
     def last_day(self, year, month):
         """Return the number of the last day of the month"""
         if self.use_persian_calendar:
+            import jdatetime
             isleap = jdatetime.date(year, 1, 1).isleap()
             mdays = [0, 31, 31, 31, 31, 31, 31, 30, 30, 30, 30, 30, 29]
             ndays = mdays[month] + (month == 2 and isleap)
@@ -34,6 +33,7 @@ class Calendar:
     def first_day(self, year, month):
         """Return weekday of the first day of the month"""
         if self.use_persian_calendar:
+            import jdatetime
             return jdatetime.date(year, month, 1).weekday()
         return datetime.date(year, month, 1).weekday()
 
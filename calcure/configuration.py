@@ -1,23 +1,60 @@
 """This module creates and loads user config file"""
 
 import os
-import pathlib
-import configparser
+import time
+import marshal
 import sys
 import getopt
 
-from calcure.data import AppState
+from calcure.data import AppState, CalendarFile, CALENDAR_COLORS_START
 
 
+__version__ = "2.4.1"
+
+# Command line options recognized by the program:
+SHORT_OPTIONS = "pjhvi"
+LONG_OPTIONS = ["folder=", "config=", "task=", "event=", "export=", "from=", "to=", "output=",
+                "holidays", "birthdays", "daemon", "agenda=", "next=", "tasks", "status=", "json",
+                "instrument", "overlay", "cprofile=", "profile-startup"]
+
+# Settings that change only after restart, because the data was already loaded with them:
+RESTART_SETTINGS = {"LANG", "USE_PERSIAN_CALENDAR", "HOLIDAY_COUNTRY", "BIRTHDAYS_FROM_ABOOK",
+                    "data_folder", "EVENTS_FILE", "TASKS_FILE", "CALENDARS"}
+
 class Config:
     """User configuration loaded from the config.ini file"""
-    def __init__(self):
-        self.taskwarrior_folder   = str(pathlib.Path.home()) + "/.task"
-        self.calcurse_todo_file   = str(pathlib.Path.home()) + "/.local/share/calcurse/todo"
-        self.calcurse_events_file = str(pathlib.Path.home()) + "/.local/share/calcurse/apts"
-        self.config_folder        = str(pathlib.Path.home()) + "/.config/calcure"
-        self.config_file          = self.config_folder + "/config.ini"
+    def __init__(self, config_file=None):
+        home = os.path.expanduser("~")
+        cache_folder = os.environ.get("XDG_CACHE_HOME") or home + "/.cache"
+        self.taskwarrior_folder   = home + "/.task"
+        self.calcurse_todo_file   = home + "/.local/share/calcurse/todo"
+        self.calcurse_events_file = home + "/.local/share/calcurse/apts"
+        self.config_folder        = home + "/.config/calcure"
+        self.config_file          = config_file or self.config_folder + "/config.ini"
+        self.cache_file           = cache_folder + "/calcure/config.cache"
         self.is_first_run         = True
+        self.loaded               = False
+        self.config_key           = None
+        self.version              = 0
+        self.load_time            = 0
+        self.argument_settings    = set()
+
+    def __getattr__(self, name):
+        """Load the config when a setting is needed before the program loaded it"""
+        if name.isupper() and not self.__dict__.get("loaded", True):
+            self.load()
+            return getattr(self, name)
+        raise AttributeError(f"'Config' object has no attribute '{name}'")
+
+    def load(self):
+        """Create the config file if needed, and read it and the user arguments"""
+        load_start = time.perf_counter()
+        self.loaded = True
+        self.create_config_file()
+        self.read_config_file_from_user_arguments()
+        self.read_config_file()
+        self.read_parameters_from_user_arguments()
+        self.load_time = time.perf_counter() - load_start
 
     def create_config_file(self):
         """Create config.ini file if it does not exist"""
@@ -25,6 +62,8 @@ class Config:
             self.is_first_run = False
             return
 
+        import configparser
+
         if not os.path.exists(self.config_folder):
             os.makedirs(self.config_folder)
 
@@ -41,6 +80,10 @@ class Config:
                 "privacy_mode":              "No",
                 "show_weather":              "No",
                 "weather_city":              "",
+                "weather_cache_minutes":     "30",
+                "weather_url":               "https://wttr.in",
+                "weather_timeout":           "2",
+                "weather_refresh_minutes":   "30",
                 "minimal_today_indicator":   "Yes",
                 "minimal_days_indicator":    "Yes",
                 "minimal_weekend_indicator": "Yes",
@@ -54,10 +97,15 @@ class Config:
                 "holiday_country":           "UnitedStates",
                 "use_persian_calendar":      "No",
                 "start_week_day":            "1",
+                "agenda_days":               "14",
                 "weekend_days":              "6,7",
                 "refresh_interval":          "1",
+                "show_seconds_after_hour":   "Yes",
                 "split_screen":              "Yes",
                 "right_pane_percentage":     "25",
+                "archive_events_after_months": "0",
+                "archive_tasks_after_days":  "0",
+                "compress_archive":          "No",
                 "journal_header":            "JOURNAL",
                 "event_icon":                "•",
                 "privacy_icon":              "•",
@@ -168,129 +216,238 @@ class Config:
             conf.write(f)
 
     def read_config_file(self):
-        """Read user config.ini file and assign values to all the global variables"""
-        try:
-            conf = configparser.ConfigParser()
-            conf.read(self.config_file, 'utf-8')
-
-            # Reading default view:
-            default_view = conf.get("Parameters", "default_view", fallback="calendar")
-            if default_view == 'journal':
-                self.DEFAULT_VIEW = AppState.JOURNAL
-            else:
-                self.DEFAULT_VIEW = AppState.CALENDAR
-
-            # Calendar settings:
-            self.SHOW_KEYBINDINGS          = conf.getboolean("Parameters", "show_keybindings", fallback=True)
-            self.MINIMAL_TODAY_INDICATOR   = conf.getboolean("Parameters", "minimal_today_indicator", fallback=True)
-            self.MINIMAL_DAYS_INDICATOR    = conf.getboolean("Parameters", "minimal_days_indicator", fallback=True)
-            self.MINIMAL_WEEKEND_INDICATOR = conf.getboolean("Parameters", "minimal_weekend_indicator", fallback=True)
-            self.ASK_CONFIRMATIONS         = conf.getboolean("Parameters", "ask_confirmations", fallback=True)
-            self.SHOW_WEATHER              = conf.getboolean("Parameters", "show_weather", fallback=False)
-            self.SHOW_CURRENT_TIME         = conf.getboolean("Parameters", "show_current_time", fallback=False)
-            self.DISPLAY_ICONS             = conf.getboolean("Parameters", "use_unicode_icons", fallback=True)
-            self.DISPLAY_HOLIDAYS          = conf.getboolean("Parameters", "show_holidays", fallback=True)
-            self.PRIVACY_MODE              = conf.getboolean("Parameters", "privacy_mode", fallback=False)
-            self.CUT_TITLES                = conf.getboolean("Parameters", "cut_titles_by_cell_length", fallback=False)
-            self.BIRTHDAYS_FROM_ABOOK      = conf.getboolean("Parameters", "birthdays_from_abook", fallback=True)
-            self.SPLIT_SCREEN              = conf.getboolean("Parameters", "split_screen", fallback=True)
-            self.SHOW_NOTHING_PLANNED      = conf.getboolean("Parameters", "show_nothing_planned", fallback=True)
-            self.SHOW_CALENDAR_BOARDERS    = conf.getboolean("Parameters", "show_calendar_boarders", fallback=False)
-            self.USE_PERSIAN_CALENDAR      = conf.getboolean("Parameters", "use_persian_calendar", fallback=False)
-            self.LANG                      = conf.get("Parameters", "language", fallback="en")
-            self.START_WEEK_DAY            = int(conf.get("Parameters", "start_week_day", fallback=1))
-            self.WEEKEND_DAYS              = conf.get("Parameters", "weekend_days", fallback="6,7")
-            self.WEEKEND_DAYS              = [int(i) for i in self.WEEKEND_DAYS.split(",")]
-            self.HOLIDAY_COUNTRY  = conf.get("Parameters", "holiday_country", fallback="UnitedStates")
-            self.WEATHER_CITY     = conf.get("Parameters", "weather_city", fallback="")
-
-            # Journal settings:
-            self.CALCURSE_TODO_FILE    = conf.get("Parameters", "calcurse_todo_file", fallback=self.calcurse_todo_file)
-            self.CALCURSE_EVENTS_FILE  = conf.get("Parameters", "calcurse_events_file", fallback=self.calcurse_events_file)
-            self.TASKWARRIOR_FOLDER    = conf.get("Parameters", "taskwarrior_folder", fallback=self.taskwarrior_folder)
-            self.JOURNAL_HEADER        = conf.get("Parameters", "journal_header", fallback="JOURNAL")
-            self.SHOW_KEYBINDINGS      = conf.getboolean("Parameters", "show_keybindings", fallback=True)
-            self.DONE_ICON             = conf.get("Parameters", "done_icon", fallback="✔") if self.DISPLAY_ICONS else "×"
-            self.TODO_ICON             = conf.get("Parameters", "todo_icon", fallback="•") if self.DISPLAY_ICONS else "·"
-            self.IMPORTANT_ICON        = conf.get("Parameters", "important_icon", fallback="‣") if self.DISPLAY_ICONS else "!"
-            self.REFRESH_INTERVAL      = int(conf.get("Parameters", "refresh_interval", fallback=1))
-            self.RIGHT_PANE_PERCENTAGE = int(conf.get("Parameters", "right_pane_percentage", fallback=25))
-
-            # Calendar colors:
-            self.COLOR_TODAY           = int(conf.get("Colors", "color_today", fallback=2))
-            self.COLOR_EVENTS          = int(conf.get("Colors", "color_events", fallback=4))
-            self.COLOR_DAYS            = int(conf.get("Colors", "color_days", fallback=7))
-            self.COLOR_DAY_NAMES       = int(conf.get("Colors", "color_day_names", fallback=4))
-            self.COLOR_WEEKENDS        = int(conf.get("Colors", "color_weekends", fallback=1))
-            self.COLOR_WEEKEND_NAMES   = int(conf.get("Colors", "color_weekend_names", fallback=1))
-            self.COLOR_HINTS           = int(conf.get("Colors", "color_hints", fallback=7))
-            self.COLOR_PROMPTS         = int(conf.get("Colors", "color_prompts", fallback=7))
-            self.COLOR_BIRTHDAYS       = int(conf.get("Colors", "color_birthdays", fallback=1))
-            self.COLOR_HOLIDAYS        = int(conf.get("Colors", "color_holidays", fallback=2))
-            self.COLOR_DEADLINES       = int(conf.get("Colors", "color_deadlines", fallback=3))
-            self.COLOR_CONFIRMATIONS   = int(conf.get("Colors", "color_confirmations", fallback=1))
-            self.COLOR_TIMER           = int(conf.get("Colors", "color_timer", fallback=2))
-            self.COLOR_TIMER_PAUSED    = int(conf.get("Colors", "color_timer_paused", fallback=7))
-            self.COLOR_TIME            = int(conf.get("Colors", "color_time", fallback=7))
-            self.COLOR_WEATHER         = int(conf.get("Colors", "color_weather", fallback=2))
-            self.COLOR_BACKGROUND      = int(conf.get("Colors", "color_background", fallback=-1))
-            self.COLOR_CALENDAR_HEADER = int(conf.get("Colors", "color_calendar_header", fallback=4))
-            self.COLOR_ACTIVE_PANE     = int(conf.get("Colors", "color_active_pane", fallback=2))
-            self.COLOR_SEPARATOR       = int(conf.get("Colors", "color_separator", fallback=7))
-            self.COLOR_CALENDAR_BOARDER= int(conf.get("Colors", "color_calendar_border", fallback=7))
-
-            # Journal colors:
-            self.COLOR_TODO           = int(conf.get("Colors", "color_todo", fallback=7))
-            self.COLOR_DONE           = int(conf.get("Colors", "color_done", fallback=6))
-            self.COLOR_TITLE          = int(conf.get("Colors", "color_title", fallback=1))
-            self.COLOR_IMPORTANT      = int(conf.get("Colors", "color_important", fallback=1))
-            self.COLOR_UNIMPORTANT    = int(conf.get("Colors", "color_unimportant", fallback=6))
-
-            # Font styles:
-            self.BOLD_TODAY               = conf.getboolean("Styles", "bold_today", fallback=False)
-            self.BOLD_DAYS                = conf.getboolean("Styles", "bold_days", fallback=False)
-            self.BOLD_DAY_NAMES           = conf.getboolean("Styles", "bold_day_names", fallback=False)
-            self.BOLD_WEEKENDS            = conf.getboolean("Styles", "bold_weekends", fallback=False)
-            self.BOLD_WEEKEND_NAMES       = conf.getboolean("Styles", "bold_weekend_names", fallback=False)
-            self.BOLD_TITLE               = conf.getboolean("Styles", "bold_title", fallback=False)
-            self.BOLD_ACTIVE_PANE         = conf.getboolean("Styles", "bold_active_pane", fallback=False)
-            self.UNDERLINED_TODAY         = conf.getboolean("Styles", "underlined_today", fallback=False)
-            self.UNDERLINED_DAYS          = conf.getboolean("Styles", "underlined_days", fallback=False)
-            self.UNDERLINED_DAY_NAMES     = conf.getboolean("Styles", "underlined_day_names", fallback=False)
-            self.UNDERLINED_WEEKENDS      = conf.getboolean("Styles", "underlined_weekends", fallback=False)
-            self.UNDERLINED_WEEKEND_NAMES = conf.getboolean("Styles", "underlined_weekend_names", fallback=False)
-            self.UNDERLINED_TITLE         = conf.getboolean("Styles", "underlined_title", fallback=False)
-            self.UNDERLINED_ACTIVE_PANE   = conf.getboolean("Styles", "underlined_active_pane", fallback=False)
-
-            # Icons:
-            self.TODAY_ICON       = conf.get("Parameters", "today_icon", fallback="•") if self.DISPLAY_ICONS else "·"
-            self.PRIVACY_ICON     = conf.get("Parameters", "privacy_icon", fallback="•") if self.DISPLAY_ICONS else "·"
-            self.HIDDEN_ICON      = conf.get("Parameters", "hidden_icon", fallback="...")
-            self.EVENT_ICON       = conf.get("Parameters", "event_icon", fallback="•") if self.DISPLAY_ICONS else "·"
-            self.BIRTHDAY_ICON    = conf.get("Parameters", "birthday_icon", fallback="★") if self.DISPLAY_ICONS else "·"
-            self.HOLIDAY_ICON     = conf.get("Parameters", "holiday_icon", fallback="☘️") if self.DISPLAY_ICONS else "·"
-            self.SEPARATOR_ICON   = conf.get("Parameters", "separator_icon", fallback="│")
-            self.DEADLINE_ICON    = conf.get("Parameters", "deadline_icon", fallback="⚑") if self.DISPLAY_ICONS else "·"
+        """Assign settings from user config.ini file, or from their cache if the file has not changed"""
+        key = self.config_file_key()
+        settings = self.read_cached_settings(key)
+        if settings is None:
             try:
-                self.ICONS = {word: icon for (word, icon) in conf.items("Event icons")}
-            except configparser.NoSectionError:
-                self.ICONS = {}
+                settings = self.parse_config_file()
+            except Exception:
+                ERR_FILE1 = "Looks like there is a problem in your config.ini file. Perhaps you edited it and entered a wrong line."
+                ERR_FILE2 = "Try removing your config.ini file and run the program again, it will create a fresh working config file."
+                print(ERR_FILE1)
+                print(ERR_FILE2)
+                exit()
+            self.write_cached_settings(key, settings)
+        self.__dict__.update(settings)
+        self.config_key = key
+        self.version += 1
 
-            self.data_folder = conf.get("Parameters", "folder_with_datafiles", fallback=self.config_folder)
-            self.EVENTS_FILE = self.data_folder + "/events.csv"
-            self.TASKS_FILE = self.data_folder + "/tasks.csv"
+    def reload_if_changed(self):
+        """Assign settings from config.ini again if it was edited since it was read, and return changed ones"""
+        key = self.config_file_key()
+        if key is None or key == self.config_key:
+            return set()
 
+        # Unfinished edits with errors are ignored until the file is saved again:
+        self.config_key = key
+        try:
+            settings = self.parse_config_file()
         except Exception:
-            ERR_FILE1 = "Looks like there is a problem in your config.ini file. Perhaps you edited it and entered a wrong line."
-            ERR_FILE2 = "Try removing your config.ini file and run the program again, it will create a fresh working config file."
-            print(ERR_FILE1)
-            print(ERR_FILE2)
-            exit()
+            return set()
+        self.write_cached_settings(key, settings)
+
+        # Settings given in user arguments keep priority over the file:
+        skipped_settings = RESTART_SETTINGS | self.argument_settings
+        changed_settings = {name for name, value in settings.items()
+                            if name not in skipped_settings and self.__dict__.get(name) != value}
+        self.__dict__.update({name: settings[name] for name in changed_settings})
+        if changed_settings:
+            self.version += 1
+        return changed_settings
+
+    def config_file_key(self):
+        """Identify the state of config.ini and of this module, which is updated with the program"""
+        try:
+            stat = os.stat(self.config_file)
+            program_stat = os.stat(__file__)
+        except OSError:
+            return None
+        return (os.path.abspath(self.config_file), stat.st_size, stat.st_mtime_ns, program_stat.st_mtime_ns)
+
+    def read_cached_settings(self, key):
+        """Return the settings cached for this state of config.ini, or None if there are none"""
+        if key is None:
+            return None
+        try:
+            with open(self.cache_file, "rb") as f:
+                cache = marshal.load(f)
+            if cache["key"] != key:
+                return None
+            settings = cache["settings"]
+            settings["DEFAULT_VIEW"] = AppState(settings["DEFAULT_VIEW"])
+            settings["CALENDARS"] = [CalendarFile(**calendar) for calendar in settings["CALENDARS"]]
+            return settings
+        except Exception:
+            return None
+
+    def write_cached_settings(self, key, settings):
+        """Save the settings for the next start, if the cache folder can be written"""
+        if key is None:
+            return
+
+        # Only built-in types are cached, because marshal is fast and needs no imports:
+        settings = dict(settings)
+        settings["DEFAULT_VIEW"] = settings["DEFAULT_VIEW"].value
+        settings["CALENDARS"] = [dict(vars(calendar)) for calendar in settings["CALENDARS"]]
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file + ".tmp", "wb") as f:
+                marshal.dump({"key": key, "settings": settings}, f)
+            os.replace(self.cache_file + ".tmp", self.cache_file)
+        except OSError:
+            pass
+
+    def parse_config_file(self):
+        """Parse user config.ini file into the dictionary of settings"""
+        parsed = Config(self.config_file)
+        parsed.loaded = True
+        parsed.assign_config_values()
+        return {name: value for name, value in vars(parsed).items() if name.isupper() or name == "data_folder"}
+
+    def assign_config_values(self):
+        """Assign values from user config.ini file to all the settings"""
+        import configparser
+
+        conf = configparser.ConfigParser()
+        conf.read(self.config_file, 'utf-8')
+
+        # Reading default view:
+        default_view = conf.get("Parameters", "default_view", fallback="calendar")
+        if default_view == 'journal':
+            self.DEFAULT_VIEW = AppState.JOURNAL
+        else:
+            self.DEFAULT_VIEW = AppState.CALENDAR
+
+        # Calendar settings:
+        self.SHOW_KEYBINDINGS          = conf.getboolean("Parameters", "show_keybindings", fallback=True)
+        self.MINIMAL_TODAY_INDICATOR   = conf.getboolean("Parameters", "minimal_today_indicator", fallback=True)
+        self.MINIMAL_DAYS_INDICATOR    = conf.getboolean("Parameters", "minimal_days_indicator", fallback=True)
+        self.MINIMAL_WEEKEND_INDICATOR = conf.getboolean("Parameters", "minimal_weekend_indicator", fallback=True)
+        self.ASK_CONFIRMATIONS         = conf.getboolean("Parameters", "ask_confirmations", fallback=True)
+        self.SHOW_WEATHER              = conf.getboolean("Parameters", "show_weather", fallback=False)
+        self.SHOW_CURRENT_TIME         = conf.getboolean("Parameters", "show_current_time", fallback=False)
+        self.DISPLAY_ICONS             = conf.getboolean("Parameters", "use_unicode_icons", fallback=True)
+        self.DISPLAY_HOLIDAYS          = conf.getboolean("Parameters", "show_holidays", fallback=True)
+        self.PRIVACY_MODE              = conf.getboolean("Parameters", "privacy_mode", fallback=False)
+        self.CUT_TITLES                = conf.getboolean("Parameters", "cut_titles_by_cell_length", fallback=False)
+        self.BIRTHDAYS_FROM_ABOOK      = conf.getboolean("Parameters", "birthdays_from_abook", fallback=True)
+        self.SPLIT_SCREEN              = conf.getboolean("Parameters", "split_screen", fallback=True)
+        self.SHOW_NOTHING_PLANNED      = conf.getboolean("Parameters", "show_nothing_planned", fallback=True)
+        self.SHOW_CALENDAR_BOARDERS    = conf.getboolean("Parameters", "show_calendar_boarders", fallback=False)
+        self.USE_PERSIAN_CALENDAR      = conf.getboolean("Parameters", "use_persian_calendar", fallback=False)
+        self.LANG                      = conf.get("Parameters", "language", fallback="en")
+        self.START_WEEK_DAY            = int(conf.get("Parameters", "start_week_day", fallback=1))
+        self.AGENDA_DAYS               = max(1, int(conf.get("Parameters", "agenda_days", fallback=14)))
+        self.WEEKEND_DAYS              = conf.get("Parameters", "weekend_days", fallback="6,7")
+        self.WEEKEND_DAYS              = [int(i) for i in self.WEEKEND_DAYS.split(",")]
+        self.HOLIDAY_COUNTRY  = conf.get("Parameters", "holiday_country", fallback="UnitedStates")
+        self.WEATHER_CITY     = conf.get("Parameters", "weather_city", fallback="")
+        self.WEATHER_CACHE_MINUTES = int(conf.get("Parameters", "weather_cache_minutes", fallback=30))
+        self.WEATHER_URL           = conf.get("Parameters", "weather_url", fallback="https://wttr.in")
+        self.WEATHER_TIMEOUT       = float(conf.get("Parameters", "weather_timeout", fallback=2))
+        self.WEATHER_REFRESH_MINUTES = int(conf.get("Parameters", "weather_refresh_minutes", fallback=30))
+
+        # Journal settings:
+        self.CALCURSE_TODO_FILE    = conf.get("Parameters", "calcurse_todo_file", fallback=self.calcurse_todo_file)
+        self.CALCURSE_EVENTS_FILE  = conf.get("Parameters", "calcurse_events_file", fallback=self.calcurse_events_file)
+        self.TASKWARRIOR_FOLDER    = conf.get("Parameters", "taskwarrior_folder", fallback=self.taskwarrior_folder)
+        self.JOURNAL_HEADER        = conf.get("Parameters", "journal_header", fallback="JOURNAL")
+        self.SHOW_KEYBINDINGS      = conf.getboolean("Parameters", "show_keybindings", fallback=True)
+        self.DONE_ICON             = conf.get("Parameters", "done_icon", fallback="✔") if self.DISPLAY_ICONS else "×"
+        self.TODO_ICON             = conf.get("Parameters", "todo_icon", fallback="•") if self.DISPLAY_ICONS else "·"
+        self.IMPORTANT_ICON        = conf.get("Parameters", "important_icon", fallback="‣") if self.DISPLAY_ICONS else "!"
+        self.REFRESH_INTERVAL      = int(conf.get("Parameters", "refresh_interval", fallback=1))
+        self.SHOW_SECONDS_AFTER_HOUR = conf.getboolean("Parameters", "show_seconds_after_hour", fallback=True)
+        self.RIGHT_PANE_PERCENTAGE = int(conf.get("Parameters", "right_pane_percentage", fallback=25))
+
+        # Archive settings:
+        self.ARCHIVE_EVENTS_AFTER_MONTHS = int(conf.get("Parameters", "archive_events_after_months", fallback=0))
+        self.ARCHIVE_TASKS_AFTER_DAYS    = int(conf.get("Parameters", "archive_tasks_after_days", fallback=0))
+        self.COMPRESS_ARCHIVE            = conf.getboolean("Parameters", "compress_archive", fallback=False)
+
+        # Calendar colors:
+        self.COLOR_TODAY           = int(conf.get("Colors", "color_today", fallback=2))
+        self.COLOR_EVENTS          = int(conf.get("Colors", "color_events", fallback=4))
+        self.COLOR_DAYS            = int(conf.get("Colors", "color_days", fallback=7))
+        self.COLOR_DAY_NAMES       = int(conf.get("Colors", "color_day_names", fallback=4))
+        self.COLOR_WEEKENDS        = int(conf.get("Colors", "color_weekends", fallback=1))
+        self.COLOR_WEEKEND_NAMES   = int(conf.get("Colors", "color_weekend_names", fallback=1))
+        self.COLOR_HINTS           = int(conf.get("Colors", "color_hints", fallback=7))
+        self.COLOR_PROMPTS         = int(conf.get("Colors", "color_prompts", fallback=7))
+        self.COLOR_BIRTHDAYS       = int(conf.get("Colors", "color_birthdays", fallback=1))
+        self.COLOR_HOLIDAYS        = int(conf.get("Colors", "color_holidays", fallback=2))
+        self.COLOR_DEADLINES       = int(conf.get("Colors", "color_deadlines", fallback=3))
+        self.COLOR_CONFIRMATIONS   = int(conf.get("Colors", "color_confirmations", fallback=1))
+        self.COLOR_TIMER           = int(conf.get("Colors", "color_timer", fallback=2))
+        self.COLOR_TIMER_PAUSED    = int(conf.get("Colors", "color_timer_paused", fallback=7))
+        self.COLOR_TIME            = int(conf.get("Colors", "color_time", fallback=7))
+        self.COLOR_WEATHER         = int(conf.get("Colors", "color_weather", fallback=2))
+        self.COLOR_BACKGROUND      = int(conf.get("Colors", "color_background", fallback=-1))
+        self.COLOR_CALENDAR_HEADER = int(conf.get("Colors", "color_calendar_header", fallback=4))
+        self.COLOR_ACTIVE_PANE     = int(conf.get("Colors", "color_active_pane", fallback=2))
+        self.COLOR_SEPARATOR       = int(conf.get("Colors", "color_separator", fallback=7))
+        self.COLOR_CALENDAR_BOARDER= int(conf.get("Colors", "color_calendar_border", fallback=7))
+
+        # Journal colors:
+        self.COLOR_TODO           = int(conf.get("Colors", "color_todo", fallback=7))
+        self.COLOR_DONE           = int(conf.get("Colors", "color_done", fallback=6))
+        self.COLOR_TITLE          = int(conf.get("Colors", "color_title", fallback=1))
+        self.COLOR_IMPORTANT      = int(conf.get("Colors", "color_important", fallback=1))
+        self.COLOR_UNIMPORTANT    = int(conf.get("Colors", "color_unimportant", fallback=6))
+
+        # Font styles:
+        self.BOLD_TODAY               = conf.getboolean("Styles", "bold_today", fallback=False)
+        self.BOLD_DAYS                = conf.getboolean("Styles", "bold_days", fallback=False)
+        self.BOLD_DAY_NAMES           = conf.getboolean("Styles", "bold_day_names", fallback=False)
+        self.BOLD_WEEKENDS            = conf.getboolean("Styles", "bold_weekends", fallback=False)
+        self.BOLD_WEEKEND_NAMES       = conf.getboolean("Styles", "bold_weekend_names", fallback=False)
+        self.BOLD_TITLE               = conf.getboolean("Styles", "bold_title", fallback=False)
+        self.BOLD_ACTIVE_PANE         = conf.getboolean("Styles", "bold_active_pane", fallback=False)
+        self.UNDERLINED_TODAY         = conf.getboolean("Styles", "underlined_today", fallback=False)
+        self.UNDERLINED_DAYS          = conf.getboolean("Styles", "underlined_days", fallback=False)
+        self.UNDERLINED_DAY_NAMES     = conf.getboolean("Styles", "underlined_day_names", fallback=False)
+        self.UNDERLINED_WEEKENDS      = conf.getboolean("Styles", "underlined_weekends", fallback=False)
+        self.UNDERLINED_WEEKEND_NAMES = conf.getboolean("Styles", "underlined_weekend_names", fallback=False)
+        self.UNDERLINED_TITLE         = conf.getboolean("Styles", "underlined_title", fallback=False)
+        self.UNDERLINED_ACTIVE_PANE   = conf.getboolean("Styles", "underlined_active_pane", fallback=False)
+
+        # Icons:
+        self.TODAY_ICON       = conf.get("Parameters", "today_icon", fallback="•") if self.DISPLAY_ICONS else "·"
+        self.PRIVACY_ICON     = conf.get("Parameters", "privacy_icon", fallback="•") if self.DISPLAY_ICONS else "·"
+        self.HIDDEN_ICON      = conf.get("Parameters", "hidden_icon", fallback="...")
+        self.EVENT_ICON       = conf.get("Parameters", "event_icon", fallback="•") if self.DISPLAY_ICONS else "·"
+        self.BIRTHDAY_ICON    = conf.get("Parameters", "birthday_icon", fallback="★") if self.DISPLAY_ICONS else "·"
+        self.HOLIDAY_ICON     = conf.get("Parameters", "holiday_icon", fallback="☘️") if self.DISPLAY_ICONS else "·"
+        self.SEPARATOR_ICON   = conf.get("Parameters", "separator_icon", fallback="│")
+        self.DEADLINE_ICON    = conf.get("Parameters", "deadline_icon", fallback="⚑") if self.DISPLAY_ICONS else "·"
+        try:
+            self.ICONS = {word: icon for (word, icon) in conf.items("Event icons")}
+        except configparser.NoSectionError:
+            self.ICONS = {}
+
+        self.data_folder = conf.get("Parameters", "folder_with_datafiles", fallback=self.config_folder)
+        self.EVENTS_FILE = self.data_folder + "/events.csv"
+        self.TASKS_FILE = self.data_folder + "/tasks.csv"
+
+        # Additional calendar files, each in its own [Calendar name] section:
+        self.CALENDARS = []
+        for section in conf.sections():
+            if not section.lower().startswith("calendar "):
+                continue
+            self.CALENDARS.append(CalendarFile(
+                name       = section[len("calendar "):].strip(),
+                file       = os.path.expanduser(conf.get(section, "file")),
+                color      = int(conf.get(section, "color", fallback=self.COLOR_EVENTS)),
+                color_pair = CALENDAR_COLORS_START + len(self.CALENDARS),
+                read_only  = conf.getboolean(section, "read_only", fallback=False),
+                privacy    = conf.getboolean(section, "privacy", fallback=False),
+                ))
 
     def read_config_file_from_user_arguments(self):
         """Read user config.ini location from user arguments"""
         try:
-            opts, _ = getopt.getopt(sys.argv[1:], "pjchv", ["folder=", "config="])
+            opts, _ = getopt.getopt(sys.argv[1:], SHORT_OPTIONS, LONG_OPTIONS)
             for opt, arg in opts:
                 if opt in "--config":
                     self.config_file = arg
@@ -301,33 +458,52 @@ class Config:
 
     def read_parameters_from_user_arguments(self):
         """Read user arguments that were provided at the run. This values take priority over config.ini"""
+        # Measuring of the program is switched on by environment variables or user arguments:
+        instrument = os.environ.get("CALCURE_INSTRUMENT", "").lower()
+        self.INSTRUMENT = instrument not in ("", "0", "no")
+        self.INSTRUMENT_OVERLAY = instrument == "overlay"
+        self.INSTRUMENT_REPORT = self.config_folder + "/instrumentation.json"
+        self.CPROFILE_FILE = os.environ.get("CALCURE_CPROFILE") or None
+        self.PROFILE_STARTUP = False
         try:
-            opts, _ = getopt.getopt(sys.argv[1:],"pjhvi",["folder=", "config=", "task=", "event="])
+            opts, _ = getopt.getopt(sys.argv[1:], SHORT_OPTIONS, LONG_OPTIONS)
             for opt, arg in opts:
                 if opt in '--folder':
+                    self.argument_settings.update({"data_folder", "EVENTS_FILE", "TASKS_FILE"})
                     self.data_folder = arg
                     if not os.path.exists(self.data_folder):
                         os.makedirs(self.data_folder)
                     self.EVENTS_FILE = self.data_folder + "/events.csv"
                     self.TASKS_FILE = self.data_folder + "/tasks.csv"
                 elif opt == '-p':
+                    self.argument_settings.add("PRIVACY_MODE")
                     self.PRIVACY_MODE = True
                 elif opt == '-j':
+                    self.argument_settings.add("DEFAULT_VIEW")
                     self.DEFAULT_VIEW = AppState.JOURNAL
                 elif opt in ('-h'):
+                    self.argument_settings.add("DEFAULT_VIEW")
                     self.DEFAULT_VIEW = AppState.HELP
                 elif opt in ('-v'):
+                    self.argument_settings.add("DEFAULT_VIEW")
                     self.DEFAULT_VIEW = AppState.EXIT
-                    print ('Calcure - version 2.4.1')
+                    print (f'Calcure - version {__version__}')
                 elif opt in ('-i'):
+                    self.argument_settings.add("USE_PERSIAN_CALENDAR")
                     self.USE_PERSIAN_CALENDAR = True
+                elif opt == '--instrument':
+                    self.INSTRUMENT = True
+                elif opt == '--overlay':
+                    self.INSTRUMENT = True
+                    self.INSTRUMENT_OVERLAY = True
+                elif opt == '--cprofile':
+                    self.INSTRUMENT = True
+                    self.CPROFILE_FILE = arg
+                elif opt == '--profile-startup':
+                    self.PROFILE_STARTUP = True
         except getopt.GetoptError:
             pass
 
 
-# Read config file:
+# Shared by all modules, and loaded by the program when it starts:
 cf = Config()
-cf.create_config_file()
-cf.read_config_file_from_user_arguments()
-cf.read_config_file()
-cf.read_parameters_from_user_arguments()
@@ -90,6 +90,14 @@ def control_monthly_screen(stdscr, user_events, screen, importer):
                 screen.previous_month()
             if screen.key in ["KEY_HOME", "G"]:
                 screen.reset_to_today()
+            if screen.key == "y":
+                screen.calendar_state = CalState.YEARLY
+            if screen.key == "w":
+                screen.select_day_in_month()
+                screen.calendar_state = CalState.WEEKLY
+            if screen.key == "s":
+                screen.select_day_in_month()
+                screen.calendar_state = CalState.AGENDA
 
             # Handle "g" as go to selected day:
             if screen.key == "g":
@@ -230,6 +238,10 @@ def control_daily_screen(stdscr, user_events, screen, importer):
                 screen.previous_day()
             if screen.key in ["KEY_HOME", "G"]:
                 screen.reset_to_today()
+            if screen.key == "w":
+                screen.calendar_state = CalState.WEEKLY
+            if screen.key == "s":
+                screen.calendar_state = CalState.AGENDA
 
             # Add single event:
             if screen.key == "a":
@@ -359,8 +371,13 @@ def control_journal_screen(stdscr, user_tasks, screen, importer):
                 number = input_integer(stdscr, screen.y_max-2, 0, MSG_TS_EDIT)
                 if user_tasks.is_valid_number(number):
                     task_id = user_tasks.items[number].item_id
-                    clear_line(stdscr, number+2, screen.x_min)
-                    new_name = input_string(stdscr, number+2, screen.x_min, cf.TODO_ICON+' ', screen.x_max-4)
+
+                    # New name is typed on the row of the task, or on the prompt line if the task is scrolled out of view:
+                    y = number - screen.journal_offset + 2
+                    if not 2 <= y <= screen.y_max - 2:
+                        y = screen.y_max - 2
+                    clear_line(stdscr, y, screen.x_min)
+                    new_name = input_string(stdscr, y, screen.x_min, cf.TODO_ICON+' ', screen.x_max-4)
                     user_tasks.rename_item(task_id, new_name)
 
             # Subtask operations:
@@ -389,10 +406,26 @@ def control_journal_screen(stdscr, user_tasks, screen, importer):
 
             # Add single task:
             if screen.key == "a":
-                clear_line(stdscr, len(user_tasks.items) + 2, screen.x_min)
-                task_name = input_string(stdscr, len(user_tasks.items) + 2, screen.x_min, cf.TODO_ICON+' ', screen.x_max - 4)
+                y = min(len(user_tasks.items) - screen.journal_offset + 2, screen.y_max - 2)
+                clear_line(stdscr, y, screen.x_min)
+                task_name = input_string(stdscr, y, screen.x_min, cf.TODO_ICON+' ', screen.x_max - 4)
                 task_id = user_tasks.generate_id()
                 user_tasks.add_item(Task(task_id, task_name, Status.NORMAL, Timer([]), False))
+                screen.journal_offset = len(user_tasks.items)
+
+            # Scrolling of the journal by lines and pages:
+            if screen.key in ["j", "KEY_DOWN"]:
+                screen.journal_offset += 1
+            if screen.key in ["k", "KEY_UP"]:
+                screen.journal_offset -= 1
+            if screen.key == "KEY_NPAGE":
+                screen.journal_offset += screen.y_max - 3
+            if screen.key == "KEY_PPAGE":
+                screen.journal_offset -= screen.y_max - 3
+            if screen.key == "KEY_HOME":
+                screen.journal_offset = 0
+            if screen.key == "KEY_END":
+                screen.journal_offset = len(user_tasks.items)
 
             # Bulk operations:
             if screen.key == "V":
@@ -445,6 +478,92 @@ def control_journal_screen(stdscr, user_tasks, screen, importer):
         pass
 
 
+def control_yearly_screen(stdscr, screen):
+    """Handle user input on the yearly screen"""
+    try:
+        # Wait for user to press a key:
+        screen.key = stdscr.getkey()
+
+        # Navigation:
+        if screen.key in ["n", "j", "KEY_UP", "KEY_RIGHT"]:
+            screen.next_year()
+        if screen.key in ["p", "k", "KEY_DOWN", "KEY_LEFT"]:
+            screen.previous_year()
+        if screen.key in ["KEY_HOME", "G"]:
+            screen.reset_to_today()
+
+        # Other actions:
+        if vim_style_exit(stdscr, screen):
+            confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATIONS)
+            screen.state = AppState.EXIT if confirmed else screen.state
+        if screen.key == "*":
+            screen.privacy = not screen.privacy
+        if screen.key in [" ", "KEY_BTAB"]:
+            screen.state = AppState.JOURNAL
+        if screen.key == "?":
+            screen.state = AppState.HELP
+        if screen.key in ["y", "q", "KEY_BACKSPACE", "\b", "\x7f"]:
+            screen.calendar_state = CalState.MONTHLY
+        if screen.key in ["/"]:
+            screen.split = not screen.split
+            screen.refresh_now = True
+
+    # Handle keyboard interruption with ctr+c:
+    except KeyboardInterrupt:
+        confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATIONS)
+        screen.state = AppState.EXIT if confirmed else screen.state
+
+    # Prevent crash if no input:
+    except curses.error:
+        pass
+
+
+def control_period_screen(stdscr, screen, number_of_days):
+    """Handle user input on the weekly and agenda screens"""
+    try:
+        # Wait for user to press a key:
+        screen.key = stdscr.getkey()
+
+        # Navigation:
+        if screen.key in ["n", "j", "KEY_UP", "KEY_RIGHT"]:
+            screen.move_days(number_of_days)
+        if screen.key in ["p", "k", "KEY_DOWN", "KEY_LEFT"]:
+            screen.move_days(-number_of_days)
+        if screen.key in ["KEY_HOME", "G"]:
+            screen.reset_to_today()
+
+        # Switching between views:
+        if screen.key == "w":
+            screen.calendar_state = CalState.MONTHLY if screen.calendar_state == CalState.WEEKLY else CalState.WEEKLY
+        if screen.key == "s":
+            screen.calendar_state = CalState.MONTHLY if screen.calendar_state == CalState.AGENDA else CalState.AGENDA
+        if screen.key in ["q", "KEY_BACKSPACE", "\b", "\x7f"]:
+            screen.calendar_state = CalState.MONTHLY
+
+        # Other actions:
+        if vim_style_exit(stdscr, screen):
+            confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATIONS)
+            screen.state = AppState.EXIT if confirmed else screen.state
+        if screen.key == "*":
+            screen.privacy = not screen.privacy
+        if screen.key in [" ", "KEY_BTAB"]:
+            screen.state = AppState.JOURNAL
+        if screen.key == "?":
+            screen.state = AppState.HELP
+        if screen.key in ["/"]:
+            screen.split = not screen.split
+            screen.refresh_now = True
+
+    # Handle keyboard interruption with ctr+c:
+    except KeyboardInterrupt:
+        confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATIONS)
+        screen.state = AppState.EXIT if confirmed else screen.state
+
+    # Prevent crash if no input:
+    except curses.error:
+        pass
+
+
 def control_help_screen(stdscr, screen):
     """Process user input on the help screen"""
     try:
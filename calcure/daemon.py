@@ -0,0 +1,203 @@
+"""Module that keeps the data in memory and serves command line requests through a local socket"""
+
+import os
+import sys
+import json
+import signal
+import socket
+import socketserver
+
+from calcure.configuration import cf
+from calcure.calendars import Calendar
+from calcure.data import *
+from calcure.repository import FileRepository, Exporter
+
+
+def parse_date(date_string):
+    """Convert date in YYYY-MM-DD format into a tuple of numbers"""
+    year, month, day = date_string.split("-")
+    return int(year), int(month), int(day)
+
+
+def daemon_socket_file():
+    """Path to the socket of the daemon serving the current data folder"""
+    return os.path.join(cf.data_folder, "calcure.sock")
+
+
+def send_to_daemon(socket_file, request):
+    """Send a request to the running daemon and return its response, or None if it does not run"""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_file)
+            client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            with client.makefile("r", encoding="utf-8") as f:
+                return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Answer each line of JSON sent by a client with a line of JSON"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.daemon.process(json.loads(line))
+            except ValueError:
+                response = {"ok": False, "error": "Request is not valid JSON"}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class Daemon:
+    """Process that holds tasks and events in memory and serves requests of clients"""
+
+    def __init__(self, socket_file):
+        self.socket_file = socket_file
+        self.file_repository = None
+        self.modification_times = {}
+        self.holidays = None
+        self.birthdays = None
+        self.load()
+
+    @property
+    def files(self):
+        """Data files that the daemon keeps in memory"""
+        return [cf.EVENTS_FILE, cf.TASKS_FILE] + [calendar.file for calendar in cf.CALENDARS]
+
+    def read_modification_times(self):
+        """Get modification times of the data files"""
+        times = {}
+        for file in self.files:
+            try:
+                times[file] = os.path.getmtime(file)
+            except OSError:
+                times[file] = None
+        return times
+
+    def load(self):
+        """Load tasks and events from the files"""
+        self.file_repository = FileRepository(cf.TASKS_FILE, cf.EVENTS_FILE, cf.HOLIDAY_COUNTRY,
+                                              cf.USE_PERSIAN_CALENDAR, cf.CALENDARS)
+        self.user_events = self.file_repository.load_events_from_csv()
+        self.user_tasks = self.file_repository.load_tasks_from_csv()
+        self.modification_times = self.read_modification_times()
+
+    def reload_if_changed(self):
+        """Load the files again if they were changed by another program"""
+        if self.read_modification_times() != self.modification_times:
+            self.load()
+
+    def save(self):
+        """Save the changed collections to files"""
+        if self.user_events.changed:
+            self.file_repository.save_events_to_csv()
+        if self.user_tasks.changed:
+            self.file_repository.save_tasks_to_csv()
+        self.modification_times = self.read_modification_times()
+
+    def process(self, request):
+        """Perform the requested command and return the response"""
+        commands = {
+                "ping":      self.ping,
+                "add_task":  self.add_task,
+                "add_event": self.add_event,
+                "list":      self.list_items,
+                "toggle":    self.toggle,
+                "search":    self.search,
+                }
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request should be a JSON object"}
+        command = commands.get(request.get("command"))
+        if command is None:
+            return {"ok": False, "error": f"Unknown command: {request.get('command')}"}
+        self.reload_if_changed()
+        try:
+            response = command(request)
+        except (KeyError, ValueError, TypeError) as error:
+            return {"ok": False, "error": f"Wrong request: {error}"}
+        self.save()
+        return response
+
+    def ping(self, request):
+        """Confirm that the daemon is running"""
+        return {"ok": True}
+
+    def add_task(self, request):
+        """Add a new task to the journal"""
+        task_id = self.user_tasks.generate_id()
+        self.user_tasks.add_item(Task(task_id, request["name"], Status.NORMAL, Timer([]), False))
+        return {"ok": True, "id": task_id}
+
+    def add_event(self, request):
+        """Add a new event to the calendar"""
+        year, month, day = parse_date(request["date"])
+        if not 0 < month <= 12 or not 0 < day <= Calendar(0, cf.USE_PERSIAN_CALENDAR).last_day(year, month):
+            return {"ok": False, "error": "Date does not exist"}
+        event_id = self.user_events.items[-1].item_id + 1 if not self.user_events.is_empty() else 1
+        self.user_events.add_item(UserEvent(event_id, year, month, day, request["name"],
+                                            1, Frequency.ONCE, Status.NORMAL, False))
+        return {"ok": True, "id": event_id}
+
+    def list_items(self, request):
+        """List events, repetitions, deadlines, holidays, and birthdays in the period"""
+        start = parse_date(request["from"]) if "from" in request else None
+        end = parse_date(request["to"]) if "to" in request else None
+        if start is not None and end is not None:
+            for year in range(start[0], end[0] + 1):
+                self.file_repository.load_archived_events(year, 1)
+                self.file_repository.load_archived_events(year, 12)
+
+        # Holidays and birthdays are loaded only when they are requested for the first time:
+        if request.get("holidays") and self.holidays is None:
+            self.holidays = self.file_repository.load_holidays()
+        if request.get("birthdays") and self.birthdays is None:
+            self.birthdays = self.file_repository.load_birthdays_from_abook()
+        exporter = Exporter(self.user_events.items, self.user_tasks.items, cf.USE_PERSIAN_CALENDAR, start, end,
+                            self.holidays if request.get("holidays") else None,
+                            self.birthdays if request.get("birthdays") else None)
+        return {"ok": True, "items": list(exporter.iterate_records())}
+
+    def toggle(self, request):
+        """Toggle the status of a task or an event"""
+        collection = self.user_tasks if request["type"] == "task" else self.user_events
+        if not any(item.item_id == request["id"] for item in collection.items):
+            return {"ok": False, "error": f"No {request['type']} with id {request['id']}"}
+        collection.toggle_item_status(request["id"], Status[request["status"].upper()])
+        return {"ok": True}
+
+    def search(self, request):
+        """Find tasks and events which names contain the query"""
+        query = request["query"].lower()
+        exporter = Exporter([], [], cf.USE_PERSIAN_CALENDAR)
+        items = [exporter.item_to_record("event", event) for event in self.user_events.items
+                 if query in event.name.lower()]
+        items += [exporter.item_to_record("task", task) for task in self.user_tasks.items
+                  if query in task.name.lower()]
+        return {"ok": True, "items": items}
+
+    def run(self):
+        """Serve requests until the process is stopped"""
+        if not hasattr(socket, "AF_UNIX"):
+            print("Daemon mode requires Unix sockets, which are not supported by this system.")
+            return
+        if send_to_daemon(self.socket_file, {"command": "ping"}) is not None:
+            print(f"Daemon is already running at {self.socket_file}")
+            return
+
+        # Remove the socket left by a daemon that was not stopped properly:
+        if os.path.exists(self.socket_file):
+            os.remove(self.socket_file)
+        server = socketserver.UnixStreamServer(self.socket_file, DaemonRequestHandler)
+        server.daemon = self
+
+        # Stop properly when the process is terminated:
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            os.remove(self.socket_file)
@@ -2,6 +2,8 @@
 
 import time
 import enum
+import bisect
+import datetime
 
 from calcure.calendars import Calendar
 
@@ -19,6 +21,9 @@ class CalState(enum.Enum):
     """Possible states of the calendar view"""
     MONTHLY = 1
     DAILY = 2
+    YEARLY = 3
+    WEEKLY = 4
+    AGENDA = 5
 
 
 class Status(enum.Enum):
@@ -68,6 +73,22 @@ class Color(enum.Enum):
     DEADLINES = 25
 
 
+# Color pairs of additional calendar files are numbered after the predefined ones:
+CALENDAR_COLORS_START = max(color.value for color in Color) + 1
+
+
+class CalendarFile:
+    """Additional file with events and its display settings"""
+
+    def __init__(self, name, file, color, color_pair, read_only, privacy):
+        self.name = name
+        self.file = file
+        self.color = color
+        self.color_pair = color_pair
+        self.read_only = read_only
+        self.privacy = privacy
+
+
 class Task:
     """Tasks crated by user"""
 
@@ -95,23 +116,25 @@ class Event:
 class UserEvent(Event):
     """Events crated by user"""
 
-    def __init__(self, item_id, year, month, day, name, repetition, frequency, status, privacy):
+    def __init__(self, item_id, year, month, day, name, repetition, frequency, status, privacy, calendar=None):
         super().__init__(year, month, day, name)
         self.item_id = item_id
         self.repetition = repetition
         self.frequency = frequency
         self.status = status
         self.privacy = privacy
+        self.calendar = calendar
 
 
 class UserRepeatedEvent(Event):
     """Events that are repetitions of the original user events"""
 
-    def __init__(self, item_id, year, month, day, name, status, privacy):
+    def __init__(self, item_id, year, month, day, name, status, privacy, calendar=None):
         super().__init__(year, month, day, name)
         self.item_id = item_id
         self.status = status
         self.privacy = privacy
+        self.calendar = calendar
 
 
 class Timer:
@@ -131,8 +154,8 @@ class Timer:
         return True if self.stamps else False
 
     @property
-    def passed_time(self):
-        """Calculate how much time has passed in the un-paused intervals"""
+    def seconds_passed(self):
+        """Calculate how many seconds have passed in the un-paused intervals"""
         time_passed = 0
 
         # Calculate passed time, assuming that even timestamps are pauses:
@@ -143,14 +166,26 @@ class Timer:
         # Add time passed during the current run:
         if self.is_counting:
             time_passed += time.time() - float(self.stamps[-1])
+        return time_passed
+
+    @property
+    def passed_time(self):
+        """Calculate how much time has passed in the un-paused intervals"""
+        return self.format_passed_time()
+
+    def format_passed_time(self, show_seconds_after_hour=True):
+        """Form the string of passed time, where seconds can be hidden after the first hour"""
+        time_passed = self.seconds_passed
 
         # Depending on how much time has passed, show in different formats:
         one_hour = 60*60.0
         one_day = 24*one_hour
         if time_passed < one_hour:
             format_string = "%M:%S"
-        else:
+        elif show_seconds_after_hour:
             format_string = "%H:%M:%S"
+        else:
+            format_string = "%H:%M"
         time_string = str(time.strftime(format_string, time.gmtime(int(time_passed))))
 
         if 2*one_day > time_passed > one_day:
@@ -159,14 +194,33 @@ class Timer:
             time_string = str(int(time_passed//one_day)) + " days " + time_string
         return time_string
 
+    def seconds_to_next_change(self, show_seconds_after_hour=True):
+        """Calculate in how many seconds the shown passed time changes"""
+        time_passed = self.seconds_passed
+        unit = 1 if show_seconds_after_hour or time_passed < 60*60 else 60
+        return unit - time_passed % unit
+
 
 class Collection:
     """Parent class for collections of items like tasks or events"""
 
     def __init__(self):
         self.items = []
+        self.version = 0
         self.changed = False
 
+    @property
+    def changed(self):
+        """Whether the collection was changed since it was saved"""
+        return self._changed
+
+    @changed.setter
+    def changed(self, value):
+        """Mark the collection as changed, which also makes cached views of it outdated"""
+        if value:
+            self.version += 1
+        self._changed = value
+
     def add_item(self, item):
         """Add an item to the collection"""
         if 100 > len(item.name) > 0 and item.name != "\[":
@@ -258,6 +312,24 @@ class Collection:
 class Tasks(Collection):
     """List of tasks created by the user"""
 
+    def __init__(self):
+        super().__init__()
+        self.deadlines = ()
+        self.deadlines_checked_version = None
+        self._deadlines_version = 0
+
+    @property
+    def deadlines_version(self):
+        """Version that changes only when tasks shown in calendars as deadlines change, and not on timers"""
+        if self.deadlines_checked_version != self.version:
+            deadlines = tuple((task.name, task.status, task.privacy, task.year, task.month, task.day)
+                              for task in self.items if task.year > 0)
+            if deadlines != self.deadlines:
+                self.deadlines = deadlines
+                self._deadlines_version += 1
+            self.deadlines_checked_version = self.version
+        return self._deadlines_version
+
     def add_subtask(self, task, number):
         """Add a subtask for certain task in the journal"""
         level = '----'if (self.items[number].name[:2] == '--') else '--'
@@ -317,6 +389,33 @@ class Tasks(Collection):
 class Events(Collection):
     """List of events created by the user or imported"""
 
+    def is_read_only(self, selected_item_id):
+        """Check if the event comes from a calendar file that should not be modified"""
+        for item in self.items:
+            if item.item_id == selected_item_id:
+                return item.calendar is not None and item.calendar.read_only
+        return False
+
+    def delete_item(self, selected_item_id):
+        """Delete an event unless it comes from a read-only calendar"""
+        if not self.is_read_only(selected_item_id):
+            super().delete_item(selected_item_id)
+
+    def rename_item(self, selected_item_id, new_name):
+        """Rename an event unless it comes from a read-only calendar"""
+        if not self.is_read_only(selected_item_id):
+            super().rename_item(selected_item_id, new_name)
+
+    def toggle_item_status(self, selected_item_id, new_status):
+        """Toggle the event status unless it comes from a read-only calendar"""
+        if not self.is_read_only(selected_item_id):
+            super().toggle_item_status(selected_item_id, new_status)
+
+    def toggle_item_privacy(self, selected_item_id):
+        """Toggle the event privacy unless it comes from a read-only calendar"""
+        if not self.is_read_only(selected_item_id):
+            super().toggle_item_privacy(selected_item_id)
+
     def event_exists(self, new_event):
         """Check if such event already exists in collection"""
         for event in self.items:
@@ -329,6 +428,8 @@ class Events(Collection):
 
     def change_day(self, selected_item_id, new_day):
         """Move an event to another day"""
+        if self.is_read_only(selected_item_id):
+            return
         for item in self.items:
             if item.item_id == selected_item_id:
                 item.day = new_day
@@ -357,13 +458,53 @@ class RepeatedEvents(Events):
         self.use_persian_calendar = use_persian_calendar
 
         for event in self.user_events.items:
-            if event.repetition >= 1:
-                for rep in range(1, event.repetition):
-                    temp_year = event.year + rep*(event.frequency == Frequency.YEARLY)
-                    temp_month = event.month + rep*(event.frequency == Frequency.MONTHLY)
-                    temp_day = event.day + rep*(event.frequency == Frequency.DAILY) + 7*rep*(event.frequency == Frequency.WEEKLY)
-                    year, month, day = self.calculate_recurring_events(temp_year, temp_month, temp_day, event.frequency)
-                    self.add_item(UserRepeatedEvent(event.item_id, year, month, day, event.name, event.status, event.privacy))
+            for repeated_event in self.iterate_repetitions(event):
+                self.add_item(repeated_event)
+
+    def iterate_repetitions(self, event, first_rep=1):
+        """Yield repetitions of the event one by one without storing them"""
+        if event.repetition >= 1:
+            for rep in range(max(first_rep, 1), event.repetition):
+                year, month, day = self.calculate_repetition_date(event, rep)
+                yield UserRepeatedEvent(event.item_id, year, month, day, event.name, event.status, event.privacy, event.calendar)
+
+    def calculate_repetition_date(self, event, rep):
+        """Calculate the date of a certain repetition of the event"""
+        # Gregorian dates of daily and weekly repetitions are found directly by counting days:
+        if not self.use_persian_calendar and event.frequency in (Frequency.DAILY, Frequency.WEEKLY):
+            days = rep*(7 if event.frequency == Frequency.WEEKLY else 1)
+            date = datetime.date.fromordinal(datetime.date(event.year, event.month, event.day).toordinal() + days)
+            return date.year, date.month, date.day
+
+        temp_year = event.year + rep*(event.frequency == Frequency.YEARLY)
+        temp_month = event.month + rep*(event.frequency == Frequency.MONTHLY)
+        temp_day = event.day + rep*(event.frequency == Frequency.DAILY) + 7*rep*(event.frequency == Frequency.WEEKLY)
+        return self.calculate_recurring_events(temp_year, temp_month, temp_day, event.frequency)
+
+    def repetitions_before(self, event, year, month, day=1):
+        """Estimate how many repetitions certainly happen before the date, to skip calculating them"""
+        # Daily and weekly repetitions of Gregorian events are counted exactly:
+        if not self.use_persian_calendar and event.frequency in (Frequency.DAILY, Frequency.WEEKLY):
+            days = (datetime.date(year, month, day) - datetime.date(event.year, event.month, event.day)).days
+            return max(0, days // (7 if event.frequency == Frequency.WEEKLY else 1))
+        months = (year*12 + month) - (event.year*12 + event.month) - 1
+        if months <= 0:
+            return 0
+        if event.frequency == Frequency.YEARLY:
+            return months // 12
+        if event.frequency == Frequency.MONTHLY:
+            return months
+        if event.frequency == Frequency.WEEKLY:
+            return (months*28) // 7
+        if event.frequency == Frequency.DAILY:
+            return months*28
+        return 0
+
+    def last_occurrence_date(self, event):
+        """Calculate the date when the event happens for the last time"""
+        if event.repetition > 1:
+            return self.calculate_repetition_date(event, event.repetition - 1)
+        return event.year, event.month, event.day
 
     def calculate_recurring_events(self, year, month, day, frequency):
         """Calculate the date of recurring events so that they occur in the next month or year"""
@@ -398,3 +539,238 @@ class RepeatedEvents(Events):
                 new_year = year + (month - 1)//12
                 new_month = month - 12*(new_year - year)
         return new_year, new_month, new_day
+
+
+class DayModel:
+    """Events of all types that occur on one day of the month"""
+
+    def __init__(self, user_events, repeated_events, deadlines, holidays, birthdays):
+        self.user_events = tuple(user_events)
+        self.repeated_events = tuple(repeated_events)
+        self.deadlines = tuple(deadlines)
+        self.holidays = tuple(holidays)
+        self.birthdays = tuple(birthdays)
+
+
+class MonthModel:
+    """Weeks of the month and events of every day, which are calculated once and only read afterwards"""
+
+    def __init__(self, year, month, user_events, user_tasks, holidays, birthdays, start_week_day, use_persian_calendar):
+        self.year = year
+        self.month = month
+        weeks = Calendar(start_week_day - 1, use_persian_calendar).monthdayscalendar(year, month)
+        self.weeks = tuple(tuple(week) for week in weeks)
+        days = [day for week in weeks for day in week if day != 0]
+
+        # Sort events of all sources by days in one pass over each source:
+        events = {day: ([], [], [], [], []) for day in days}
+        for event in user_events.items:
+            if event.year == year and event.month == month and event.day in events:
+                events[event.day][0].append(event)
+        repetitions = RepeatedEvents(Events(), use_persian_calendar)
+        for event in user_events.items:
+            first_rep = repetitions.repetitions_before(event, year, month)
+            for repeated_event in repetitions.iterate_repetitions(event, first_rep):
+                if (repeated_event.year, repeated_event.month) > (year, month):
+                    break
+                if (repeated_event.year, repeated_event.month) == (year, month) and repeated_event.day in events:
+                    events[repeated_event.day][1].append(repeated_event)
+        for task in user_tasks.items:
+            if task.year == year and task.month == month and task.day in events:
+                events[task.day][2].append(task)
+        for holiday in holidays.items:
+            if holiday.year == year and holiday.month == month and holiday.day in events:
+                events[holiday.day][3].append(holiday)
+        for birthday in birthdays.items:
+            if birthday.month == month and birthday.day in events:
+                events[birthday.day][4].append(birthday)
+        self.days = {day: DayModel(*events[day]) for day in days}
+
+        # Selection numbers of user events continue from one day to the next:
+        self.index_offsets = {}
+        offset = 0
+        for day in days:
+            self.index_offsets[day] = offset
+            offset += len(self.days[day].user_events)
+
+
+class MonthModelCache:
+    """Keeps the model of the shown month until the month, settings, or what it shows of the collections change"""
+
+    def __init__(self, user_events, user_tasks, holidays, birthdays):
+        self.user_events = user_events
+        self.user_tasks = user_tasks
+        self.holidays = holidays
+        self.birthdays = birthdays
+        self.key = None
+        self.model = None
+
+    def get(self, year, month, start_week_day, use_persian_calendar):
+        """Return the model of the month, calculating it only if something has changed"""
+        key = (year, month, start_week_day, use_persian_calendar, self.user_events.version,
+               self.user_tasks.deadlines_version, self.holidays.version, self.birthdays.version)
+        if key != self.key:
+            self.model = MonthModel(year, month, self.user_events, self.user_tasks, self.holidays,
+                                    self.birthdays, start_week_day, use_persian_calendar)
+            self.key = key
+        return self.model
+
+
+class YearModel:
+    """Weeks of every month and number of items on every day of the year, counted in one pass over each source"""
+
+    def __init__(self, year, user_events, user_tasks, holidays, birthdays, start_week_day, use_persian_calendar):
+        self.year = year
+        calendar = Calendar(start_week_day - 1, use_persian_calendar)
+        self.weeks = {month: tuple(tuple(week) for week in calendar.monthdayscalendar(year, month))
+                      for month in range(1, 13)}
+        counts = {}
+        repeated_events = []
+        for event in user_events.items:
+            if event.year == year:
+                counts[event.month, event.day] = counts.get((event.month, event.day), 0) + 1
+            if event.repetition > 1 and event.year <= year:
+                repeated_events.append(event)
+
+        # Daily and weekly repetitions within this year are found by counting days in the Gregorian calendar:
+        repetitions = RepeatedEvents(Events(), use_persian_calendar)
+        first_day = datetime.date(year, 1, 1).toordinal() if not use_persian_calendar else 0
+        last_day = datetime.date(year, 12, 31).toordinal() if not use_persian_calendar else 0
+        for event in repeated_events:
+            step = 1 if event.frequency == Frequency.DAILY else 7 if event.frequency == Frequency.WEEKLY else 0
+            if step and not use_persian_calendar:
+                start = datetime.date(event.year, event.month, event.day).toordinal()
+                first_rep = max(1, -((start - first_day) // step))
+                last_rep = min(event.repetition - 1, (last_day - start) // step)
+                for ordinal in range(start + first_rep*step, start + last_rep*step + 1, step):
+                    date = datetime.date.fromordinal(ordinal)
+                    counts[date.month, date.day] = counts.get((date.month, date.day), 0) + 1
+                continue
+
+            # Other repetitions are calculated one by one, skipping those that are certainly before this year:
+            for rep in range(max(1, repetitions.repetitions_before(event, year, 1)), event.repetition):
+                rep_year, month, day = repetitions.calculate_repetition_date(event, rep)
+                if rep_year > year:
+                    break
+                if rep_year == year:
+                    counts[month, day] = counts.get((month, day), 0) + 1
+
+        for task in user_tasks.items:
+            if task.year == year:
+                counts[task.month, task.day] = counts.get((task.month, task.day), 0) + 1
+        for holiday in holidays.items:
+            if holiday.year == year:
+                counts[holiday.month, holiday.day] = counts.get((holiday.month, holiday.day), 0) + 1
+        for birthday in birthdays.items:
+            if birthday.day <= calendar.last_day(year, birthday.month):
+                counts[birthday.month, birthday.day] = counts.get((birthday.month, birthday.day), 0) + 1
+        self.counts = counts
+        self.max_count = max(counts.values(), default=0)
+
+
+class YearModelCache:
+    """Keeps the models of visited years until the settings or any of the collections change"""
+
+    def __init__(self, user_events, user_tasks, holidays, birthdays):
+        self.user_events = user_events
+        self.user_tasks = user_tasks
+        self.holidays = holidays
+        self.birthdays = birthdays
+        self.key = None
+        self.models = {}
+
+    def get(self, year, start_week_day, use_persian_calendar):
+        """Return the model of the year, calculating it only if it was not visited since something has changed"""
+        key = (start_week_day, use_persian_calendar, self.user_events.version, self.user_tasks.deadlines_version,
+               self.holidays.version, self.birthdays.version)
+        if key != self.key:
+            self.models.clear()
+            self.key = key
+        if year not in self.models:
+            self.models[year] = YearModel(year, self.user_events, self.user_tasks, self.holidays,
+                                          self.birthdays, start_week_day, use_persian_calendar)
+        return self.models[year]
+
+
+class EventDateIndex:
+    """User events sorted by date, so that events of a period are found by a binary search"""
+
+    def __init__(self, user_events):
+        self.events = sorted(user_events.items, key=lambda event: (event.year, event.month, event.day))
+        self.dates = [(event.year, event.month, event.day) for event in self.events]
+        self.repeated_events = [event for event in self.events if event.repetition > 1]
+
+    def events_in_period(self, start, end):
+        """Return events from the start to the end dates inclusive, in the order of dates"""
+        return self.events[bisect.bisect_left(self.dates, start):bisect.bisect_right(self.dates, end)]
+
+
+class PeriodModel:
+    """Events of all types on every day of a period of consecutive days, grouped in one pass over each source"""
+
+    def __init__(self, dates, date_index, user_tasks, holidays, birthdays, use_persian_calendar):
+        self.dates = tuple((date.year, date.month, date.day) for date in dates)
+        self.weekdays = {(date.year, date.month, date.day): date.weekday() for date in dates}
+        start, end = self.dates[0], self.dates[-1]
+        events = {date: ([], [], [], [], []) for date in self.dates}
+        for event in date_index.events_in_period(start, end):
+            events[event.year, event.month, event.day][0].append(event)
+
+        # Repetitions are calculated only from the beginning of the period until its end:
+        repetitions = RepeatedEvents(Events(), use_persian_calendar)
+        for event in date_index.repeated_events:
+            if (event.year, event.month, event.day) > end:
+                break
+            first_rep = repetitions.repetitions_before(event, start[0], start[1])
+            for repeated_event in repetitions.iterate_repetitions(event, first_rep):
+                date = (repeated_event.year, repeated_event.month, repeated_event.day)
+                if date > end:
+                    break
+                if date in events:
+                    events[date][1].append(repeated_event)
+
+        for task in user_tasks.items:
+            date = (task.year, task.month, task.day)
+            if date in events:
+                events[date][2].append(task)
+        for holiday in holidays.items:
+            date = (holiday.year, holiday.month, holiday.day)
+            if date in events:
+                events[date][3].append(holiday)
+
+        # Birthdays happen every year, so they are matched by month and day:
+        dates_of_days = {(month, day): (year, month, day) for year, month, day in self.dates}
+        for birthday in birthdays.items:
+            date = dates_of_days.get((birthday.month, birthday.day))
+            if date is not None:
+                events[date][4].append(birthday)
+        self.days = {date: DayModel(*events[date]) for date in self.dates}
+
+
+class PeriodModelCache:
+    """Keeps the sorted events until they change, and the model of the shown period until anything changes"""
+
+    def __init__(self, user_events, user_tasks, holidays, birthdays):
+        self.user_events = user_events
+        self.user_tasks = user_tasks
+        self.holidays = holidays
+        self.birthdays = birthdays
+        self.index_version = None
+        self.date_index = None
+        self.key = None
+        self.model = None
+
+    def get(self, start_date, number_of_days, use_persian_calendar):
+        """Return the model of the days from the start date, calculating it only if something has changed"""
+        if self.user_events.version != self.index_version:
+            self.date_index = EventDateIndex(self.user_events)
+            self.index_version = self.user_events.version
+        start = (start_date.year, start_date.month, start_date.day)
+        key = (start, number_of_days, use_persian_calendar, self.user_events.version,
+               self.user_tasks.deadlines_version, self.holidays.version, self.birthdays.version)
+        if key != self.key:
+            dates = [start_date + datetime.timedelta(days=number) for number in range(number_of_days)]
+            self.model = PeriodModel(dates, self.date_index, self.user_tasks, self.holidays,
+                                     self.birthdays, use_persian_calendar)
+            self.key = key
+        return self.model
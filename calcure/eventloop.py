@@ -0,0 +1,130 @@
+"""Module that waits for key presses, signals, background threads, and scheduled ticks"""
+
+import os
+import sys
+import time
+import heapq
+import signal
+import curses
+import datetime
+import selectors
+
+
+def seconds_to_next_minute():
+    """Calculate in how many seconds the shown clock changes"""
+    return 60 - time.time() % 60 + 0.01
+
+
+def seconds_to_midnight():
+    """Calculate in how many seconds the day changes"""
+    now = datetime.datetime.now()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    return (midnight - now).total_seconds() + 0.01
+
+
+class EventLoop:
+    """Wait until something happens that requires to draw the screen again"""
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+        self.timers = []
+        self.deadlines = {}
+        self.selector = None
+        self.wake_reader, self.wake_writer = None, None
+
+        # Without signals of resize and selectable terminal, wait for keys with a timeout as before:
+        if os.name == "nt" or not hasattr(signal, "SIGWINCH"):
+            return
+        self.input = sys.stdin.fileno()
+        self.wake_reader, self.wake_writer = os.pipe()
+        os.set_blocking(self.wake_reader, False)
+        os.set_blocking(self.wake_writer, False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.input, selectors.EVENT_READ)
+        self.selector.register(self.wake_reader, selectors.EVENT_READ)
+
+        # Resize of the terminal also wakes the loop:
+        signal.signal(signal.SIGWINCH, lambda signum, frame: None)
+        signal.set_wakeup_fd(self.wake_writer)
+
+    def close(self):
+        """Stop listening to the signals and close the pipe"""
+        if self.selector is None:
+            return
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+        self.selector.close()
+        os.close(self.wake_reader)
+        os.close(self.wake_writer)
+
+    def wake(self):
+        """Make the loop draw the screen again, can be called from other threads"""
+        if self.wake_writer is None:
+            return
+        try:
+            os.write(self.wake_writer, b"\0")
+        except BlockingIOError:
+            pass
+
+    def schedule(self, name, seconds):
+        """Wake the loop after a number of seconds, replacing the previous time of the same name"""
+        if seconds is None:
+            self.deadlines.pop(name, None)
+            return
+        deadline = time.time() + max(0, seconds)
+        self.deadlines[name] = deadline
+        heapq.heappush(self.timers, (deadline, name))
+
+        # Times that are scheduled again every frame leave replaced entries behind:
+        if len(self.timers) > 4*len(self.deadlines) + 16:
+            self.timers = [(deadline, name) for name, deadline in self.deadlines.items()]
+            heapq.heapify(self.timers)
+
+    def next_deadline(self):
+        """Find the earliest scheduled time, dropping the replaced and passed ones"""
+        now = time.time()
+        while self.timers:
+            deadline, name = self.timers[0]
+            if self.deadlines.get(name) != deadline:
+                heapq.heappop(self.timers)
+            elif deadline <= now:
+                heapq.heappop(self.timers)
+                del self.deadlines[name]
+                return now
+            else:
+                return deadline
+        return None
+
+    def resize(self):
+        """Adapt curses to the new size of the terminal"""
+        lines, columns = os.get_terminal_size(self.input)
+        if (lines, columns) != self.stdscr.getmaxyx():
+            curses.resize_term(lines, columns)
+            curses.update_lines_cols()
+            self.stdscr.clearok(True)
+
+    def wait(self):
+        """Wait for a key, a signal, a background thread, or a scheduled time, and tell if a key was pressed"""
+        deadline = self.next_deadline()
+        timeout = None if deadline is None else max(0, deadline - time.time())
+
+        # Fall back to waiting for a key with a timeout in tenths of a second:
+        if self.selector is None:
+            curses.halfdelay(255 if timeout is None else min(255, max(1, int(timeout * 10) + 1)))
+            return True
+
+        curses.halfdelay(255)
+        events = self.selector.select(timeout)
+        key_pressed = False
+        for key, _ in events:
+            if key.fd == self.input:
+                key_pressed = True
+            else:
+                try:
+                    while os.read(self.wake_reader, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+                self.resize()
+        self.next_deadline()
+        return key_pressed
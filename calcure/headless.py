@@ -0,0 +1,150 @@
+"""Module with a window that draws into memory, so that views can run without a terminal"""
+
+import curses
+import contextlib
+
+
+class FakeWindow:
+    """Stand-in for a curses window that keeps characters and attributes in a grid"""
+
+    def __init__(self, y_max=40, x_max=120, keys=()):
+        self.keys = list(keys)
+        self.resize(y_max, x_max)
+
+    def resize(self, y_max, x_max):
+        """Change the size of the window and forget its content"""
+        self.y_max = y_max
+        self.x_max = x_max
+        self.background = (" ", 0)
+        self.erase()
+
+    def getmaxyx(self):
+        return self.y_max, self.x_max
+
+    def addstr(self, y, x, text, attribute=0):
+        """Write the text from the position, wrapping to next lines like curses does"""
+        if not (0 <= y < self.y_max and 0 <= x < self.x_max):
+            raise curses.error("addstr() returned ERR")
+        for char in text:
+            if y >= self.y_max:
+                raise curses.error("addstr() returned ERR")
+            self.chars[y][x] = char
+            self.attributes[y][x] = attribute
+            x += 1
+            if x == self.x_max:
+                y, x = y + 1, 0
+
+    def vline(self, y, x, char, length):
+        """Draw a vertical line down from the position"""
+        for row in range(y, min(y + length, self.y_max)):
+            self.chars[row][x] = "│"
+            self.attributes[row][x] = char & ~0xff if isinstance(char, int) else 0
+
+    def bkgdset(self, char, attribute=0):
+        self.background = (char, attribute)
+
+    def erase(self):
+        char, attribute = self.background
+        self.chars = [[char]*self.x_max for _ in range(self.y_max)]
+        self.attributes = [[attribute]*self.x_max for _ in range(self.y_max)]
+
+    def clear(self):
+        self.erase()
+
+    def refresh(self):
+        pass
+
+    def noutrefresh(self, *args):
+        pass
+
+    def touchwin(self):
+        pass
+
+    def clearok(self, flag):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+    def nodelay(self, flag):
+        pass
+
+    def getkey(self):
+        """Return the next scripted key, or fail like curses does when no key is pressed in time"""
+        if not self.keys:
+            raise curses.error("no input")
+        return self.keys.pop(0)
+
+    def getch(self):
+        """Return the code of the next scripted key, or -1 if there is none"""
+        if not self.keys:
+            return -1
+        key = self.keys.pop(0)
+        return ord(key) if len(key) == 1 else getattr(curses, key, -1)
+
+    def getstr(self, y, x, length):
+        """Return the next scripted answer as typed text, cut to the allowed length"""
+        answer = self.getkey()[:length]
+        self.addstr(y, x, answer)
+        return answer.encode("utf-8")
+
+    def line(self, y):
+        """Return the text of one line of the grid"""
+        return "".join(self.chars[y])
+
+    def text(self):
+        """Return the whole grid as text"""
+        return "\n".join(self.line(y) for y in range(self.y_max))
+
+
+class FakeEventLoop:
+    """Stand-in for the event loop that never waits, because the keys are already there"""
+
+    def __init__(self, stdscr):
+        self.stdscr = stdscr
+
+    def wait(self):
+        return True
+
+    def schedule(self, name, seconds):
+        pass
+
+    def next_deadline(self):
+        return None
+
+    def wake(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@contextlib.contextmanager
+def headless_curses(y_max=40, x_max=120, window=None):
+    """Replace the curses functions that need a terminal, so that the program draws into fake windows"""
+    replacements = {
+            "color_pair":  lambda number: number << 8,
+            "halfdelay":   lambda tenths: None,
+            "curs_set":    lambda visibility: None,
+            "noecho":      lambda: None,
+            "echo":        lambda: None,
+            "doupdate":    lambda: None,
+            "start_color": lambda: None,
+            "use_default_colors": lambda: None,
+            "init_pair":   lambda number, foreground, background: None,
+            "newpad":      lambda lines, columns: FakeWindow(lines, columns),
+            "initscr":     lambda: FakeWindow(y_max, x_max) if window is None else window,
+            "endwin":      lambda: None,
+            "ACS_VLINE":   ord("|"),
+            }
+    originals = {name: getattr(curses, name) for name in replacements if hasattr(curses, name)}
+    for name, replacement in replacements.items():
+        setattr(curses, name, replacement)
+    try:
+        yield
+    finally:
+        for name in replacements:
+            if name in originals:
+                setattr(curses, name, originals[name])
+            else:
+                delattr(curses, name)
@@ -0,0 +1,144 @@
+"""Module that measures how long each phase of the program takes, when the user asks for it"""
+
+import time
+import threading
+import functools
+import contextlib
+import collections
+
+
+# Upper bounds of histogram buckets in milliseconds:
+BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf")]
+
+NO_MEASUREMENT = contextlib.nullcontext()
+
+
+class Measurement:
+    """Context that adds the time spent inside it to a phase"""
+
+    def __init__(self, instruments, phase):
+        self.instruments = instruments
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exception):
+        self.instruments.add(self.phase, time.perf_counter() - self.start)
+
+
+class Instruments:
+    """Times of phases kept over the last frames, which cost almost nothing while switched off"""
+
+    def __init__(self, history=1000):
+        self.enabled = False
+        self.history = history
+        self.times = {}
+        self.frame = {}
+        self.last_frame = {}
+        self.frames = 0
+        self.frame_start = None
+        self.lock = threading.Lock()
+        self.report_file = None
+        self.profile_file = None
+        self.profiler = None
+
+    def enable(self, report_file=None, profile_file=None):
+        """Start measuring, and profiling all calls if the file for the profile is given"""
+        self.enabled = True
+        self.report_file = report_file
+        self.profile_file = profile_file
+        if profile_file:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def measure(self, phase):
+        """Return the context that times the phase, or one that does nothing if switched off"""
+        if not self.enabled:
+            return NO_MEASUREMENT
+        return Measurement(self, phase)
+
+    def timed(self, phase):
+        """Decorate the function so that its calls are timed as the phase"""
+        def decorator(function):
+            @functools.wraps(function)
+            def timed_function(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with Measurement(self, phase):
+                    return function(*args, **kwargs)
+            return timed_function
+        return decorator
+
+    def add(self, phase, seconds):
+        """Add the time of the phase to the current frame and to its recent times"""
+        with self.lock:
+            if phase not in self.times:
+                self.times[phase] = collections.deque(maxlen=self.history)
+            self.times[phase].append(seconds*1000)
+            self.frame[phase] = self.frame.get(phase, 0) + seconds*1000
+
+    def start_frame(self):
+        """Remember when drawing of a frame started"""
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Finish the frame, so that its times are shown until the next one ends"""
+        if not self.enabled or self.frame_start is None:
+            return
+        self.add("frame", time.perf_counter() - self.frame_start)
+        with self.lock:
+            self.last_frame, self.frame = self.frame, {}
+            self.frames += 1
+        self.frame_start = None
+
+    def overlay_lines(self, width):
+        """Form lines with the times of the last frame, the longest phases first"""
+        phases = sorted(self.last_frame.items(), key=lambda item: (item[0] != "frame", -item[1]))
+        return [f"{phase[:width-9]:<{width-9}}{milliseconds:>7.2f}ms" for phase, milliseconds in phases]
+
+    def summary(self, times):
+        """Calculate statistics and histogram of the recent times of a phase"""
+        times = sorted(times)
+        def percentile(fraction):
+            return round(times[min(len(times) - 1, int(len(times)*fraction))], 3)
+        histogram = collections.Counter(next(bound for bound in BUCKETS if value <= bound) for value in times)
+        return {
+                "count":   len(times),
+                "mean_ms": round(sum(times)/len(times), 3),
+                "p50_ms":  percentile(0.5),
+                "p90_ms":  percentile(0.9),
+                "p99_ms":  percentile(0.99),
+                "max_ms":  round(times[-1], 3),
+                "histogram": {f"<={bound}ms": histogram[bound] for bound in BUCKETS if histogram[bound]},
+                }
+
+    def report(self):
+        """Form the report of all measured phases"""
+        with self.lock:
+            times = {phase: list(values) for phase, values in self.times.items()}
+            last_frame = dict(self.last_frame)
+        return {
+                "frames": self.frames,
+                "phases": {phase: self.summary(values) for phase, values in sorted(times.items())},
+                "last_frame_ms": {phase: round(value, 3) for phase, value in last_frame.items()},
+                }
+
+    def finish(self):
+        """Save the report and the profile, if measuring was switched on"""
+        if not self.enabled:
+            return
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(self.profile_file)
+        if self.report_file:
+            import json
+            with open(self.report_file, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+        self.enabled = False
+
+
+# Shared by all modules, switched on from the user arguments:
+instruments = Instruments()
@@ -0,0 +1,1406 @@
+"""This module contains views of the interface and its main loop"""
+
+# Libraries:
+import curses
+import time
+import datetime
+
+# Modules:
+from calcure.configuration import cf, __version__
+from calcure.weather import Weather
+from calcure.eventloop import EventLoop, seconds_to_next_minute, seconds_to_midnight
+from calcure.instrumentation import instruments
+from calcure.repository import Importer, FileRepository
+from calcure.dialogues import clear_line
+from calcure.screen import Screen
+from calcure.data import *
+from calcure.controls import *
+
+
+# Language:
+if cf.LANG == "fr":
+    from calcure.translation_fr import *
+elif cf.LANG == "ru":
+    from calcure.translation_ru import *
+else:
+    from calcure.translation_en import *
+
+
+def initialize_colors():
+    """Define all the color pairs"""
+    curses.start_color()
+    curses.use_default_colors()
+    curses.init_pair(Color.DAY_NAMES.value, cf.COLOR_DAY_NAMES, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.WEEKENDS.value, cf.COLOR_WEEKENDS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.HINTS.value, cf.COLOR_HINTS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TODAY.value, cf.COLOR_TODAY, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.DAYS.value, cf.COLOR_DAYS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.WEEKEND_NAMES.value, cf.COLOR_WEEKEND_NAMES, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.BIRTHDAYS.value, cf.COLOR_BIRTHDAYS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.PROMPTS.value, cf.COLOR_PROMPTS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.CONFIRMATIONS.value, cf.COLOR_CONFIRMATIONS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TITLE.value, cf.COLOR_TITLE, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TODO.value, cf.COLOR_TODO, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.DONE.value, cf.COLOR_DONE, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.IMPORTANT.value, cf.COLOR_IMPORTANT, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TIMER.value, cf.COLOR_TIMER, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TIMER_PAUSED.value, cf.COLOR_TIMER_PAUSED, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.HOLIDAYS.value, cf.COLOR_HOLIDAYS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.EVENTS.value, cf.COLOR_EVENTS, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.TIME.value, cf.COLOR_TIME, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.WEATHER.value, cf.COLOR_WEATHER, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.UNIMPORTANT.value, cf.COLOR_UNIMPORTANT, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.CALENDAR_HEADER.value, cf.COLOR_CALENDAR_HEADER, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.ACTIVE_PANE.value, cf.COLOR_ACTIVE_PANE, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.SEPARATOR.value, cf.COLOR_SEPARATOR, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.EMPTY.value, cf.COLOR_BACKGROUND, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.CALENDAR_BOARDER.value, cf.COLOR_CALENDAR_BOARDER, cf.COLOR_BACKGROUND)
+    curses.init_pair(Color.DEADLINES.value, cf.COLOR_DEADLINES, cf.COLOR_BACKGROUND)
+    for calendar in cf.CALENDARS:
+        curses.init_pair(calendar.color_pair, calendar.color, cf.COLOR_BACKGROUND)
+
+    if not cf.MINIMAL_WEEKEND_INDICATOR:
+        curses.init_pair(Color.WEEKENDS.value, curses.COLOR_BLACK, cf.COLOR_WEEKENDS)
+    if not cf.MINIMAL_TODAY_INDICATOR:
+        curses.init_pair(Color.TODAY.value, curses.COLOR_BLACK, cf.COLOR_TODAY)
+    if not cf.MINIMAL_DAYS_INDICATOR:
+        curses.init_pair(Color.DAYS.value, curses.COLOR_BLACK, cf.COLOR_DAYS)
+
+
+class View:
+    """Parent class of a view that displays things at certain coordinates"""
+
+    def __init__(self, stdscr, y, x):
+        self.stdscr = stdscr
+        self.y = y
+        self.x = x
+
+    def fill_background(self):
+        """Erase the off-screen buffer to the background color, so that only changed cells are sent to the terminal"""
+        self.stdscr.bkgdset(" ", curses.color_pair(1))
+        self.stdscr.erase()
+
+    def display_line(self, y, x, text, color, bold=False, underlined=False):
+        """Display the line of text respecting the slyling and available space"""
+
+        # Make sure that we display inside the screen:
+        frame = self.screen.frame
+        if y >= frame.y_max or x >= frame.x_max:
+            return
+
+        # Cut the text if it does not fit the screen:
+        text = text[:(frame.x_max - 1 - x)]
+
+        # Attributes of each style are found once and kept by the frame:
+        style = frame.styles.get((color, bold, underlined))
+        if style is None:
+            style = self.resolve_style(color, bold, underlined)
+            frame.styles[(color, bold, underlined)] = style
+        self.stdscr.addstr(y, x, text, style)
+
+    @staticmethod
+    def resolve_style(color, bold, underlined):
+        """Combine the color pair with the attributes of the text"""
+
+        # Colors of calendar files are passed as numbers of color pairs:
+        style = curses.color_pair(color.value if isinstance(color, Color) else color)
+        if bold:
+            style |= curses.A_BOLD
+        if underlined:
+            style |= curses.A_UNDERLINE
+        return style
+
+
+class PaneWindow:
+    """Off-screen pad of the screen size for one pane, which is drawn again only when its content changes"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.size = (screen.y_max, screen.frame.x_max)
+        self.pad = curses.newpad(*self.size)
+        self.signature = None
+
+    def needs_render(self, signature):
+        """Check if the pane shows something else than when it was drawn, where None means always"""
+        size = (self.screen.y_max, self.screen.frame.x_max)
+        if self.size != size:
+            self.pad.resize(*size)
+            self.size = size
+            self.signature = None
+        if signature is None or signature != self.signature:
+            self.signature = signature
+            return True
+        return False
+
+    def show(self, y_min, x_min, y_max, x_max):
+        """Copy the part of the pad into the same part of the screen buffer"""
+        if y_max > y_min and x_max > x_min:
+            self.pad.touchwin()
+            self.pad.noutrefresh(y_min, x_min, y_min, x_min, y_max - 1, x_max - 1)
+
+
+class ViewCache:
+    """Views of items kept between frames, so that unchanged items are not formatted again"""
+
+    def __init__(self):
+        self.views = {}
+        self.frame = 0
+        self.shown_views = 0
+        self.config_version = cf.version
+
+    def new_frame(self):
+        """Start a new frame and forget views that have not been shown for a while"""
+        if self.config_version != cf.version:
+            self.views = {}
+            self.config_version = cf.version
+        elif len(self.views) > 2*self.shown_views + 100:
+            self.views = {key: view for key, view in self.views.items() if view.shown_frame == self.frame}
+        self.frame += 1
+        self.shown_views = 0
+
+    def get(self, key):
+        """Return the view formatted for the same item and display, or None"""
+        view = self.views.get(key)
+        if view is not None:
+            view.shown_frame = self.frame
+            self.shown_views += 1
+        return view
+
+    def add(self, key, view):
+        """Remember the newly created view"""
+        self.views[key] = view
+        view.shown_frame = self.frame
+        self.shown_views += 1
+        return view
+
+
+class TaskView(View):
+    """Display a single task"""
+
+    def __init__(self, stdscr, y, x, task, screen):
+        super().__init__(stdscr, y, x)
+        self.task = task
+        self.screen = screen
+        self.info = f'{self.icon} {self.task.name[self.indent:]}'
+        if self.screen.privacy or self.task.privacy:
+            self.obfuscate_info()
+
+        # Deadline and timer follow the name:
+        deadline_indentation = self.screen.x_min + 2 + len(self.info) + self.indent
+        self.deadline_view = TaskDeadlineView(self.stdscr, self.y, deadline_indentation, self.task, self.screen)
+        addition_indentation = (self.deadline_view.has_deadline)*(4 + len(self.deadline_view.info))
+        timer_indentation = deadline_indentation + addition_indentation
+        self.timer_view = TimerView(self.stdscr, self.y, timer_indentation, self.task.timer, self.screen)
+
+    @property
+    def color(self):
+        """Select the color depending on the status"""
+        if self.task.status == Status.DONE:
+            return Color.DONE
+        if self.task.status == Status.IMPORTANT:
+            return Color.IMPORTANT
+        if self.task.status == Status.UNIMPORTANT:
+            return Color.UNIMPORTANT
+        return Color.TODO
+
+    @property
+    def icon(self):
+        """Select the icon for the task"""
+        icon = cf.TODO_ICON
+        if cf.DISPLAY_ICONS:
+            for keyword in cf.ICONS:
+                if keyword in self.task.name.lower():
+                    icon = cf.ICONS[keyword]
+        if self.task.status == Status.DONE:
+            icon = cf.DONE_ICON
+        if self.task.status == Status.IMPORTANT:
+            icon = cf.IMPORTANT_ICON
+        return icon
+
+    @property
+    def indent(self):
+        """Calculate the left indentation depending on the task level"""
+        if self.task.name[:4] == '----':
+            return 4
+        if self.task.name[:2] == '--':
+            return 2
+        return 0
+
+    def obfuscate_info(self):
+        """Obfuscate the info if privacy mode is on"""
+        self.info = f'{cf.TODO_ICON} {cf.PRIVACY_ICON * len(self.task.name[self.indent:])}'
+
+    def render(self):
+        """Render a line with an icon, task, deadline, and timer"""
+        self.display_line(self.y, self.x + self.indent, self.info, self.color)
+        self.deadline_view.y = self.y
+        self.deadline_view.render()
+        self.timer_view.y = self.y
+        self.timer_view.render()
+
+
+class TaskDeadlineView(View):
+    """Display deadline for a task"""
+
+    def __init__(self, stdscr, y, x, task, screen):
+        super().__init__(stdscr, y, x)
+        self.task = task
+        self.screen = screen
+        self.color = Color.DEADLINES
+        self.icon = cf.DEADLINE_ICON
+        self.info = f"{self.task.year}/{self.task.month}/{self.task.day}"
+        self.has_deadline = (self.task.year > 0)
+
+    def render(self):
+        """Render a line with the deadline date and icon"""
+        if self.has_deadline:
+            self.display_line(self.y, self.x, f"{self.icon} {self.info}", self.color)
+
+
+class TimerView(View):
+    """Display timer for a task"""
+
+    def __init__(self, stdscr, y, x, timer, screen):
+        super().__init__(stdscr, y, x)
+        self.timer = timer
+        self.screen = screen
+        self.color = Color.TIMER if self.timer.is_counting else Color.TIMER_PAUSED
+
+    @property
+    def icon(self):
+        """Return icon corresponding to timer state"""
+        TIMER_RUNS_ICON = "⏵" if cf.DISPLAY_ICONS else "·"
+        TIMER_PAUSED_ICON = "⏯︎" if cf.DISPLAY_ICONS else "·"
+        return TIMER_RUNS_ICON if self.timer.is_counting else TIMER_PAUSED_ICON
+
+    def render(self):
+        """Render a line with a timer and icon"""
+        if self.timer.is_started:
+            passed_time = self.timer.format_passed_time(cf.SHOW_SECONDS_AFTER_HOUR)
+            self.display_line(self.y, self.x, f"{self.icon} {passed_time}", self.color)
+
+
+class JournalView(View):
+    """Displays a list of all tasks"""
+
+    def __init__(self, stdscr, y, x, user_tasks, screen, view_cache):
+        super().__init__(stdscr, y, x)
+        self.user_tasks = user_tasks
+        self.screen = screen
+        self.view_cache = view_cache
+        self.timer_views = []
+
+    def task_view(self, task):
+        """Take the formatted view of the task from the cache or create it"""
+        key = (task, task.name, task.status, task.privacy, task.year, task.month, task.day,
+               task.timer.is_started, task.timer.is_counting, self.screen.privacy, self.screen.x_min)
+        task_view = self.view_cache.get(key)
+        if task_view is None:
+            task_view = self.view_cache.add(key, TaskView(self.stdscr, self.y, self.x, task, self.screen))
+        task_view.y = self.y
+        return task_view
+
+    def render(self):
+        """Render the tasks that fit on the screen from the scrolled position, and remember where the running timers are"""
+        if not self.user_tasks.items and cf.SHOW_NOTHING_PLANNED:
+            self.display_line(self.y, self.x, MSG_TS_NOTHING, Color.UNIMPORTANT)
+
+        # Keep the scrolled position so that the screen is filled with tasks:
+        y_max = self.screen.y_max
+        rows = (y_max - 1 if cf.SHOW_KEYBINDINGS else y_max) - self.y
+        offset = max(0, min(self.screen.journal_offset, len(self.user_tasks.items) - rows))
+        self.screen.journal_offset = offset
+
+        for index in range(offset, min(len(self.user_tasks.items), offset + rows)):
+            task = self.user_tasks.items[index]
+            task_view = self.task_view(task)
+            task_view.render()
+            if task.timer.is_counting:
+                self.timer_views.append(task_view.timer_view)
+            if self.screen.selection_mode:
+                self.display_line(self.y, self.x, str(index + 1), Color.TODAY)
+            self.y += 1
+
+
+class EventView(View):
+    """Parent class to display events"""
+
+    def __init__(self, stdscr, y, x, event, screen):
+        super().__init__(stdscr, y, x)
+        self.event = event
+        self.screen = screen
+        self.info = f"{self.icon} {self.event.name}"
+        self.is_formatted = False
+
+    @property
+    def icon(self):
+        """Select the right icon for the event"""
+        return cf.EVENT_ICON
+
+    @property
+    def is_hidden(self):
+        """Whether the name should be obfuscated"""
+        return self.screen.privacy or self.event.privacy
+
+    @property
+    def color(self):
+        """Select the color depending on the status and type"""
+        calendar = getattr(self.event, "calendar", None)
+        color = Color.EVENTS if calendar is None or calendar.color_pair is None else calendar.color_pair
+        if self.event.status == Status.IMPORTANT:
+            color = Color.IMPORTANT
+        if self.event.status == Status.UNIMPORTANT:
+            color = Color.UNIMPORTANT
+        return color
+
+    def obfuscate_info(self):
+        """Obfuscate the info if privacy mode is on"""
+        self.info = f'{cf.EVENT_ICON} {cf.PRIVACY_ICON * len(self.event.name)}'
+
+    def cut_info(self):
+        """Cut the name to fit into the cell of the calendar"""
+        self.info = self.info[:self.screen.x_max - self.x]
+        x_cell = self.screen.x_max // 7
+        if ((cf.CUT_TITLES or cf.SHOW_CALENDAR_BOARDERS)
+                and self.screen.calendar_state in [CalState.MONTHLY, CalState.WEEKLY]):
+            self.info = self.info[:(x_cell - 1)]
+
+    def minimize_info(self):
+        """Reduce the info to just icon if not much space if available"""
+        x_cell = self.screen.x_max // 7
+        if x_cell < 7:
+            self.info = self.icon
+
+    def fill_remaining_space(self):
+        """Fill rest of the line of the calendar with empty characters"""
+        x_cell = self.screen.x_max // 7
+        if len(self.info) < self.screen.x_max - self.x:
+            self.info += " "*(self.screen.x_max - self.x - len(self.info))
+
+    def render(self):
+        """Render this view on the screen, formatting the info only the first time"""
+        if not self.is_formatted:
+            if self.is_hidden:
+                self.obfuscate_info()
+            self.fill_remaining_space()
+            self.cut_info()
+            self.minimize_info()
+            self.line_color = self.color
+            self.is_formatted = True
+        self.display_line(self.y, self.x, self.info, self.line_color)
+
+
+class UserEventView(EventView):
+    """Display a single user event"""
+
+    @property
+    def icon(self):
+        """Select the right icon for the event"""
+        icon = cf.EVENT_ICON
+        if cf.DISPLAY_ICONS:
+            for keyword in cf.ICONS:
+                if keyword in self.event.name.lower():
+                    icon = cf.ICONS[keyword]
+        if self.screen.privacy or self.event.privacy:
+            icon = cf.PRIVACY_ICON
+        return icon
+
+
+class BirthdayView(EventView):
+    """Display a line with birthday icon and name"""
+
+    @property
+    def icon(self):
+        """Set the icon for birthdays"""
+        return cf.BIRTHDAY_ICON
+
+    @property
+    def color(self):
+        """Set the color for birthdays"""
+        return Color.BIRTHDAYS
+
+    @property
+    def is_hidden(self):
+        """Birthdays are hidden only in privacy mode"""
+        return self.screen.privacy
+
+
+class HolidayView(EventView):
+    """Display a line with holiday icon and occasion"""
+
+    @property
+    def icon(self):
+        """Set the icon for holiday events"""
+        return cf.HOLIDAY_ICON
+
+    @property
+    def color(self):
+        """Set the color for holidays"""
+        return Color.HOLIDAYS
+
+    @property
+    def is_hidden(self):
+        """Holidays are never hidden"""
+        return False
+
+
+class DeadlineView(EventView):
+    """Display a line with deadline icon and task name"""
+
+    def __init__(self, stdscr, y, x, event, screen):
+        super().__init__(stdscr, y, x, event, screen)
+        self.info = f"{self.icon} {self.event.name[self.indent:]}"
+
+    @property
+    def icon(self):
+        """Set the icon for task deadline"""
+        return cf.DEADLINE_ICON
+
+    @property
+    def indent(self):
+        """Calculate the left indentation depending on the task level"""
+        if self.event.name[:4] == '----':
+            return 4
+        if self.event.name[:2] == '--':
+            return 2
+        return 0
+
+    @property
+    def color(self):
+        """Set the color for deadlines"""
+        return Color.DEADLINES
+
+
+class DailyView(View):
+    """Display all events occurring on this days"""
+
+    def __init__(self, stdscr, y, x, day_model, screen, index_offset, view_cache, y_cell=None):
+        super().__init__(stdscr, y, x)
+        self.day_model = day_model
+        self.screen = screen
+        self.index_offset = index_offset
+        self.view_cache = view_cache
+        self.y_cell = (self.screen.y_max - 3) // 6 if y_cell is None else y_cell
+        self.x_cell = self.screen.x_max // 7
+        self.hidden_events_sign = cf.HIDDEN_ICON + " "*(self.x_cell-len(cf.HIDDEN_ICON))
+
+    def event_view(self, view_class, event, y):
+        """Take the formatted view of the event from the cache or create it"""
+        key = (view_class, event, event.name, getattr(event, "status", None), getattr(event, "privacy", False),
+               self.screen.privacy, self.screen.x_max, self.screen.calendar_state, self.x)
+        event_view = self.view_cache.get(key)
+        if event_view is None:
+            event_view = self.view_cache.add(key, view_class(self.stdscr, y, self.x, event, self.screen))
+        event_view.y = y
+        return event_view
+
+    def render(self):
+        """Render this view on the screen"""
+        index = 0
+
+        # Show user events:
+        for event in self.day_model.user_events:
+            if index < self.y_cell - 1:
+                user_event_view = self.event_view(UserEventView, event, self.y + index)
+                user_event_view.render()
+                if self.screen.selection_mode:
+                    self.display_line(self.y + index, self.x, str(index + self.index_offset + 1), Color.TODAY)
+            else:
+                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
+            index += 1
+
+        # Show repeated user events:
+        for event in self.day_model.repeated_events:
+            if index < self.y_cell - 1:
+                user_event_view = self.event_view(UserEventView, event, self.y + index)
+                user_event_view.render()
+            else:
+                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
+            index += 1
+
+        # Show deadlines for tasks:
+        for event in self.day_model.deadlines:
+            if index < self.y_cell - 1:
+                deadline_view = self.event_view(DeadlineView, event, self.y + index)
+                deadline_view.render()
+            else:
+                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.DEADLINES)
+            index += 1
+
+        # Show holidays:
+        if not cf.DISPLAY_HOLIDAYS:
+            return
+        for event in self.day_model.holidays:
+            if index < self.y_cell - 1:
+                holiday_view = self.event_view(HolidayView, event, self.y + index)
+                holiday_view.render()
+            else:
+                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.HOLIDAYS)
+            index += 1
+
+        # Show birthdays:
+        if not cf.BIRTHDAYS_FROM_ABOOK:
+            return
+        for event in self.day_model.birthdays:
+            if index < self.y_cell - 1:
+                birthday_view = self.event_view(BirthdayView, event, self.y + index)
+                birthday_view.render()
+            else:
+                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.BIRTHDAYS)
+            index += 1
+
+        if index == 0 and self.screen.calendar_state == CalState.DAILY and cf.SHOW_NOTHING_PLANNED:
+            self.display_line(self.y, self.x, MSG_TS_NOTHING, Color.UNIMPORTANT)
+
+
+class DayNumberView(View):
+    """Display the date of the day in month with proper styling"""
+
+    def __init__(self, stdscr, y, x, screen, day, day_in_week, x_cell):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+        self.day = day
+        self.day_in_week = day_in_week
+        self.x_cell = x_cell
+
+    @property
+    def is_today(self):
+        """Check if this day of the displayed month is today"""
+        today = self.screen.today
+        return self.day == today.day and self.screen.month == today.month and self.screen.year == today.year
+
+    def render(self):
+        """Render this view on the screen"""
+        if self.is_today:
+            today = f"{self.day}{cf.TODAY_ICON}{' '*(self.x_cell - len(str(self.day)) - 2)}"
+            self.display_line(self.y, self.x, today, Color.TODAY, cf.BOLD_TODAY, cf.UNDERLINED_TODAY)
+        elif self.day_in_week + 1 in cf.WEEKEND_DAYS:
+            weekend = f"{self.day}{' '*(self.x_cell - len(str(self.day)) - 1)}"
+            self.display_line(self.y, self.x, weekend, Color.WEEKENDS, cf.BOLD_WEEKENDS, cf.UNDERLINED_WEEKENDS)
+        else:
+            weekday = f"{self.day}{' '*(self.x_cell - len(str(self.day)) - 1)}"
+            self.display_line(self.y, self.x, weekday, Color.DAYS, cf.BOLD_DAYS, cf.UNDERLINED_DAYS)
+
+
+class TitleView(View):
+    """Show the title in the header"""
+
+    def __init__(self, stdscr, y, x, title, screen):
+        super().__init__(stdscr, y, x)
+        self.title = title
+        self.screen = screen
+
+    def render(self):
+        """Render this view on the screen"""
+        if self.screen.active_pane and self.screen.split:
+            self.display_line(0, self.screen.x_min, self.title, Color.ACTIVE_PANE, cf.BOLD_ACTIVE_PANE, cf.UNDERLINED_ACTIVE_PANE)
+        else:
+            self.display_line(0, self.screen.x_min, self.title, Color.CALENDAR_HEADER, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+
+
+class HeaderView(View):
+    """Show the header that includes the weather, time, and title"""
+
+    def __init__(self, stdscr, y, x, title, weather, screen):
+        super().__init__(stdscr, y, x)
+        self.title = title
+        self.weather = weather
+        self.screen = screen
+
+    def render(self):
+        # Show title:
+        title_view = TitleView(self.stdscr, 0, self.screen.x_min, self.title, self.screen)
+        title_view.render()
+
+        if self.screen.state == AppState.JOURNAL and self.screen.split:
+            return
+
+        # Show weather is space allows and it is loaded:
+        size_allows = len(self.weather.forcast) < self.screen.x_max - len(self.title)
+        if cf.SHOW_WEATHER and size_allows:
+            self.display_line(0, self.screen.x_max - len(self.weather.forcast) - 1, self.weather.forcast, Color.WEATHER)
+
+        # Show time:
+        time_string = time.strftime("%H:%M", time.localtime())
+        size_allows = len(self.weather.forcast) < self.screen.x_max - len(self.title) - len(time_string)
+        if cf.SHOW_CURRENT_TIME and size_allows:
+            self.display_line(0, (self.screen.x_max // 2 - 2), time_string, Color.TIME)
+
+
+class FooterView(View):
+    """Display the footer with keybinding"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def render(self):
+        if not cf.SHOW_KEYBINDINGS: return
+        clear_line(self.stdscr, self.screen.y_max - 1)
+        if self.screen.state == AppState.CALENDAR:
+            if self.screen.calendar_state == CalState.MONTHLY:
+                hint = CALENDAR_HINT
+            elif self.screen.calendar_state == CalState.YEARLY:
+                hint = CALENDAR_HINT_Y
+            elif self.screen.calendar_state in [CalState.WEEKLY, CalState.AGENDA]:
+                hint = CALENDAR_HINT_W
+            else:
+                hint = CALENDAR_HINT_D
+        elif self.screen.state == AppState.JOURNAL:
+            hint = JOURNAL_HINT
+        self.display_line(self.screen.y_max - 1, 0, hint, Color.HINTS)
+
+
+class SeparatorView(View):
+    """Display the separator in the split screen"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def render(self):
+        y_max, x_max = self.screen.y_max, self.screen.frame.x_max
+        x_separator = x_max - self.screen.journal_pane_width
+
+        # Make sure that we display inside the screen, as display_line does:
+        if not 0 <= x_separator < x_max - 1:
+            return
+        y_cell = (y_max - 3) // 6
+        height = 6*y_cell + 2 if cf.SHOW_CALENDAR_BOARDERS else y_max
+        color_pair = curses.color_pair(Color.SEPARATOR.value)
+        for row in range(min(height, y_max)):
+            self.stdscr.addstr(row, x_separator, cf.SEPARATOR_ICON, color_pair)
+
+        if cf.SHOW_CALENDAR_BOARDERS and self.screen.calendar_state == CalState.MONTHLY and y_cell > 0:
+            for row in range(1, 7):
+                self.display_line(row*y_cell + 1, x_separator, "┤", Color.CALENDAR_BOARDER)
+            self.display_line(6*y_cell + 1, x_separator, "┘", Color.CALENDAR_BOARDER)
+
+
+class CalenarBoarderView(View):
+    """Display the boarders in the monthly view"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+        self.geometry = None
+        self.vertical_lines = []
+        self.horizontal_lines = []
+
+    def calculate_lines(self, y_max, x_max, width):
+        """Form the horizontal lines with connectors and positions of vertical lines for this screen size"""
+        x_cell = width // 7
+        y_cell = (y_max - 3) // 6
+        length = min(width, x_max - 1)
+        columns = [column*x_cell - 1 for column in range(1, 7) if 0 <= column*x_cell - 1 < length]
+        self.vertical_lines = [(2, x, y_cell*6) for x in columns] if y_cell > 0 else []
+        self.horizontal_lines = []
+        for row in range(1, 7):
+            line = ["─"]*length
+            for x in columns:
+                line[x] = "┼" if row < 6 else "┴"
+            if 0 < row*y_cell + 1 < y_max:
+                self.horizontal_lines.append((row*y_cell + 1, "".join(line)))
+
+    def render(self):
+        geometry = (self.screen.y_max, self.screen.frame.x_max, self.screen.x_max)
+        if geometry != self.geometry:
+            self.calculate_lines(*geometry)
+            self.geometry = geometry
+
+        # Vertical lines first, so that horizontal lines with connectors are drawn over them:
+        color_pair = curses.color_pair(Color.CALENDAR_BOARDER.value)
+        for y, x, length in self.vertical_lines:
+            self.stdscr.vline(y, x, curses.ACS_VLINE | color_pair, length)
+        for y, line in self.horizontal_lines:
+            self.stdscr.addstr(y, 0, line, color_pair)
+
+
+class DaysNameView(View):
+    """Display day name depending on the screen available and with right style"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def render(self):
+        num = 2 if self.screen.x_max < 74 else 12
+        x_cell = int(self.screen.x_max // 7)
+
+        # Depending on which day we start the week, weekends are shifted:
+        for i in range(7):
+            shift = cf.START_WEEK_DAY - 1
+            day_number = i + shift - 7*((i + shift) > 6)
+            day_names = DAYS_PERSIAN if cf.USE_PERSIAN_CALENDAR else DAYS
+            name = day_names[day_number][:num]
+            x = self.x + i*x_cell
+            if day_number + 1 not in cf.WEEKEND_DAYS:
+                self.display_line(self.y, x, name, Color.DAY_NAMES, cf.BOLD_DAY_NAMES, cf.UNDERLINED_DAY_NAMES)
+            else:
+                self.display_line(self.y, x, name, Color.WEEKEND_NAMES, cf.BOLD_WEEKEND_NAMES, cf.UNDERLINED_WEEKEND_NAMES)
+
+
+##################### SCREENS ##########################
+
+
+class DailyScreenView(View):
+    """Daily view showing events of the day"""
+
+    def __init__(self, stdscr, y, x, weather, month_models, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.month_models = month_models
+        self.screen = screen
+        self.view_cache = ViewCache()
+
+    def render(self):
+        self.screen.state = AppState.CALENDAR
+        if self.screen.x_max < 6 or self.screen.y_max < 3: return
+        # self.fill_background()
+
+        # Form a string with month, year, and day with today icon:
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        icon = cf.TODAY_ICON if self.screen.is_today else ''
+        month_string = str(month_names[self.screen.month-1])
+        date_string = f'{month_string} {self.screen.day}, {self.screen.year} {icon}'
+
+        # Display header and footer:
+        header_view = HeaderView(self.stdscr, 0, 0, date_string, self.weather, self.screen)
+        header_view.render()
+
+        # Display the events:
+        month_model = self.month_models.get(self.screen.year, self.screen.month, cf.START_WEEK_DAY, cf.USE_PERSIAN_CALENDAR)
+        self.view_cache.new_frame()
+        daily_view = DailyView(self.stdscr, self.y + 2, self.x, month_model.days[self.screen.day], self.screen, 0,
+                               self.view_cache)
+        daily_view.render()
+
+
+class MonthlyScreenView(View):
+    """Monthly view showing events of the month"""
+
+    def __init__(self, stdscr, y, x, weather, month_models, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.month_models = month_models
+        self.screen = screen
+        self.view_cache = ViewCache()
+        self.calendar_boarder_view = CalenarBoarderView(stdscr, 0, 0, screen)
+
+    def render(self):
+        self.screen.state = AppState.CALENDAR
+        if self.screen.x_max < 6 or self.screen.y_max < 3: return
+
+        # Info about the month:
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        month_year_string = month_names[self.screen.month-1] + " " + str(self.screen.year)
+        month_model = self.month_models.get(self.screen.year, self.screen.month, cf.START_WEEK_DAY, cf.USE_PERSIAN_CALENDAR)
+
+        y_cell = (self.screen.y_max - 3) // 6
+        x_cell = self.screen.x_max // 7
+
+        header_view = HeaderView(self.stdscr, 0, 0, month_year_string, self.weather, self.screen)
+        days_name_view = DaysNameView(self.stdscr, 1, 0, self.screen)
+        header_view.render()
+        days_name_view.render()
+
+        # Displaying the dates and events:
+        self.view_cache.new_frame()
+        for row, week in enumerate(month_model.weeks):
+            for col, day in enumerate(week):
+                if day != 0:
+                    # Display dates of the month with proper styles:
+                    day_in_week = col + (cf.START_WEEK_DAY - 1) - 7 * ((col + (cf.START_WEEK_DAY - 1)) > 6)
+                    day_number_view = DayNumberView(self.stdscr, 2 + row * y_cell, col * x_cell, self.screen, day, day_in_week, x_cell)
+                    day_number_view.render()
+
+                    # Display the events:
+                    daily_view = DailyView(self.stdscr, 3 + row * y_cell, col * x_cell, month_model.days[day],
+                                           self.screen, month_model.index_offsets[day], self.view_cache)
+                    daily_view.render()
+
+        if cf.SHOW_CALENDAR_BOARDERS:
+            self.calendar_boarder_view.render()
+
+
+class YearlyScreenView(View):
+    """Yearly view showing all months with days shaded by the number of events"""
+
+    def __init__(self, stdscr, y, x, weather, year_models, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.year_models = year_models
+        self.screen = screen
+
+    def day_style(self, count, max_count, is_weekend):
+        """Select the color and boldness of the day depending on how busy it is"""
+        if count == 0:
+            return (Color.WEEKENDS, cf.BOLD_WEEKENDS) if is_weekend else (Color.DAYS, cf.BOLD_DAYS)
+        level = min(3, 1 + (3*count - 1) // max_count)
+        if level == 1:
+            return Color.EVENTS, False
+        if level == 2:
+            return Color.EVENTS, True
+        return Color.IMPORTANT, True
+
+    def render(self):
+        self.screen.state = AppState.CALENDAR
+        if self.screen.x_max < 21 or self.screen.y_max < 9: return
+        year = self.screen.year
+        year_model = self.year_models.get(year, cf.START_WEEK_DAY, cf.USE_PERSIAN_CALENDAR)
+        header_view = HeaderView(self.stdscr, 0, 0, str(year), self.weather, self.screen)
+        header_view.render()
+
+        # Months are placed in as many columns as fit, and names of days are dropped if rows do not fit:
+        columns = next((number for number in (6, 4, 3, 2) if number*22 - 1 <= self.screen.x_max), 1)
+        rows = 12 // columns
+        x_block = self.screen.x_max // columns
+        y_block = max(7, min(9, (self.screen.y_max - 3) // rows))
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        day_names = DAYS_PERSIAN if cf.USE_PERSIAN_CALENDAR else DAYS
+        shift = cf.START_WEEK_DAY - 1
+        today = self.screen.today
+        counts = year_model.counts
+
+        for month in range(1, 13):
+            y = 2 + ((month - 1) // columns) * y_block
+            x = ((month - 1) % columns) * x_block
+            self.display_line(y, x, month_names[month-1], Color.CALENDAR_HEADER, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+            y += 1
+            if y_block > 7:
+                for col in range(7):
+                    day_number = (col + shift) % 7
+                    color = Color.WEEKEND_NAMES if day_number + 1 in cf.WEEKEND_DAYS else Color.DAY_NAMES
+                    self.display_line(y, x + col*3, day_names[day_number][:2], color)
+                y += 1
+
+            # Days are shaded by the number of events, repetitions, deadlines, holidays, and birthdays:
+            for row, week in enumerate(year_model.weeks[month]):
+                for col, day in enumerate(week):
+                    if day == 0:
+                        continue
+                    if day == today.day and month == today.month and year == today.year:
+                        color, bold, underlined = Color.TODAY, cf.BOLD_TODAY, cf.UNDERLINED_TODAY
+                    else:
+                        is_weekend = (col + shift) % 7 + 1 in cf.WEEKEND_DAYS
+                        color, bold = self.day_style(counts.get((month, day), 0), year_model.max_count, is_weekend)
+                        underlined = False
+                    self.display_line(y + row, x + col*3, f"{day:>2}", color, bold, underlined)
+
+
+def period_title(period_model):
+    """Form the title with the first and the last dates of the period"""
+    month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+    (_, first_month, first_day), (year, last_month, last_day) = period_model.dates[0], period_model.dates[-1]
+    return f"{month_names[first_month-1]} {first_day} - {month_names[last_month-1]} {last_day}, {year}"
+
+
+class DayDateView(View):
+    """Display the date of a day in a period with proper styling"""
+
+    def __init__(self, stdscr, y, x, screen, date, weekday, text):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+        self.date = date
+        self.weekday = weekday
+        self.text = text
+
+    def render(self):
+        """Render this view on the screen"""
+        today = self.screen.today
+        if self.date == (today.year, today.month, today.day):
+            self.display_line(self.y, self.x, f"{self.text}{cf.TODAY_ICON}", Color.TODAY, cf.BOLD_TODAY, cf.UNDERLINED_TODAY)
+        elif self.weekday + 1 in cf.WEEKEND_DAYS:
+            self.display_line(self.y, self.x, self.text, Color.WEEKENDS, cf.BOLD_WEEKENDS, cf.UNDERLINED_WEEKENDS)
+        else:
+            self.display_line(self.y, self.x, self.text, Color.DAYS, cf.BOLD_DAYS, cf.UNDERLINED_DAYS)
+
+
+class WeeklyScreenView(View):
+    """Weekly view showing events of the seven days of the displayed week"""
+
+    def __init__(self, stdscr, y, x, weather, period_models, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.period_models = period_models
+        self.screen = screen
+        self.view_cache = ViewCache()
+
+    def render(self):
+        self.screen.state = AppState.CALENDAR
+        if self.screen.x_max < 6 or self.screen.y_max < 5: return
+
+        # The week starts on the configured day:
+        date = self.screen.date
+        start_date = date - datetime.timedelta(days=(date.weekday() - (cf.START_WEEK_DAY - 1)) % 7)
+        period_model = self.period_models.get(start_date, 7, cf.USE_PERSIAN_CALENDAR)
+
+        header_view = HeaderView(self.stdscr, 0, 0, period_title(period_model), self.weather, self.screen)
+        days_name_view = DaysNameView(self.stdscr, 1, 0, self.screen)
+        header_view.render()
+        days_name_view.render()
+
+        # Each day takes a column down to the footer:
+        x_cell = self.screen.x_max // 7
+        self.view_cache.new_frame()
+        for col, date in enumerate(period_model.dates):
+            day_date_view = DayDateView(self.stdscr, 2, col * x_cell, self.screen, date,
+                                        period_model.weekdays[date], str(date[2]))
+            day_date_view.render()
+            daily_view = DailyView(self.stdscr, 3, col * x_cell, period_model.days[date], self.screen, 0,
+                                   self.view_cache, self.screen.y_max - 3)
+            daily_view.render()
+
+
+class AgendaScreenView(View):
+    """Agenda view listing events of the days that follow the displayed date"""
+
+    def __init__(self, stdscr, y, x, weather, period_models, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.period_models = period_models
+        self.screen = screen
+        self.view_cache = ViewCache()
+
+    def render(self):
+        self.screen.state = AppState.CALENDAR
+        if self.screen.x_max < 6 or self.screen.y_max < 5: return
+        period_model = self.period_models.get(self.screen.date, cf.AGENDA_DAYS, cf.USE_PERSIAN_CALENDAR)
+        header_view = HeaderView(self.stdscr, 0, 0, period_title(period_model), self.weather, self.screen)
+        header_view.render()
+
+        # Only days with events are listed, each under its date:
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        day_names = DAYS_PERSIAN if cf.USE_PERSIAN_CALENDAR else DAYS
+        self.view_cache.new_frame()
+        y = 2
+        for date in period_model.dates:
+            day_model = period_model.days[date]
+            number = len(day_model.user_events) + len(day_model.repeated_events) + len(day_model.deadlines)
+            number += len(day_model.holidays) if cf.DISPLAY_HOLIDAYS else 0
+            number += len(day_model.birthdays) if cf.BIRTHDAYS_FROM_ABOOK else 0
+            if number == 0:
+                continue
+            if y >= self.screen.y_max - 1:
+                break
+            weekday = period_model.weekdays[date]
+            text = f"{day_names[weekday]}, {month_names[date[1]-1]} {date[2]}"
+            day_date_view = DayDateView(self.stdscr, y, 0, self.screen, date, weekday, text)
+            day_date_view.render()
+            daily_view = DailyView(self.stdscr, y + 1, 2, day_model, self.screen, 0, self.view_cache, number + 1)
+            daily_view.render()
+            y += number + 1
+
+        if y == 2 and cf.SHOW_NOTHING_PLANNED:
+            self.display_line(y, 0, MSG_TS_NOTHING, Color.UNIMPORTANT)
+
+
+class JournalScreenView(View):
+    def __init__(self, stdscr, y, x, weather, user_tasks, screen):
+        super().__init__(stdscr, y, x)
+        self.weather = weather
+        self.user_tasks = user_tasks
+        self.screen = screen
+        self.next_tick = None
+        self.timer_views = []
+        self.view_cache = ViewCache()
+
+    def calculate_next_tick(self):
+        """Find in how many seconds the time of a shown running timer changes, if there is one"""
+        self.next_tick = None
+        for timer_view in self.timer_views:
+            seconds = timer_view.timer.seconds_to_next_change(cf.SHOW_SECONDS_AFTER_HOUR)
+            seconds = max(cf.REFRESH_INTERVAL, seconds + 0.01)
+            self.next_tick = seconds if self.next_tick is None else min(self.next_tick, seconds)
+            self.screen.refresh_now = False
+
+    def render(self):
+        """Journal view showing all tasks"""
+        self.screen.state = AppState.JOURNAL
+        if self.screen.x_max < 6 or self.screen.y_max < 3:
+            return
+
+        # Display header and footer:
+        header_view = HeaderView(self.stdscr, 0, 0, cf.JOURNAL_HEADER, self.weather, self.screen)
+        header_view.render()
+
+        # Display the tasks:
+        self.view_cache.new_frame()
+        journal_view = JournalView(self.stdscr, 2, self.screen.x_min, self.user_tasks, self.screen, self.view_cache)
+        journal_view.render()
+        self.timer_views = journal_view.timer_views
+
+        # Check if any of the shown timers is counting to update it in time:
+        self.calculate_next_tick()
+
+    def render_timers(self):
+        """Update only the running timers, when nothing else in the journal has changed"""
+        self.screen.state = AppState.JOURNAL
+        self.calculate_next_tick()
+        for timer_view in self.timer_views:
+            timer_view.render()
+
+
+class WelcomeScreenView(View):
+    """Welcome screen displaying greeting info on the first run"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def calibrate_position(self):
+        """Depending on the screen space calculate the best position"""
+        self.y_max, self.x_max = self.screen.y_max, self.screen.frame.x_max
+
+    def render(self):
+        """Draw the welcome screen"""
+        self.calibrate_position()
+        self.fill_background()
+
+        if self.x_max < len(MSG_WELCOME_4)+2 or self.y_max < 12:
+            self.display_line(0, 0, "Welcome!", Color.ACTIVE_PANE)
+            return
+
+        d_x = self.x_max//2
+        d_y = self.y_max//2 - 5
+
+        self.display_line(d_y, d_x - len(MSG_WELCOME_1+__version__+" ")//2, f"{MSG_WELCOME_1} {__version__}", Color.ACTIVE_PANE)
+        self.display_line(d_y + 1, d_x - len(MSG_WELCOME_2)//2, MSG_WELCOME_2, Color.TODO)
+        self.display_line(d_y + 3, d_x - len(MSG_WELCOME_3)//2, MSG_WELCOME_3, Color.TODO)
+        self.display_line(d_y + 4, d_x - len(cf.config_folder)//2, cf.config_folder, Color.TITLE)
+        self.display_line(d_y + 6, d_x - len(MSG_WELCOME_4)//2, MSG_WELCOME_4, Color.TODO)
+        self.display_line(d_y + 7, d_x - len(MSG_SITE)//2, MSG_SITE, Color.TITLE)
+        self.display_line(d_y + 9, d_x - len(MSG_WELCOME_5)//2, MSG_WELCOME_5, Color.TODO)
+
+
+class HelpScreenView(View):
+    """Help screen displaying information about keybindings"""
+
+    def __init__(self, stdscr, y, x, screen):
+        super().__init__(stdscr, y, x)
+        self.screen = screen
+
+    def calibrate_position(self):
+        """Depending on the screen space calculate the best position"""
+        self.y_max, self.x_max = self.screen.y_max, self.screen.frame.x_max
+
+        if self.x_max < 102:
+            self.global_shift_x = 0
+            self.shift_x = 0
+            self.shift_y = 6 + len(KEYS_GENERAL) + len(KEYS_CALENDAR)
+        else:
+            self.global_shift_x = (self.x_max - 102) // 2
+            self.shift_x = 45
+            self.shift_y = 2
+
+        if self.y_max > 20 and self.x_max >= 102:
+            self.global_shift_y = (self.y_max - 20) // 2
+        else:
+            self.global_shift_y = 0
+
+    def render(self):
+        """Draw the help screen"""
+        self.calibrate_position()
+        if self.x_max < 6 or self.y_max < 3:
+            return
+        self.fill_background()
+
+        # Left column:
+        self.display_line(self.global_shift_y, self.global_shift_x + 1, f"{MSG_NAME} {__version__}",
+                            Color.ACTIVE_PANE, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+        self.display_line(self.global_shift_y + 2, self.global_shift_x + 8,
+                          TITLE_KEYS_GENERAL, Color.TITLE, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+        for index, key in enumerate(KEYS_GENERAL):
+            self.display_line(self.global_shift_y + index + 3, self.global_shift_x, key, Color.TODAY)
+            self.display_line(self.global_shift_y + index + 3, self.global_shift_x + 8, KEYS_GENERAL[key], Color.TODO)
+
+        self.display_line(self.global_shift_y + 4 + len(KEYS_GENERAL), self.global_shift_x + 8,
+                          TITLE_KEYS_CALENDAR, Color.TITLE, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+        for index, key in enumerate(KEYS_CALENDAR):
+            self.display_line(self.global_shift_y + index + 5 + len(KEYS_GENERAL), self.global_shift_x, key, Color.TODAY)
+            self.display_line(self.global_shift_y + index + 5 + len(KEYS_GENERAL), self.global_shift_x + 8,
+                                                                            KEYS_CALENDAR[key], Color.TODO)
+
+        # Right column:
+        d_x = self.global_shift_x + self.shift_x
+        d_y = self.global_shift_y + self.shift_y
+        self.display_line(d_y, d_x + 8, TITLE_KEYS_JOURNAL, Color.TITLE, cf.BOLD_TITLE, cf.UNDERLINED_TITLE)
+        for index, key in enumerate(KEYS_TODO):
+            self.display_line(d_y + index + 1, d_x, key, Color.TODAY)
+            self.display_line(d_y + index + 1, d_x + 8, KEYS_TODO[key], Color.TODO)
+
+        # Additional info:
+        d_x = self.global_shift_x + self.shift_x + 8
+        d_y = self.global_shift_y + len(KEYS_TODO) + self.shift_y
+        self.display_line(d_y + 2, d_x, MSG_VIM, Color.ACTIVE_PANE)
+        self.display_line(d_y + 4, d_x, MSG_INFO, Color.TODO)
+        self.display_line(d_y + 5, d_x, MSG_SITE, Color.TITLE)
+
+
+class InstrumentationView(View):
+    """Small box over the panes with the times of the last frame"""
+
+    def __init__(self, screen, width=32):
+        super().__init__(curses.newpad(1, width), 0, 0)
+        self.screen = screen
+        self.width = width
+
+    def render(self):
+        """Draw the box in the top right corner and copy it over the screen buffer"""
+        lines = instruments.overlay_lines(self.width - 1)
+        y_max, x_max = self.screen.y_max, self.screen.frame.x_max
+        height = min(len(lines), y_max - 3)
+        if height <= 0 or x_max < self.width:
+            return
+        self.stdscr.resize(height, self.width)
+        self.stdscr.erase()
+        style = curses.color_pair(Color.HINTS.value) | curses.A_REVERSE
+        for y, line in enumerate(lines[:height]):
+            self.stdscr.addstr(y, 0, line, style)
+        self.stdscr.noutrefresh(0, 0, 2, x_max - self.width, height + 1, x_max - 1)
+
+
+def wait_for_events(stdscr, screen, event_loop):
+    """Wait until something happens and tell if a key was pressed, asking to exit on ctrl+c"""
+    # Measured frame lasts from the key press until the program waits again:
+    instruments.end_frame()
+    try:
+        return event_loop.wait()
+    except KeyboardInterrupt:
+        confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATIONS)
+        screen.state = AppState.EXIT if confirmed else screen.state
+        return False
+    finally:
+        instruments.start_frame()
+
+
+def main(stdscr) -> None:
+    """Main function that runs and switches screens"""
+
+    # Load the data:
+    instruments.start_frame()
+    weather = Weather(cf.WEATHER_CITY, cf.config_folder + "/weather.json", cf.WEATHER_CACHE_MINUTES,
+                      cf.WEATHER_URL, cf.WEATHER_TIMEOUT)
+    if cf.SHOW_WEATHER:
+        with instruments.measure("load:weather"):
+            weather.load_in_background(cf.WEATHER_REFRESH_MINUTES)
+    screen = Screen(stdscr, cf.PRIVACY_MODE, cf.DEFAULT_VIEW, cf.SPLIT_SCREEN, cf.RIGHT_PANE_PERCENTAGE, cf.USE_PERSIAN_CALENDAR)
+    file_repository = FileRepository(cf.TASKS_FILE, cf.EVENTS_FILE, cf.HOLIDAY_COUNTRY, cf.USE_PERSIAN_CALENDAR, cf.CALENDARS)
+    with instruments.measure("load:events"):
+        user_events = file_repository.load_events_from_csv()
+    with instruments.measure("load:tasks"):
+        user_tasks = file_repository.load_tasks_from_csv()
+    with instruments.measure("archive"):
+        file_repository.archive_old_items(cf.ARCHIVE_EVENTS_AFTER_MONTHS, cf.ARCHIVE_TASKS_AFTER_DAYS, cf.COMPRESS_ARCHIVE)
+    with instruments.measure("load:birthdays"):
+        birthdays = file_repository.load_birthdays_from_abook()
+    importer = Importer(user_tasks, user_events, cf.TASKS_FILE, cf.EVENTS_FILE, cf.CALCURSE_TODO_FILE,
+                                cf.CALCURSE_EVENTS_FILE, cf.TASKWARRIOR_FOLDER, cf.USE_PERSIAN_CALENDAR)
+
+    # Initialise terminal screen:
+    with instruments.measure("curses"):
+        stdscr = curses.initscr()
+        curses.noecho()
+        curses.curs_set(False)
+        initialize_colors()
+
+    # Screen is drawn again only on key presses, resize, loaded weather, and scheduled ticks:
+    event_loop = EventLoop(stdscr)
+    weather.on_update = event_loop.wake
+
+    # Holidays are needed only in the calendar, so they appear once loaded:
+    if cf.DISPLAY_HOLIDAYS:
+        holidays = file_repository.load_holidays_in_background(event_loop.wake)
+    else:
+        holidays = file_repository.holidays
+
+    # Initialise windows of the panes, and the frame with footer and separator:
+    stdscr.refresh()
+    screen.update_frame()
+    calendar_pane = PaneWindow(screen)
+    journal_pane = PaneWindow(screen)
+    frame_pane = PaneWindow(screen)
+
+    # Initialise screen views:
+    month_models = MonthModelCache(user_events, user_tasks, holidays, birthdays)
+    monthly_screen_view = MonthlyScreenView(calendar_pane.pad, 0, 0, weather, month_models, screen)
+    daily_screen_view = DailyScreenView(calendar_pane.pad, 0, 0, weather, month_models, screen)
+    year_models = YearModelCache(user_events, user_tasks, holidays, birthdays)
+    yearly_screen_view = YearlyScreenView(calendar_pane.pad, 0, 0, weather, year_models, screen)
+    period_models = PeriodModelCache(user_events, user_tasks, holidays, birthdays)
+    weekly_screen_view = WeeklyScreenView(calendar_pane.pad, 0, 0, weather, period_models, screen)
+    agenda_screen_view = AgendaScreenView(calendar_pane.pad, 0, 0, weather, period_models, screen)
+    journal_screen_view = JournalScreenView(journal_pane.pad, 0, 0, weather, user_tasks, screen)
+    help_screen_view = HelpScreenView(frame_pane.pad, 0, 0, screen)
+    welcome_screen_view = WelcomeScreenView(frame_pane.pad, 0, 0, screen)
+    footer_view = FooterView(frame_pane.pad, 0, 0, screen)
+    separator_view = SeparatorView(frame_pane.pad, 0, 0, screen)
+    instrumentation_view = InstrumentationView(screen) if cf.INSTRUMENT_OVERLAY else None
+
+    # Show welcome screen on the first run:
+    if cf.is_first_run:
+        screen.state = AppState.WELCOME
+    while screen.state == AppState.WELCOME:
+        screen.update_frame()
+        frame_pane.needs_render(None)
+        welcome_screen_view.render()
+        frame_pane.show(0, 0, screen.y_max, screen.frame.x_max)
+        curses.doupdate()
+        if wait_for_events(stdscr, screen, event_loop):
+            control_welcome_screen(stdscr, screen)
+
+    # Running different screens depending on the state:
+    while screen.state != AppState.EXIT:
+        # Archived events are loaded only when user navigates to their year:
+        with instruments.measure("load:archive"):
+            file_repository.load_archived_events(screen.year, screen.month)
+            if screen.calendar_state == CalState.YEARLY:
+                file_repository.load_archived_events(screen.year, 1)
+                file_repository.load_archived_events(screen.year, 12)
+        screen.active_pane = False
+
+        # Edits of config.ini are applied without restart, and everything is drawn again with them:
+        changed_settings = cf.reload_if_changed()
+        if changed_settings:
+            initialize_colors()
+
+            # Split toggled by the user stays until the setting itself is edited:
+            if "SPLIT_SCREEN" in changed_settings:
+                screen.split = cf.SPLIT_SCREEN
+            if "RIGHT_PANE_PERCENTAGE" in changed_settings:
+                screen.right_pane_percentage = cf.RIGHT_PANE_PERCENTAGE
+            stdscr.clearok(True)
+
+        # Screen size and today's date are checked once per frame:
+        screen.update_frame()
+        y_max, x_max = screen.y_max, screen.frame.x_max
+        calendar_views = {CalState.MONTHLY: monthly_screen_view, CalState.DAILY: daily_screen_view,
+                          CalState.YEARLY: yearly_screen_view, CalState.WEEKLY: weekly_screen_view,
+                          CalState.AGENDA: agenda_screen_view}
+        calendar_view = calendar_views[screen.calendar_state]
+        calendar_phase = "render:" + screen.calendar_state.name.lower()
+
+        # Help screen covers the whole screen:
+        if screen.state == AppState.HELP:
+            frame_pane.needs_render(None)
+            with instruments.measure("render:help"):
+                help_screen_view.render()
+            frame_pane.show(0, 0, y_max, x_max)
+            curses.doupdate()
+            if wait_for_events(stdscr, screen, event_loop):
+                control_help_screen(stdscr, screen)
+            continue
+
+        # Inactive calendar and journal are drawn again only if what they show has changed,
+        # otherwise only running timers of the journal are updated:
+        current_time = time.strftime("%H:%M") if cf.SHOW_CURRENT_TIME else None
+        calendar_signature = (screen.state, screen.split, screen.privacy, screen.year, screen.month, screen.day,
+                              screen.calendar_state, screen.today, user_events.version, user_tasks.deadlines_version,
+                              holidays.version, birthdays.version, weather.forcast, current_time, cf.version)
+        journal_signature = (screen.state, screen.split, screen.privacy, screen.selection_mode,
+                             screen.journal_offset, user_tasks.version, weather.forcast, current_time, cf.version)
+
+        # CALENDARS
+
+        # Monthly or daily (active) screen:
+        if screen.state == AppState.CALENDAR:
+            if screen.split and journal_pane.needs_render(journal_signature):
+                with instruments.measure("render:journal"):
+                    journal_screen_view.fill_background()
+                    journal_screen_view.render()
+            elif screen.split:
+                with instruments.measure("render:timers"):
+                    journal_screen_view.render_timers()
+            screen.active_pane = True
+            calendar_pane.needs_render(None)
+            with instruments.measure(calendar_phase):
+                calendar_view.fill_background()
+                calendar_view.render()
+
+        # JOURNAL
+
+        # Journal (active) screen:
+        elif screen.state == AppState.JOURNAL:
+            if screen.split and calendar_pane.needs_render(calendar_signature):
+                with instruments.measure(calendar_phase):
+                    calendar_view.fill_background()
+                    calendar_view.render()
+            screen.active_pane = True
+            if journal_pane.needs_render(journal_signature):
+                with instruments.measure("render:journal"):
+                    journal_screen_view.fill_background()
+                    journal_screen_view.render()
+            else:
+                with instruments.measure("render:timers"):
+                    journal_screen_view.render_timers()
+
+        else:
+            break
+
+        # Footer and separator:
+        if frame_pane.needs_render((screen.state, screen.calendar_state, screen.split, cf.version)):
+            with instruments.measure("render:footer"):
+                footer_view.fill_background()
+                if screen.split: separator_view.render()
+                footer_view.render()
+
+        # Copy the panes into their parts of the screen and send only the changes to the terminal:
+        with instruments.measure("update"):
+            pane_height = y_max - 1 if cf.SHOW_KEYBINDINGS else y_max
+            if screen.split:
+                x_separator = x_max - screen.journal_pane_width
+                calendar_pane.show(0, 0, pane_height, x_separator)
+                frame_pane.show(0, x_separator, pane_height, x_separator + 1)
+                journal_pane.show(0, x_separator + 1, pane_height, x_max)
+            elif screen.state == AppState.CALENDAR:
+                calendar_pane.show(0, 0, pane_height, x_max)
+            else:
+                journal_pane.show(0, 0, pane_height, x_max)
+            frame_pane.show(pane_height, 0, y_max, x_max)
+            if instrumentation_view is not None:
+                instrumentation_view.render()
+            curses.doupdate()
+
+        # Wake up when the clock or a shown timer changes, and when the day changes:
+        event_loop.schedule("clock", seconds_to_next_minute() if cf.SHOW_CURRENT_TIME else None)
+        event_loop.schedule("midnight", seconds_to_midnight())
+        journal_shown = screen.split or screen.state == AppState.JOURNAL
+        event_loop.schedule("timers", journal_screen_view.next_tick if journal_shown else None)
+
+        # Startup profile is complete once the first frame is shown:
+        if cf.PROFILE_STARTUP:
+            instruments.end_frame()
+            break
+
+        # Actions selected on the previous key press ask for their details right away:
+        if not screen.selection_mode and not wait_for_events(stdscr, screen, event_loop):
+            continue
+        with instruments.measure("control"):
+            if screen.state == AppState.JOURNAL:
+                control_journal_screen(stdscr, user_tasks, screen, importer)
+            elif screen.calendar_state == CalState.MONTHLY:
+                control_monthly_screen(stdscr, user_events, screen, importer)
+            elif screen.calendar_state == CalState.YEARLY:
+                control_yearly_screen(stdscr, screen)
+            elif screen.calendar_state == CalState.WEEKLY:
+                control_period_screen(stdscr, screen, 7)
+            elif screen.calendar_state == CalState.AGENDA:
+                control_period_screen(stdscr, screen, cf.AGENDA_DAYS)
+            else:
+                control_daily_screen(stdscr, user_events, screen, importer)
+
+        # If something has been changed, save the data:
+        if user_events.changed:
+            with instruments.measure("save:events"):
+                file_repository.save_events_to_csv()
+            screen.refresh_now = True
+        if user_tasks.changed:
+            with instruments.measure("save:tasks"):
+                file_repository.save_tasks_to_csv()
+            screen.refresh_now = True
+
+    # Cleaning up before quitting:
+    event_loop.close()
+    curses.echo()
+    curses.curs_set(True)
+    curses.endwin()
@@ -0,0 +1,214 @@
+"""Module that measures how long the program takes to react to scripted key presses, without a terminal
+
+Run it as `python -m calcure.latency`, it prints one JSON line per key press of each script,
+with the time from the key press until the program waits for the next one, split into phases."""
+
+import sys
+import json
+import time
+import getopt
+import curses
+import datetime
+import tempfile
+
+from calcure.configuration import cf
+from calcure.headless import FakeWindow, FakeEventLoop, headless_curses
+from calcure.benchmark import DATASETS, generate_events, generate_tasks, percentile
+from calcure.data import AppState
+
+
+# Inputs of each script, where answers to the questions are typed as whole strings:
+SCRIPTS = {
+        "navigate": ["n", "n", "n", "p", "p", "p", "G", "g", "15", "n", "p", "q", "w", "n", "q", "s", "q", "y", "n", "q"],
+        "add":      ["a", "15", "Latency event", "A", "16", "Latency meeting", "10", "w", " ", "a", "Latency task", " "],
+        "toggle":   ["h", "1", "u", "1", ".", "1", " ", "v", "1", "h", "1", "u", "1", " "],
+        "delete":   ["d", "1", "d", "1", " ", "d", "1", "d", "1", " "],
+        "timer":    [" ", "t", "1", "t", "1", "t", "1", "T", "1", " "],
+        }
+
+PHASES = ("control", "persistence", "render", "other")
+
+CONTROLS = ["control_monthly_screen", "control_daily_screen", "control_yearly_screen", "control_period_screen",
+            "control_journal_screen", "control_help_screen", "control_welcome_screen"]
+
+REPOSITORY_METHODS = ["load_events_from_csv", "load_tasks_from_csv", "load_holidays_in_background", "load_birthdays_from_abook",
+                      "load_archived_events", "archive_old_items", "save_events_to_csv", "save_tasks_to_csv"]
+
+SCREEN_VIEWS = ["MonthlyScreenView", "DailyScreenView", "YearlyScreenView", "WeeklyScreenView", "AgendaScreenView",
+                "JournalScreenView", "HelpScreenView", "WelcomeScreenView", "FooterView", "SeparatorView"]
+
+
+class ScriptFinished(Exception):
+    """Raised when the program asks for an input after the last one of the script"""
+
+
+class PhaseClock:
+    """Split the time between inputs into the phases of the main loop"""
+
+    def __init__(self):
+        self.stack = ["other"]
+        self.started = time.perf_counter()
+        self.input = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.records = []
+
+    def switch(self):
+        """Add the time since the last switch to the current phase"""
+        now = time.perf_counter()
+        self.phases[self.stack[-1]] += now - self.started
+        self.started = now
+
+    def timed(self, phase, function):
+        """Wrap the function so that the time spent in it is counted to the phase"""
+        def timed_function(*args, **kwargs):
+            self.switch()
+            self.stack.append(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.switch()
+                self.stack.pop()
+        return timed_function
+
+    def next_input(self, key):
+        """Finish the record of the previous input, when the program asks for the next one"""
+        self.switch()
+        self.records.append((self.input, self.phases))
+        self.input = key
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+
+class ScriptedWindow(FakeWindow):
+    """Fake window that types the inputs of the script and tells the clock about them"""
+
+    def __init__(self, y_max, x_max, keys, clock):
+        super().__init__(y_max, x_max, keys)
+        self.clock = clock
+
+    def getkey(self):
+        key = self.keys.pop(0) if self.keys else None
+        self.clock.next_input(key)
+        if key is None:
+            raise ScriptFinished
+        return key
+
+
+def write_data_files(folder, number_of_events, number_of_tasks):
+    """Save generated events and tasks around today into the data files in the folder"""
+    from calcure.repository import FileRepository
+
+    start_date = datetime.date.today() - datetime.timedelta(days=365)
+    repository = FileRepository(folder + "/tasks.csv", folder + "/events.csv", "", False)
+    repository.user_events = generate_events(number_of_events, start_date=start_date)
+    repository.user_tasks = generate_tasks(number_of_tasks, start_date=start_date)
+    open(repository.tasks_file, "w", encoding="utf-8").close()
+    repository.save_events_to_csv()
+    repository.save_tasks_to_csv()
+    return repository.tasks_file, repository.events_file
+
+
+def run_script(keys, tasks_file, events_file, y_max, x_max):
+    """Run the main loop on the script and return the phases of each input"""
+    import calcure.interface as program
+    from calcure.repository import FileRepository
+
+    clock = PhaseClock()
+    window = ScriptedWindow(y_max, x_max, keys, clock)
+
+    # Data is taken from the temporary files, and nothing stops the script to ask or wait:
+    settings = {"TASKS_FILE": tasks_file, "EVENTS_FILE": events_file, "CALENDARS": [], "is_first_run": False,
+                "DEFAULT_VIEW": AppState.CALENDAR, "SHOW_WEATHER": False, "ASK_CONFIRMATIONS": False,
+                "ARCHIVE_EVENTS_AFTER_MONTHS": 0, "ARCHIVE_TASKS_AFTER_DAYS": 0}
+
+    with headless_curses(y_max, x_max, window):
+        replacements = [(cf, name, value) for name, value in settings.items()]
+        replacements.append((program, "EventLoop", FakeEventLoop))
+        replacements.append((curses, "doupdate", clock.timed("render", curses.doupdate)))
+        replacements.append((program.View, "fill_background", clock.timed("render", program.View.fill_background)))
+        replacements.append((program.PaneWindow, "show", clock.timed("render", program.PaneWindow.show)))
+        for name in CONTROLS:
+            replacements.append((program, name, clock.timed("control", getattr(program, name))))
+        for name in REPOSITORY_METHODS:
+            replacements.append((FileRepository, name, clock.timed("persistence", getattr(FileRepository, name))))
+        for name in SCREEN_VIEWS:
+            view_class = getattr(program, name)
+            for method in ["render", "render_timers"]:
+                if method in vars(view_class):
+                    replacements.append((view_class, method, clock.timed("render", getattr(view_class, method))))
+
+        originals = [(owner, name, vars(owner).get(name)) for owner, name, _ in replacements]
+        try:
+            for owner, name, value in replacements:
+                setattr(owner, name, value)
+            program.main(window)
+        except ScriptFinished:
+            pass
+        finally:
+            for owner, name, value in reversed(originals):
+                setattr(owner, name, value)
+    return clock.records
+
+
+def run(script_names, dataset_names, y_max, x_max, output=sys.stdout):
+    """Run the scripts on fresh data files of each dataset and print the results as JSON lines"""
+    for dataset in dataset_names:
+        number_of_events, number_of_tasks = DATASETS[dataset]
+        for script in script_names:
+            with tempfile.TemporaryDirectory() as folder:
+                tasks_file, events_file = write_data_files(folder, number_of_events, number_of_tasks)
+                records = run_script(list(SCRIPTS[script]), tasks_file, events_file, y_max, x_max)
+
+            # The first record is the start of the program until it waits for the first key:
+            totals = []
+            for step, (key, phases) in enumerate(records):
+                total = sum(phases.values())*1000
+                result = {"script": script, "dataset": dataset, "events": number_of_events, "tasks": number_of_tasks,
+                          "step": step, "input": key, "total_ms": round(total, 3)}
+                result.update({f"{phase}_ms": round(seconds*1000, 3) for phase, seconds in phases.items()})
+                output.write(json.dumps(result) + "\n")
+                if step > 0:
+                    totals.append(total)
+
+            totals.sort()
+            summary = {"script": script, "dataset": dataset, "events": number_of_events, "tasks": number_of_tasks,
+                       "summary": True, "inputs": len(totals), "mean_ms": round(sum(totals)/max(1, len(totals)), 3),
+                       "p99_ms": round(percentile(totals, 0.99), 3) if totals else 0}
+            output.write(json.dumps(summary) + "\n")
+            output.flush()
+
+
+def cli():
+    """Read the options of the harness and run it"""
+    usage = "Usage: python -m calcure.latency [--scripts=navigate,add,toggle,delete,timer] [--datasets=small,medium,large] [--size=40x120]"
+    try:
+        opts, _ = getopt.getopt(sys.argv[1:], "h", ["scripts=", "datasets=", "size=", "help"])
+    except getopt.GetoptError as error:
+        sys.exit(f"{error}\n{usage}")
+
+    script_names = list(SCRIPTS)
+    dataset_names = list(DATASETS)
+    y_max, x_max = 40, 120
+    for opt, arg in opts:
+        if opt in ("-h", "--help"):
+            print(usage)
+            return
+        if opt == "--scripts":
+            script_names = [name.strip() for name in arg.split(",")]
+            unknown = [name for name in script_names if name not in SCRIPTS]
+            if unknown:
+                sys.exit(f"Unknown scripts: {', '.join(unknown)}\n{usage}")
+        elif opt == "--datasets":
+            dataset_names = [name.strip() for name in arg.split(",")]
+            unknown = [name for name in dataset_names if name not in DATASETS]
+            if unknown:
+                sys.exit(f"Unknown datasets: {', '.join(unknown)}\n{usage}")
+        elif opt == "--size":
+            try:
+                y_max, x_max = (int(number) for number in arg.lower().split("x"))
+            except ValueError:
+                sys.exit(f"Invalid value of {opt}: {arg}\n{usage}")
+    run(script_names, dataset_names, y_max, x_max)
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,18 +1,22 @@
 """Module that controls import and export of the user data"""
 
-import configparser
-import pathlib
 import csv
 import os
+import glob
+import io
+import re
+import threading
 
 import datetime
-import jdatetime
 
 from calcure.data import *
+from calcure.calendars import Calendar
+from calcure.instrumentation import instruments
 
 
 def convert_to_persian_date(year, month, day):
     """Convert date from Gregorian to Persian calendar"""
+    import jdatetime
     persian_date =  jdatetime.date.fromgregorian(day=day, month=month, year=year)
     day = persian_date.day
     month = persian_date.month
@@ -22,6 +26,7 @@ def convert_to_persian_date(year, month, day):
 
 def convert_to_gregorian_date(year, month, day):
     """Convert date from Persian to Gregorian calendar"""
+    import jdatetime
     gregorian_date = jdatetime.date(year, month, day).togregorian()
     day = gregorian_date.day
     month = gregorian_date.month
@@ -29,17 +34,84 @@ def convert_to_gregorian_date(year, month, day):
     return year, month, day
 
 
+def open_data_file(file, mode, compressed=False):
+    """Open a data file that may be compressed with gzip"""
+    if compressed:
+        import gzip
+        return gzip.open(file, mode + "t", encoding="utf-8")
+    return open(file, mode, encoding="utf-8")
+
+
+def text_digest(text):
+    """Return a short fingerprint of the text, to tell if a file needs to be written"""
+    import hashlib
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def fold_ics_line(line):
+    """End the content line, split into lines of at most 75 octets as iCalendar requires"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+
+    # Continuation lines start with a space, and characters are not split between lines:
+    parts = []
+    start = 0
+    octets = 0
+    for index, char in enumerate(line):
+        size = len(char.encode("utf-8"))
+        if octets + size > 75:
+            parts.append(line[start:index])
+            start = index
+            octets = 1
+        octets += size
+    parts.append(line[start:])
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def dates_pattern(start, end):
+    """Form the part of a regular expression that matches dates of a Gregorian period in the csv files"""
+    # Short periods are matched by their days, and long ones by their months:
+    first_date, last_date = datetime.date(*start), datetime.date(*end)
+    number_of_days = (last_date - first_date).days + 1
+    if number_of_days <= 62:
+        dates = (first_date + datetime.timedelta(days=number) for number in range(number_of_days))
+        return "(?:" + "|".join(f"{date.year},{date.month},{date.day}" for date in dates) + "),"
+    return "(?:" + "|".join(f"{year},{month}" for year, month in months_in_period(start, end)) + r"),\d+,"
+
+
+def months_in_period(start, end):
+    """Return years and months between two dates"""
+    months = []
+    year, month = start[0], start[1]
+    while (year, month) <= (end[0], end[1]):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+# Lines of events that are repeated, with quoted names as they are saved, or without quotes if edited by hand:
+REPETITION_PATTERN = re.compile(r'",(?:[2-9]|[1-9]\d+),[a-z]+(?:,[a-z]+)?\n')
+UNQUOTED_REPETITION_PATTERN = re.compile(r'\n\d+,\d+,\d+,\d+,[^"\n][^\n]*,(?:[2-9]|[1-9]\d+),[a-z]+(?:,[a-z]+)?(?=\n)')
+
+# Archives of events are named by the year, or by the first and last years of repeated events:
+ARCHIVE_NAME_PATTERN = re.compile(r"events_(\d+)(?:-(\d+))?\.csv(?:\.gz)?$")
+
+
 class FileRepository:
     """Load and save events and tasks to files"""
 
-    def __init__(self, tasks_file, events_file, country, use_persian_calendar):
+    def __init__(self, tasks_file, events_file, country, use_persian_calendar, calendars=()):
         self.user_tasks = Tasks()
         self.user_events = Events()
         self.holidays = Events()
         self.birthdays = Birthdays()
-        self.abook_file = str(pathlib.Path.home())+"/.abook/addressbook"
+        self.abook_file = os.path.expanduser("~") + "/.abook/addressbook"
         self.tasks_file = tasks_file
         self.events_file = events_file
+        self.calendars = list(calendars)
+        self.loaded_archives = set()
+        self.file_digests = {}
+        self.texts_of_period = {}
         self.country = country
         self.use_persian_calendar = use_persian_calendar
 
@@ -47,19 +119,23 @@ class FileRepository:
     def is_task_format_old(self):
         """Check if the database format is old"""
         with open(self.tasks_file, "r", encoding="utf-8") as f:
-            text = f.read()
-        return text[0] == '"'
+            first_line = f.readline()
+        return first_line[0] == '"'
 
-    def read_or_create_file(self, file):
+    def read_or_create_file(self, file, create=True):
         """Read user's csv file or create new one if it does not exist"""
-        # Try to read the file line by line:
+        # Try to read the file, remembering its content to know later if it has to be saved:
         try:
-            with open(file, "r", encoding="utf-8") as f:
-                read_lines = csv.reader(f, delimiter = ',')
-                return list(read_lines)
+            with open_data_file(file, "r", file.endswith(".gz")) as f:
+                text = f.read()
+            self.file_digests[file] = text_digest(text)
+            read_lines = csv.reader(io.StringIO(text), delimiter = ',')
+            return list(read_lines)
 
         # Create file if it does not exist:
         except IOError:
+            if os.path.exists(file) or not create:
+                return []
             try:
                 with open(file, "w+", encoding="utf-8") as f:
                     pass
@@ -68,128 +144,413 @@ class FileRepository:
             except (FileNotFoundError, NameError):
                 return []
 
+    def parse_task(self, task_id, row, is_format_old):
+        """Create a task from a row of the csv file"""
+        # Read task dates:
+        if is_format_old:
+            shift = 0
+            year = 0
+            month = 0
+            day = 0
+        else:
+            shift = 3
+            year = int(row[0])
+            month = int(row[1])
+            day = int(row[2])
+
+        # Convert to persian date if needed and if it is not zero date:
+        if self.use_persian_calendar and year != 0:
+            year, month, day = convert_to_persian_date(year, month, day)
+
+        # Read task name and statuses:
+        if row[0 + shift][0] == '.':
+            name = row[0 + shift][1:]
+            privacy = True
+        else:
+            name = row[0 + shift]
+            privacy = False
+        status = Status[row[1 + shift].upper()]
+        stamps = row[(2 + shift):] if len(row) > 2 else []
+        return Task(task_id, name, status, Timer(stamps), privacy, year, month, day)
+
     def load_tasks_from_csv(self):
         """Reads from user's file or create new one if it does not exist"""
         lines = self.read_or_create_file(self.tasks_file)
-
+        is_format_old = self.is_task_format_old if lines else False
         for index, row in enumerate(lines):
-            task_id = index
-
-            # Read task dates:
-            if self.is_task_format_old:
-                shift = 0
-                year = 0
-                month = 0
-                day = 0
-            else:
-                shift = 3
-                year = int(row[0])
-                month = int(row[1])
-                day = int(row[2])
-
-            # Convert to persian date if needed and if it is not zero date:
-            if self.use_persian_calendar and year != 0:
-                year, month, day = convert_to_persian_date(year, month, day)
-
-            # Read task name and statuses:
-            if row[0 + shift][0] == '.':
-                name = row[0 + shift][1:]
-                privacy = True
-            else:
-                name = row[0 + shift]
-                privacy = False
-            status = Status[row[1 + shift].upper()]
-            stamps = row[(2 + shift):] if len(row) > 2 else []
-            self.user_tasks.add_item(Task(task_id, name, status, Timer(stamps), privacy, year, month, day))
+            self.user_tasks.add_item(self.parse_task(index, row, is_format_old))
         return self.user_tasks
 
-    def load_events_from_csv(self):
-        """Reads from user's file or create it if it does not exist"""
-        lines = self.read_or_create_file(self.events_file)
-        for index, row in enumerate(lines):
-            event_id = index
-            year = int(row[1])
-            month = int(row[2])
-            day = int(row[3])
-            if row[4][0] == '.':
-                name = row[4][1:]
-                privacy = True
-            else:
-                name = row[4]
-                privacy = False
-
-            # Account for old versions of the datafile:
-            if len(row) > 5:
-                repetition = int(row[5])
-                if row[6] == 'd':
-                    frequency = Frequency.DAILY
-                elif row[6] == 'w':
-                    frequency = Frequency.WEEKLY
-                elif row[6] == 'm':
-                    frequency = Frequency.MONTHLY
-                elif row[6] == 'y':
-                    frequency = Frequency.YEARLY
-                else:
-                    try:
-                        frequency = Frequency[row[6].upper()]
-                    except (ValueError, KeyError):
-                        frequency = Frequency.ONCE
-            else:
-                repetition = '1'
-                frequency = Frequency.ONCE
-            if len(row) > 7:
-                status = Status[row[7].upper()]
+    def iterate_tasks_from_csv(self):
+        """Yield tasks from user's file one by one without reading the whole file"""
+        try:
+            is_format_old = self.is_task_format_old
+            with open(self.tasks_file, "r", encoding="utf-8") as f:
+                for index, row in enumerate(csv.reader(f, delimiter = ',')):
+                    yield self.parse_task(index, row, is_format_old)
+        except (IOError, IndexError):
+            return
+
+    def parse_event(self, event_id, row, calendar=None):
+        """Create an event from a row of the csv file"""
+        year = int(row[1])
+        month = int(row[2])
+        day = int(row[3])
+        if row[4][0] == '.':
+            name = row[4][1:]
+            privacy = True
+
+        # Calendars that are private by default mark their public events:
+        elif row[4][0] == '+' and calendar is not None and calendar.privacy:
+            name = row[4][1:]
+            privacy = False
+        else:
+            name = row[4]
+            privacy = calendar is not None and calendar.privacy
+
+        # Account for old versions of the datafile:
+        if len(row) > 5:
+            repetition = int(row[5])
+            if row[6] == 'd':
+                frequency = Frequency.DAILY
+            elif row[6] == 'w':
+                frequency = Frequency.WEEKLY
+            elif row[6] == 'm':
+                frequency = Frequency.MONTHLY
+            elif row[6] == 'y':
+                frequency = Frequency.YEARLY
             else:
-                status = Status.NORMAL
-
-            # Convert to persian date if needed:
-            if self.use_persian_calendar:
-                year, month, day = convert_to_persian_date(year, month, day)
+                try:
+                    frequency = Frequency[row[6].upper()]
+                except (ValueError, KeyError):
+                    frequency = Frequency.ONCE
+        else:
+            repetition = 1
+            frequency = Frequency.ONCE
+        if len(row) > 7:
+            status = Status[row[7].upper()]
+        else:
+            status = Status.NORMAL
+
+        # Convert to persian date if needed:
+        if self.use_persian_calendar:
+            year, month, day = convert_to_persian_date(year, month, day)
+
+        return UserEvent(event_id, year, month, day, name, repetition, frequency, status, privacy, calendar)
+
+    def calendar_file(self, calendar):
+        """Return the path to the file of the calendar, where None is the main events file"""
+        return self.events_file if calendar is None else calendar.file
+
+    def read_calendar(self, calendar):
+        """Read all events of one calendar file"""
+        create = calendar is None or not calendar.read_only
+        lines = self.read_or_create_file(self.calendar_file(calendar), create)
+        return [self.parse_event(index, row, calendar) for index, row in enumerate(lines)]
 
-            self.user_events.add_item(UserEvent(event_id, year, month, day,
-                                name, repetition, frequency, status, privacy))
+    def load_events_from_csv(self):
+        """Reads from user's files or create them if they do not exist"""
+        calendars = [None] + self.calendars
+
+        # Parse additional calendar files simultaneously:
+        if len(calendars) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(len(calendars), 8)) as executor:
+                events_of_calendars = list(executor.map(self.read_calendar, calendars))
+        else:
+            events_of_calendars = [self.read_calendar(None)]
+
+        # Merge events of all calendars giving them unique ids:
+        event_id = 0
+        for events in events_of_calendars:
+            for event in events:
+                event.item_id = event_id
+                self.user_events.add_item(event)
+                event_id += 1
+        self.user_events.changed = False
         return self.user_events
 
+    def iterate_events_from_csv(self, include_archive=False):
+        """Yield events from user's files one by one without reading the whole files"""
+        calendars = [None] + self.calendars
+        if include_archive:
+            calendars += [self.archive_calendar(file) for file in self.archived_events_files()]
+        event_id = 0
+        for calendar in calendars:
+            file = self.calendar_file(calendar)
+            try:
+                with open_data_file(file, "r", file.endswith(".gz")) as f:
+                    for row in csv.reader(f, delimiter = ','):
+                        yield self.parse_event(event_id, row, calendar)
+                        event_id += 1
+            except IOError:
+                continue
+
+    def read_text_of_period(self, file):
+        """Read the whole file as text that starts and ends with a new line, so that lines can be searched,
+        and find the lines of repeated events, keeping both for searches in other periods until the file changes"""
+        try:
+            stat = os.stat(file)
+            key = (stat.st_mtime_ns, stat.st_size)
+            if self.texts_of_period.get(file, (None,))[0] == key:
+                return self.texts_of_period[file][1:]
+            with open_data_file(file, "r", file.endswith(".gz")) as f:
+                text = f.read()
+        except IOError:
+            return "\n", 0, set()
+        if text and not text.endswith("\n"):
+            text += "\n"
+        text = "\n" + text
+        number_of_lines = text.count("\n") - 1
+
+        # Names are quoted in saved files, but edited files may have lines without quotes, found slower:
+        patterns = [REPETITION_PATTERN]
+        if text.count('"') < 2*number_of_lines:
+            patterns.append(UNQUOTED_REPETITION_PATTERN)
+        repetition_lines = self.find_line_starts(text, patterns)
+        self.texts_of_period[file] = (key, text, number_of_lines, repetition_lines)
+        return text, number_of_lines, repetition_lines
+
+    def find_line_starts(self, text, patterns):
+        """Return positions where the lines that contain any of the patterns start"""
+        line_starts = set()
+        for pattern in patterns:
+            for match in pattern.finditer(text):
+                line_starts.add(text.rfind("\n", 0, match.start() + 1) + 1)
+        return line_starts
+
+    def iterate_lines_of_period(self, text, line_starts):
+        """Yield numbers and rows of the lines that start at the positions"""
+        # Count lines only between found positions to get line numbers:
+        position = 0
+        line_number = -1
+        for line_start in sorted(line_starts):
+            line_number += text.count("\n", position, line_start)
+            position = line_start
+            line = text[line_start:text.index("\n", line_start)]
+            yield line_number, next(csv.reader([line], delimiter = ','))
+
+    def iterate_events_in_period(self, start, end):
+        """Yield only events that may happen in the period, without parsing other lines of the files"""
+        # Persian dates are not stored in files, so all events have to be converted:
+        if self.use_persian_calendar:
+            yield from self.iterate_events_from_csv(include_archive=True)
+            return
+
+        calendars = [None] + self.calendars
+        loaded_files = {calendar.file for calendar in self.calendars}
+        calendars += [self.archive_calendar(file) for file in self.archived_events_files(start[0], end[0])
+                      if file not in loaded_files]
+
+        # Lines with dates in the period, or with repetitions:
+        date_pattern = re.compile(r"," + dates_pattern(start, end))
+        event_id = 0
+        for calendar in calendars:
+            text, number_of_lines, repetition_lines = self.read_text_of_period(self.calendar_file(calendar))
+            line_starts = repetition_lines | self.find_line_starts(text, [date_pattern])
+            for line_number, row in self.iterate_lines_of_period(text, line_starts):
+                yield self.parse_event(event_id + line_number, row, calendar)
+            event_id += number_of_lines
+
+    def iterate_tasks_in_period(self, start, end):
+        """Yield only tasks that may have deadlines in the period, without parsing other lines of the file"""
+        if self.use_persian_calendar:
+            yield from self.iterate_tasks_from_csv()
+            return
+        date_pattern = re.compile(r"\n" + dates_pattern(start, end))
+        text, _, _ = self.read_text_of_period(self.tasks_file)
+        for line_number, row in self.iterate_lines_of_period(text, self.find_line_starts(text, [date_pattern])):
+            yield self.parse_task(line_number, row, False)
+
+    def task_to_csv_line(self, task):
+        """Form a line of the csv file for the task"""
+        dot = "."
+
+        # If persian calendar was used, we convert event back to Gregorian for storage:
+        if self.use_persian_calendar and task.year != 0:
+            year, month, day = convert_to_gregorian_date(task.year, task.month, task.day)
+        else:
+            year, month, day = task.year, task.month, task.day
+
+        stamps = "".join(f',{str(stamp)}' for stamp in task.timer.stamps)
+        return f'{year},{month},{day},"{dot*task.privacy}{task.name}",{task.status.name.lower()}{stamps}\n'
+
     def save_tasks_to_csv(self):
         """Rewrite the data file with changed tasks"""
         original_file = self.tasks_file
         dummy_file = self.tasks_file + '.bak'
         with open(dummy_file, "w", encoding="utf-8") as f:
             for task in self.user_tasks.items:
-                dot = "."
-
-                # If persian calendar was used, we convert event back to Gregorian for storage:
-                if self.use_persian_calendar and task.year != 0:
-                    year, month, day = convert_to_gregorian_date(task.year, task.month, task.day)
-                else:
-                    year, month, day = task.year, task.month, task.day
-
-                f.write(f'{year},{month},{day},"{dot*task.privacy}{task.name}",{task.status.name.lower()}')
-                for stamp in task.timer.stamps:
-                    f.write(f',{str(stamp)}')
-                f.write("\n")
+                f.write(self.task_to_csv_line(task))
         os.remove(original_file)
         os.rename(dummy_file, original_file)
         self.user_tasks.changed = False
 
+    def event_to_csv_line(self, ev):
+        """Form a line of the csv file for the event"""
+        # If persian calendar was used, we convert event back to Gregorian for storage:
+        if self.use_persian_calendar:
+            year, month, day = convert_to_gregorian_date(ev.year, ev.month, ev.day)
+        else:
+            year, month, day = ev.year, ev. month, ev.day
+
+        if ev.calendar is not None and ev.calendar.privacy:
+            name = f'{"." if ev.privacy else "+"}{ev.name}'
+        else:
+            name = f'{"."*ev.privacy}{ev.name}'
+        return f'{ev.item_id},{year},{month},{day},"{name}",{ev.repetition},{ev.frequency.name.lower()},{ev.status.name.lower()}\n'
+
+    def write_file_if_changed(self, file, text):
+        """Rewrite the file only if its content differs from what was loaded or saved last time"""
+        digest = text_digest(text)
+        if self.file_digests.get(file) == digest:
+            return
+        compressed = file.endswith(".gz")
+        dummy_file = file + '.bak'
+        with open_data_file(dummy_file, "w", compressed) as f:
+            f.write(text)
+        os.replace(dummy_file, file)
+        self.file_digests[file] = digest
+
     def save_events_to_csv(self):
-        """Rewrite the data file with changed events"""
-        original_file = self.events_file
-        dummy_file = self.events_file + '.bak'
-        with open(dummy_file, "w", encoding="utf-8") as f:
-            for ev in self.user_events.items:
+        """Rewrite the data files that have changed events"""
+        for calendar in [None] + self.calendars:
+            if calendar is not None and calendar.read_only:
+                continue
+            lines = [self.event_to_csv_line(ev) for ev in self.user_events.items if ev.calendar is calendar]
+            self.write_file_if_changed(self.calendar_file(calendar), "".join(lines))
+        self.user_events.changed = False
 
-                # If persian calendar was used, we convert event back to Gregorian for storage:
-                if self.use_persian_calendar:
-                    year, month, day = convert_to_gregorian_date(ev.year, ev.month, ev.day)
+    @property
+    def archive_folder(self):
+        """Folder where old events and tasks are archived"""
+        return os.path.join(os.path.dirname(self.events_file), "archive")
+
+    def archived_events_files(self, year="*", last_year=None):
+        """Return existing archive files with events happening in the years or in all years"""
+        last_year = year if last_year is None else last_year
+        files = []
+        for file in glob.glob(os.path.join(self.archive_folder, "events_*.csv*")):
+            match = ARCHIVE_NAME_PATTERN.match(os.path.basename(file))
+            if match is None:
+                continue
+            first_archived_year = int(match.group(1))
+            last_archived_year = int(match.group(2) or first_archived_year)
+            if year == "*" or (first_archived_year <= last_year and year <= last_archived_year):
+                files.append(file)
+        return sorted(files)
+
+    def archived_events_file(self, first_year, last_year, extension):
+        """Return archive file for events happening from the first to the last year"""
+        years = str(first_year) if first_year == last_year else f"{first_year}-{last_year}"
+        return os.path.join(self.archive_folder, f"events_{years}{extension}")
+
+    def archive_calendar(self, file):
+        """Create a calendar for the archive file"""
+        return CalendarFile(os.path.basename(file), file, None, None, False, False)
+
+    def gregorian_date(self, year, month, day):
+        """Return the date in Gregorian calendar independently of the used calendar"""
+        if self.use_persian_calendar:
+            return convert_to_gregorian_date(year, month, day)
+        return year, month, day
+
+    def load_archived_events(self, year, month):
+        """Load events archived in the year of this month if they were not loaded yet"""
+        # Archives are stored by Gregorian years:
+        last_day = Calendar(0, self.use_persian_calendar).last_day(year, month)
+        years = {self.gregorian_date(year, month, 1)[0], self.gregorian_date(year, month, last_day)[0]}
+        for archive_year in years - self.loaded_archives:
+            self.loaded_archives.add(archive_year)
+            for file in self.archived_events_files(archive_year):
+
+                # Archives of repeated events span several years and may be loaded already:
+                if any(calendar.file == file for calendar in self.calendars):
+                    continue
+                calendar = self.archive_calendar(file)
+                self.calendars.append(calendar)
+
+                # Give loaded events ids after existing ones:
+                event_id = max((event.item_id for event in self.user_events.items), default=-1) + 1
+                changed = self.user_events.changed
+                for event in self.read_calendar(calendar):
+                    event.item_id = event_id
+                    self.user_events.add_item(event)
+                    event_id += 1
+                self.user_events.changed = changed
+
+    def archive_old_items(self, events_after_months, tasks_after_days, compress):
+        """Move old events and done tasks from the working files to yearly archive files"""
+        if events_after_months <= 0 and tasks_after_days <= 0:
+            return
+        today = datetime.date.today()
+        extension = ".csv.gz" if compress else ".csv"
+        archived_lines = {}
+
+        # Archive events that happened for the last time before the given number of months:
+        if events_after_months > 0:
+            months = today.year*12 + today.month - 1 - events_after_months
+            last_date = (months//12, months%12 + 1, today.day)
+            repetitions = RepeatedEvents(Events(), self.use_persian_calendar)
+            kept_events = []
+            for event in self.user_events.items:
+                last_occurrence = self.gregorian_date(*repetitions.last_occurrence_date(event))
+                if (event.calendar is not None
+                    or self.gregorian_date(event.year, event.month, event.day) >= last_date
+                    or last_occurrence >= last_date):
+                    kept_events.append(event)
+                    continue
+
+                # Repeated events are archived for all years of their repetitions, so that they are loaded with any of them:
+                year = self.gregorian_date(event.year, event.month, event.day)[0]
+                file = self.archived_events_file(year, last_occurrence[0], extension)
+
+                # Events of already loaded archives are moved to them in memory:
+                if self.loaded_archives & set(range(year, last_occurrence[0] + 1)):
+                    calendar = next((c for c in self.calendars if c.file == file), None)
+                    if calendar is None:
+                        calendar = self.archive_calendar(file)
+                        self.calendars.append(calendar)
+                    event.calendar = calendar
+                    kept_events.append(event)
                 else:
-                    year, month, day = ev.year, ev. month, ev.day
+                    archived_lines.setdefault(file, []).append(self.event_to_csv_line(event))
+            if len(kept_events) < len(self.user_events.items):
+                self.user_events.items = kept_events
+                self.user_events.changed = True
+
+        # Archive tasks that were done before the given number of days:
+        if tasks_after_days > 0:
+            last_date = today - datetime.timedelta(days=tasks_after_days)
+            kept_tasks = []
+            for task in self.user_tasks.items:
 
-                name = f'{"."*ev.privacy}{ev.name}'
-                f.write(f'{ev.item_id},{year},{month},{day},"{name}",{ev.repetition},{ev.frequency.name.lower()},{ev.status.name.lower()}\n')
-        os.remove(original_file)
-        os.rename(dummy_file, original_file)
-        self.user_events.changed = False
+                # Tasks do not store when they were done, so we use deadline or last timer stamp:
+                if task.year > 0:
+                    date = datetime.date(*self.gregorian_date(task.year, task.month, task.day))
+                elif task.timer.stamps:
+                    date = datetime.date.fromtimestamp(float(task.timer.stamps[-1]))
+                else:
+                    date = None
+                if task.status != Status.DONE or date is None or date >= last_date:
+                    kept_tasks.append(task)
+                    continue
+                file = os.path.join(self.archive_folder, f"tasks_{date.year}{extension}")
+                archived_lines.setdefault(file, []).append(self.task_to_csv_line(task))
+            if len(kept_tasks) < len(self.user_tasks.items):
+                self.user_tasks.items = kept_tasks
+                self.user_tasks.changed = True
+
+        # Write archives first, so that nothing is lost if saving is interrupted:
+        if archived_lines:
+            os.makedirs(self.archive_folder, exist_ok=True)
+        for file, lines in archived_lines.items():
+            with open_data_file(file, "a", compress) as f:
+                f.writelines(lines)
+        if self.user_events.changed:
+            self.save_events_to_csv()
+        if self.user_tasks.changed:
+            self.save_tasks_to_csv()
 
     def load_deadlines(self):
         """Create collection of events that are deadlines for tasks"""
@@ -197,8 +558,9 @@ class FileRepository:
             self.deadlines.add_item(DeadlineEvent(task.item_id, task.year, task.month, task.day, task.name, task.status, task.privacy))
         return self.deadlines
 
-    def load_holidays(self):
-        """Load list of holidays in this country around this year"""
+    def read_holidays(self):
+        """Read list of holidays in this country around this year"""
+        holidays = []
         try:
             import holidays as hl
             year = datetime.date.today().year
@@ -211,13 +573,36 @@ class FileRepository:
                 else:
                     year, month, day = date.year, date.month, date.day
 
-                self.holidays.add_item(Event(year, month, day, name))
+                holidays.append(Event(year, month, day, name))
         except (ModuleNotFoundError, SyntaxError, AttributeError):
             pass
+        return holidays
+
+    def load_holidays(self):
+        """Load list of holidays in this country around this year"""
+        for holiday in self.read_holidays():
+            self.holidays.add_item(holiday)
+        return self.holidays
+
+    def load_holidays_in_background(self, on_update=None):
+        """Load holidays in a separate thread, because their library takes long to import"""
+        def load():
+            with instruments.measure("load:holidays"):
+                holidays = self.read_holidays()
+
+            # Holidays appear all at once, and cached views of them become outdated:
+            if holidays:
+                self.holidays.items = self.holidays.items + holidays
+                self.holidays.changed = True
+                if on_update is not None:
+                    on_update()
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
         return self.holidays
 
     def load_birthdays_from_abook(self):
         """Loading birthdays from abook contacts"""
+        import configparser
         abook = configparser.ConfigParser()
         abook.read(self.abook_file)
         for each_contact in abook.sections():
@@ -257,6 +642,7 @@ class Importer:
         except (IOError, FileNotFoundError, NameError):
             return []
 
+    @instruments.timed("import")
     def import_tasks_from_calcurse(self):
         """Import tasks from calcurse database"""
         lines = self.read_file(self.calcurse_todo_file)
@@ -274,6 +660,7 @@ class Importer:
                 privacy = False
                 self.user_tasks.add_item(Task(task_id, name, status, Timer([]), privacy))
 
+    @instruments.timed("import")
     def import_tasks_from_taskwarrior(self):
         """Import tasks from taskwarrior database"""
         lines = self.read_file(self.taskwarrior_folder+"/pending.data")
@@ -286,6 +673,7 @@ class Importer:
                     privacy = False
                     self.user_tasks.add_item(Task(task_id, name, Status.NORMAL, Timer([]), privacy))
 
+    @instruments.timed("import")
     def import_events_from_calcurse(self):
         """Importing events from calcurse apt file into our events file"""
         lines = self.read_file(self.calcurse_events_file)
@@ -314,3 +702,112 @@ class Importer:
                                        Frequency.ONCE, Status.NORMAL, privacy)
             if not self.user_events.event_exists(imported_event):
                 self.user_events.add_item(imported_event)
+
+
+class Exporter:
+    """Export events and tasks into formats of other programs, streaming them item by item"""
+
+    def __init__(self, events, tasks, use_persian_calendar, start=None, end=None, holidays=None, birthdays=None):
+        self.events = events
+        self.tasks = tasks
+        self.start = start
+        self.end = end
+        self.holidays = holidays
+        self.birthdays = birthdays
+
+        # Empty collection used only to calculate the repetitions of each event:
+        self.repetitions = RepeatedEvents(Events(), use_persian_calendar)
+
+    def is_in_range(self, year, month, day):
+        """Check if the date is within the requested export period"""
+        date = (year, month, day)
+        if self.start is not None and date < self.start:
+            return False
+        if self.end is not None and date > self.end:
+            return False
+        return True
+
+    def birthday_years(self):
+        """Years in which birthdays should be repeated"""
+        this_year = datetime.date.today().year
+        first_year = self.start[0] if self.start is not None else this_year
+        last_year = self.end[0] if self.end is not None else max(first_year, this_year)
+        return range(first_year, last_year + 1)
+
+    def iterate_items(self):
+        """Yield type and item for every event, repetition, deadline, holiday, and birthday in the period"""
+        for event in self.events:
+            if self.is_in_range(event.year, event.month, event.day):
+                yield "event", event
+            if self.end is not None and (event.year, event.month, event.day) > self.end:
+                continue
+
+            # Skip repetitions that happen before the period and stop after it:
+            first_rep = self.repetitions.repetitions_before(event, *self.start) if self.start else 1
+            for repeated_event in self.repetitions.iterate_repetitions(event, first_rep):
+                date = (repeated_event.year, repeated_event.month, repeated_event.day)
+                if self.end is not None and date > self.end:
+                    break
+                if self.is_in_range(*date):
+                    yield "repetition", repeated_event
+
+        for task in self.tasks:
+            if task.year > 0 and self.is_in_range(task.year, task.month, task.day):
+                yield "deadline", task
+
+        if self.holidays is not None:
+            for holiday in self.holidays.items:
+                if self.is_in_range(holiday.year, holiday.month, holiday.day):
+                    yield "holiday", holiday
+
+        if self.birthdays is not None:
+            for year in self.birthday_years():
+                for birthday in self.birthdays.items:
+                    if self.is_in_range(year, birthday.month, birthday.day):
+                        yield "birthday", Event(year, birthday.month, birthday.day, birthday.name)
+
+    def item_to_record(self, item_type, item):
+        """Describe the item as a dictionary that can be converted to JSON"""
+        return {
+                "type":    item_type,
+                "id":      getattr(item, "item_id", None),
+                "date":    f"{item.year:04d}-{item.month:02d}-{item.day:02d}",
+                "name":    item.name,
+                "status":  item.status.name.lower() if hasattr(item, "status") else None,
+                "private": getattr(item, "privacy", False),
+                }
+
+    def iterate_records(self):
+        """Yield items as dictionaries"""
+        for item_type, item in self.iterate_items():
+            yield self.item_to_record(item_type, item)
+
+    def iterate_jsonl_lines(self):
+        """Yield items as lines of JSON Lines format"""
+        import json
+        for record in self.iterate_records():
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+
+    def iterate_ics_lines(self):
+        """Yield items as lines of iCalendar format"""
+        timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        yield "BEGIN:VCALENDAR\r\n"
+        yield "VERSION:2.0\r\n"
+        yield "PRODID:-//calcure//calcure//EN\r\n"
+        for number, (item_type, item) in enumerate(self.iterate_items()):
+            name = (item.name.replace("\\", "\\\\").replace(";", "\\;")
+                             .replace(",", "\\,").replace("\n", "\\n"))
+            yield "BEGIN:VEVENT\r\n"
+            yield fold_ics_line(f"UID:{item_type}-{getattr(item, 'item_id', number)}-{item.year:04d}{item.month:02d}{item.day:02d}@calcure")
+            yield f"DTSTAMP:{timestamp}\r\n"
+            yield f"DTSTART;VALUE=DATE:{item.year:04d}{item.month:02d}{item.day:02d}\r\n"
+            yield fold_ics_line(f"SUMMARY:{name}")
+            yield f"CATEGORIES:{item_type.upper()}\r\n"
+            if getattr(item, "privacy", False):
+                yield "CLASS:PRIVATE\r\n"
+            if getattr(item, "status", None) == Status.IMPORTANT:
+                yield "PRIORITY:1\r\n"
+            if getattr(item, "status", None) == Status.UNIMPORTANT:
+                yield "PRIORITY:9\r\n"
+            yield "END:VEVENT\r\n"
+        yield "END:VCALENDAR\r\n"
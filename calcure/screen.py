@@ -1,12 +1,20 @@
 """Module that controls the overall state of the program screen"""
 
 import datetime
-import jdatetime
 
 from calcure.data import Events, AppState, CalState
 from calcure.calendars import Calendar
 
 
+class Frame:
+    """Size of the screen, todays's date, and styles that stay the same while a frame is drawn"""
+    def __init__(self, y_max, x_max, today, styles):
+        self.y_max = y_max
+        self.x_max = x_max
+        self.today = today
+        self.styles = styles
+
+
 class Screen:
     """Main state of the program that describes what is displayed and how"""
     def __init__(self, stdscr, privacy, state, split, right_pane_percentage, use_persian_calendar):
@@ -20,21 +28,38 @@ class Screen:
         self.active_pane = False
         self.selection_mode = False
         self.refresh_now = False
+        self.journal_offset = 0
         self.key = None
+        self.frame = None
+        self.update_frame()
         self.day = self.today.day
         self.month = self.today.month
         self.year = self.today.year
 
+    def update_frame(self):
+        """Check the screen size and todays's date once before drawing a frame"""
+        y_max, x_max = self.stdscr.getmaxyx()
+        if self.use_persian_calendar:
+            import jdatetime
+            today = jdatetime.date.today()
+        else:
+            today = datetime.date.today()
+
+        # Keep the same frame until the screen is resized or the day changes:
+        if self.frame is None:
+            self.frame = Frame(y_max, x_max, today, {})
+        elif (y_max, x_max, today) != (self.frame.y_max, self.frame.x_max, self.frame.today):
+            self.frame = Frame(y_max, x_max, today, self.frame.styles)
+
     @property
     def y_max(self):
         """Get maximum size of the screen"""
-        y_max, _ = self.stdscr.getmaxyx()
-        return y_max
+        return self.frame.y_max
 
     @property
     def journal_pane_width(self):
         """Calculate the width of the right pane if the value is adequate"""
-        _, x_max = self.stdscr.getmaxyx()
+        x_max = self.frame.x_max
         if 5 < self.right_pane_percentage < 95:
             return int(x_max//(100/self.right_pane_percentage))
         return x_max//4
@@ -42,7 +67,7 @@ class Screen:
     @property
     def x_max(self):
         """Calculate the right boundary of the screen"""
-        _, x_max = self.stdscr.getmaxyx()
+        x_max = self.frame.x_max
         if x_max < 40:
             self.split = False
         if self.split and self.state != AppState.JOURNAL:
@@ -52,7 +77,7 @@ class Screen:
     @property
     def x_min(self):
         """Calculate the left boundary of the screen"""
-        _, x_max = self.stdscr.getmaxyx()
+        x_max = self.frame.x_max
         if x_max < self.journal_pane_width:
             self.split = False
         if self.split and self.state == AppState.JOURNAL:
@@ -63,6 +88,7 @@ class Screen:
     def date(self) -> datetime:
         """Return displayed date in datetime format"""
         if self.use_persian_calendar:
+            import jdatetime
             return jdatetime.date(self.year, self.month, self.day)
         else:
             return datetime.date(self.year, self.month, self.day)
@@ -70,10 +96,13 @@ class Screen:
     @property
     def today(self) -> datetime:
         """Return todays's date in datetime format"""
-        if self.use_persian_calendar:
-            return jdatetime.date.today()
-        else:
-            return datetime.date.today()
+        return self.frame.today
+
+    @property
+    def is_today(self) -> bool:
+        """Check if the displayed date is today"""
+        today = self.frame.today
+        return self.day == today.day and self.month == today.month and self.year == today.year
 
     def next_month(self):
         """Switches to the next month"""
@@ -91,6 +120,19 @@ class Screen:
             self.month = 12
             self.year -= 1
 
+    def next_year(self):
+        """Switches to the next year"""
+        self.year += 1
+
+    def previous_year(self):
+        """Switches to the previous year"""
+        self.year -= 1
+
+    def move_days(self, number):
+        """Move the displayed date by a number of days"""
+        date = self.date + datetime.timedelta(days=number)
+        self.year, self.month, self.day = date.year, date.month, date.day
+
     def next_day(self):
         """Switch to the next day"""
         days_in_this_month = Calendar(0, self.use_persian_calendar).last_day(self.year, self.month)
@@ -122,6 +164,13 @@ class Screen:
         self.year = self.today.year
         self.day = self.today.day
 
+    def select_day_in_month(self):
+        """Select today if it is in the displayed month, otherwise the first day of the month"""
+        if self.month == self.today.month and self.year == self.today.year:
+            self.day = self.today.day
+        else:
+            self.day = 1
+
     def is_valid_day(self, number) -> bool:
         """Check if input corresponds to a date in this month"""
         if number is None:
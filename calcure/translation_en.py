@@ -31,6 +31,9 @@ KEYS_CALENDAR = {
         "   .   ": "Toggle event privacy",
         "   C   ": "Import events from calcurse",
         "   G   ": "Return to current month (day)",
+        "   y   ": "Toggle year overview",
+        "   w   ": "Toggle week view",
+        "   s   ": "Toggle agenda of next days",
         }
 
 KEYS_TODO = {
@@ -47,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Change (remove) task deadline",
         "   m   ": "Move a task",
         "  C(W) ": "Import tasks from calcurse (taskwarrior)",
+        "PgUp/Dn": "Scroll tasks by page (j, k by line)",
         }
 
 MSG_NAME          = "CALCURE"
@@ -94,6 +98,8 @@ MSG_WEATHER       = "Weather is loading..."
 
 CALENDAR_HINT     = "Space · Switch to journal   a · Add event  n/p · Change month   ? · All keybindings"
 CALENDAR_HINT_D   = "Space · Switch to journal   a · Add event  n/p · Change day   ? · All keybindings"
+CALENDAR_HINT_Y   = "Space · Switch to journal   y · Back to month  n/p · Change year   ? · All keybindings"
+CALENDAR_HINT_W   = "Space · Switch to journal   w/s · Week/agenda  n/p · Change period   ? · All keybindings"
 JOURNAL_HINT      = "Space · Switch to calendar   a · Add task   v · Done   i · Important   ? · All keybindings"
 
 DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY"]
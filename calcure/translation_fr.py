@@ -31,6 +31,9 @@ KEYS_CALENDAR = {
         "   .   ": "Activer la confidentialité des événements",
         "   C   ": "Importer des événements depuis calcurse",
         "   G   ": "Revenir au mois (jour) en cours",
+        "   y   ": "Basculer la vue de l'année",
+        "   w   ": "Basculer la vue de la semaine",
+        "   s   ": "Basculer l'agenda des prochains jours",
         }
 
 KEYS_TODO = {
@@ -47,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Modifier (supprimer) l'échéance de la tâche",
         "   m   ": "Déplacer une tâche",
         "  C(W) ": "Importer des tâches de calcurse (taskwarrior)",
+        "PgUp/Dn": "Faire défiler les tâches par page (j, k par ligne)",
         }
 
 MSG_NAME          = "CALCURE"
@@ -94,6 +98,8 @@ MSG_WEATHER       = "La météo se charge..."
 
 CALENDAR_HINT     = "Espace · Passer au journal  a · Ajouter un événement  n/p · Changer de mois  ? · Aider"
 CALENDAR_HINT_D   = "Espace · Passer au journal  a · Ajouter un événement  n/p · Changer de jour  ? · All keybindings"
+CALENDAR_HINT_Y   = "Espace · Passer au journal  y · Revenir au mois  n/p · Changer d'année  ? · All keybindings"
+CALENDAR_HINT_W   = "Espace · Passer au journal  w/s · Semaine/agenda  n/p · Changer de période  ? · All keybindings"
 JOURNAL_HINT      = "Espace · Passer au calendrier  a · Ajouter une tâche  v · Terminé  i · Important  ? · All keybindings"
 
 DAYS = ["LUNDI", "MARDI", "MERCREDI", "JEUDI", "VENDREDI", "SAMEDI", "DIMANCHE"]
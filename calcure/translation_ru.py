@@ -31,6 +31,9 @@ KEYS_CALENDAR = {
         "   .   ": "Переключать приватность события",
         "   C   ": "Импортировать события из calcurse",
         "   G   ": "Вернуться к текущему месяцу (дню)",
+        "   y   ": "Переключать обзор года",
+        "   w   ": "Переключать обзор недели",
+        "   s   ": "Переключать план на ближайшие дни",
         }
 
 KEYS_TODO = {
@@ -47,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Изменить (удалить) дедлайн задачи",
         "   m   ": "Переместить задачу",
         "  C(W) ": "Импортировать задачи из calcurse (taskwarrior)",
+        "PgUp/Dn": "Прокрутить задачи по страницам (j, k по строкам)",
         }
 
 MSG_NAME          = "CALCURE"
@@ -94,6 +98,8 @@ MSG_WEATHER       = "Загружается информации о погоде
 
 CALENDAR_HINT     = "Пробел · Переключить на журнал   a · Новое событие  n/p · Сменить месяц   ? · Клавиши"
 CALENDAR_HINT_D   = "Пробел · Переключить на журнал   a · Новое событие  n/p · Сменить день   ? · Клавиши"
+CALENDAR_HINT_Y   = "Пробел · Переключить на журнал   y · Назад к месяцу  n/p · Сменить год   ? · Клавиши"
+CALENDAR_HINT_W   = "Пробел · Переключить на журнал   w/s · Неделя/план  n/p · Сменить период   ? · Клавиши"
 JOURNAL_HINT      = "Пробел · Переключить на календарь   a · Новая задача   v · Выполнено   h · Важно   ? · Клавиши"
 
 DAYS         = ["ПОНЕДЕЛЬНИК", "ВТОРНИК", "СРЕДА", "ЧЕТВЕРГ", "ПЯТНИЦА", "СУББОТА", "ВОСКРЕСЕНЬЕ"]
@@ -1,23 +1,163 @@
 """Module that controls the weather storing and loading"""
 
-import subprocess
+import os
+import json
+import time
+import threading
+from urllib.parse import urlsplit, quote
+
+from calcure.instrumentation import instruments
 
 
 class Weather:
     """Information about the weather today"""
 
-    def __init__(self, city):
+    def __init__(self, city, cache_file=None, cache_minutes=30, url="https://wttr.in", max_load_time=2):
         self.city = city
+        self.cities = [name.strip() for name in city.split(",")]
         self.forcast = ""
-        self.max_load_time = 2  # seconds
+        self.url = urlsplit(url)
+        self.connection = None
+        self.max_load_time = max_load_time  # seconds
+        self.is_loading = False
+        self.cache_file = cache_file
+        self.cache = {}
+        self.next_update_time = 0
+        self.on_update = None  # called by the loading thread after each attempt
+        self.cache_time = cache_minutes * 60  # seconds
+        self.min_retry_time = 60  # seconds
+        self.max_retry_time = 3600  # seconds
+
+    def read_cache(self):
+        """Read forecasts of all cities saved in the cache file"""
+        if self.cache_file is None:
+            return dict(self.cache)
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def write_cache(self, cache):
+        """Save forecasts of all cities into the cache file"""
+        self.cache = cache
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(self.cache_file + ".tmp", self.cache_file)
+        except OSError:
+            pass
+
+    def latest_entry(self, cache):
+        """Return the most recent attempt to load the forecast, saved in the file or in memory"""
+        entries = [cache.get(self.city, {}), self.cache.get(self.city, {})]
+        return max(entries, key=lambda entry: max(entry.get("loaded", 0), entry.get("failed", 0)))
+
+    def update_time(self, max_age):
+        """Show the saved forecast and return the time when a new one should be loaded"""
+        entry = self.latest_entry(self.read_cache())
+        self.forcast = entry.get("forcast", "")
+
+        # After failures, wait exponentially longer before trying again:
+        failures = entry.get("failures", 0)
+        if failures:
+            retry_time = min(self.min_retry_time * 2**(failures - 1), self.max_retry_time)
+            return entry.get("failed", 0) + retry_time
+        return entry.get("loaded", 0) + max_age
 
+    def save_to_cache(self, success):
+        """Remember the loaded forecast or count the failed attempt"""
+        cache = self.read_cache()
+        entry = dict(self.latest_entry(cache))
+        if success:
+            cache[self.city] = {"forcast": self.forcast, "loaded": time.time(), "failures": 0}
+        else:
+            entry["failures"] = entry.get("failures", 0) + 1
+            entry["failed"] = time.time()
+            cache[self.city] = entry
+        self.write_cache(cache)
+
+    def connect(self):
+        """Open a connection to the weather server or reuse the one that is kept alive"""
+        import http.client
+        if self.connection is None:
+            if self.url.scheme == "http":
+                self.connection = http.client.HTTPConnection(self.url.netloc, timeout=self.max_load_time)
+            else:
+                self.connection = http.client.HTTPSConnection(self.url.netloc, timeout=self.max_load_time)
+        return self.connection
+
+    def disconnect(self):
+        """Close the connection to the weather server"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def request_forcast(self, city):
+        """Request the one-line forecast of the city from the server"""
+        import http.client
+        path = f"{self.url.path.rstrip('/')}/{quote(city)}?format=3"
+
+        # Connection kept alive since the previous request could be closed by the server, so we try once more:
+        for attempt in range(2):
+            is_reused = self.connection is not None
+            connection = self.connect()
+            try:
+                connection.request("GET", path, headers={"User-Agent": "calcure"})
+                response = connection.getresponse()
+                text = response.read().decode("utf-8").strip()
+                if response.status != 200:
+                    raise ValueError(f"Server responded with status {response.status}")
+                return text
+            except (http.client.HTTPException, OSError):
+                self.disconnect()
+                if attempt or not is_reused:
+                    raise
+
+    @instruments.timed("weather")
     def load_from_wttr(self):
-        """Load the weather info from wttr.in"""
+        """Load the weather info from wttr.in or another server with the same interface"""
+        import http.client
         try:
-            request_url = f"wttr.in/{self.city}?format=3"
-            self.forcast = str(subprocess.check_output(["curl", "-s", request_url],
-                                                        timeout=self.max_load_time,
-                                                        encoding='utf-8'))[:-1]
-            self.forcast = self.forcast.split(':')[1]
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, IndexError):
-            self.forcast = ""
+            forcasts = [self.request_forcast(city) for city in self.cities]
+            if len(forcasts) == 1:
+                self.forcast = forcasts[0].split(':', 1)[1]
+            else:
+                self.forcast = "  ".join(forcasts)
+            self.save_to_cache(True)
+        except (http.client.HTTPException, OSError, ValueError, IndexError):
+            self.disconnect()
+            self.save_to_cache(False)
+        finally:
+            self.is_loading = False
+            if self.on_update is not None:
+                self.on_update()
+
+    def keep_updated(self, refresh_time):
+        """Load a new forecast whenever the saved one expires, or only once if refresh time is zero"""
+        max_age = self.cache_time
+        while True:
+            self.next_update_time = self.update_time(max_age)
+            delay = self.next_update_time - time.time()
+            if delay <= 0:
+                self.is_loading = True
+                self.load_from_wttr()
+            elif refresh_time:
+                time.sleep(delay)
+            else:
+                self.next_update_time = float("inf")
+                return
+            max_age = refresh_time or self.cache_time
+
+    def load_in_background(self, refresh_minutes=0):
+        """Show the saved forecast and keep it updated in a separate thread"""
+        self.next_update_time = self.update_time(self.cache_time)
+        if time.time() < self.next_update_time and not refresh_minutes:
+            self.next_update_time = float("inf")
+            return
+        self.is_loading = time.time() >= self.next_update_time
+        thread = threading.Thread(target=self.keep_updated, args=(refresh_minutes * 60,), daemon=True)
+        thread.start()
@@ -4,7 +4,7 @@ import setuptools
 
 setup_dir = Path(__file__).resolve().parent
 
-version = re.search( r'__version__ = "(.*)"', Path(setup_dir, 'calcure/__main__.py').open().read())
+version = re.search( r'__version__ = "(.*)"', Path(setup_dir, 'calcure/configuration.py').open().read())
 if version is None:
     raise SystemExit("Could not determine version to use")
 version = version.group(1)
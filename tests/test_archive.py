@@ -0,0 +1,100 @@
+"""Tests of archiving old events and done tasks, and of loading them back"""
+
+import os
+import shutil
+import datetime
+import tempfile
+import unittest
+
+from calcure.data import *
+from calcure.repository import FileRepository
+
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.today = datetime.date.today()
+        self.old_year = self.today.year - 6
+        repository = self.repository()
+        repository.user_events.items = [
+            UserEvent(1, self.old_year, 3, 10, "Old event", 1, Frequency.ONCE, Status.NORMAL, False),
+            UserEvent(2, self.old_year, 5, 1, "Old yearly", 3, Frequency.YEARLY, Status.NORMAL, False),
+            UserEvent(3, self.old_year, 1, 1, "Still yearly", 20, Frequency.YEARLY, Status.NORMAL, False),
+            UserEvent(4, self.today.year, self.today.month, self.today.day, "Today", 1, Frequency.ONCE, Status.NORMAL, False),
+            ]
+        repository.user_tasks.items = [
+            Task(1, "Old done", Status.DONE, Timer([]), False, self.old_year, 2, 2),
+            Task(2, "Old undone", Status.NORMAL, Timer([]), False, self.old_year, 2, 2),
+            Task(3, "Done without deadline", Status.DONE, Timer([]), False),
+            ]
+        open(repository.tasks_file, "a", encoding="utf-8").close()
+        repository.save_events_to_csv()
+        repository.save_tasks_to_csv()
+
+    def repository(self):
+        """Create a repository of the files and load them"""
+        repository = FileRepository(self.folder + "/tasks.csv", self.folder + "/events.csv", "", False)
+        if os.path.exists(repository.events_file):
+            repository.load_events_from_csv()
+            repository.load_tasks_from_csv()
+        return repository
+
+    def archive(self, compress=False):
+        repository = self.repository()
+        repository.archive_old_items(12, 30, compress)
+        return self.repository()
+
+    def names(self, items):
+        return sorted(item.name for item in items)
+
+    def test_old_items_are_moved_to_archives(self):
+        repository = self.archive()
+        self.assertEqual(self.names(repository.user_events.items), ["Still yearly", "Today"])
+        self.assertEqual(self.names(repository.user_tasks.items), ["Done without deadline", "Old undone"])
+        self.assertEqual(sorted(os.listdir(repository.archive_folder)),
+                         [f"events_{self.old_year}-{self.old_year + 2}.csv", f"events_{self.old_year}.csv",
+                          f"tasks_{self.old_year}.csv"])
+
+    def test_compressed_archives(self):
+        repository = self.archive(compress=True)
+        self.assertEqual(len(repository.archived_events_files()), 2)
+        repository.load_archived_events(self.old_year, 3)
+        self.assertIn("Old event", self.names(repository.user_events.items))
+
+    def test_repeated_event_is_loaded_with_years_of_its_repetitions(self):
+        for year, names in [(self.old_year, ["Old event", "Old yearly"]), (self.old_year + 2, ["Old yearly"]),
+                            (self.old_year + 3, [])]:
+            repository = self.archive()
+            repository.load_archived_events(year, 6)
+            self.assertEqual(self.names(repository.user_events.items), sorted(names + ["Still yearly", "Today"]))
+            repetitions = RepeatedEvents(repository.user_events, False)
+            dates = [(item.year, item.month, item.day) for item in repository.user_events.items + repetitions.items]
+            self.assertEqual(bool(names), (year, 5, 1) in dates)
+
+    def test_archive_of_several_years_is_loaded_once(self):
+        repository = self.archive()
+        for year in range(self.old_year, self.old_year + 3):
+            repository.load_archived_events(year, 6)
+        self.assertEqual(self.names(repository.user_events.items), ["Old event", "Old yearly", "Still yearly", "Today"])
+        self.assertEqual(len({event.item_id for event in repository.user_events.items}), 4)
+
+    def test_repetitions_of_archived_event_are_found_in_period(self):
+        repository = self.archive()
+        start, end = (self.old_year + 1, 1, 1), (self.old_year + 2, 12, 31)
+        self.assertEqual(self.names(repository.iterate_events_in_period(start, end)), ["Old yearly", "Still yearly"])
+
+    def test_event_archived_in_loaded_year_stays_in_memory(self):
+        repository = self.repository()
+        repository.load_archived_events(self.old_year + 1, 1)
+        repository.archive_old_items(12, 0, False)
+        self.assertEqual(self.names(repository.user_events.items), ["Old yearly", "Still yearly", "Today"])
+        repository.user_events.changed = True
+        repository.save_events_to_csv()
+        self.assertEqual(self.names(self.archive().user_events.items), ["Still yearly", "Today"])
+        self.assertEqual(len(repository.archived_events_files()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Tests of events read from additional calendar files and saved back to them"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from calcure.data import *
+from calcure.repository import FileRepository
+
+
+class CalendarFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        self.work = CalendarFile("Work", self.folder + "/work.csv", 3, CALENDAR_COLORS_START, False, True)
+        self.shared = CalendarFile("Shared", self.folder + "/shared.csv", 4, CALENDAR_COLORS_START + 1, True, False)
+        self.write(self.folder + "/events.csv", ['0,2026,3,1,"Home",1,once,normal',
+                                                 '1,2026,3,2,".Secret home",2,w,important'])
+        self.write(self.work.file, ['0,2026,3,3,"Meeting",1,once,normal', '1,2026,3,4,"+Party",1,once,done'])
+        self.write(self.shared.file, ['0,2026,3,5,"Concert",1,once,normal', '1,2026,3,6,".Private concert"'])
+
+    def write(self, file, lines):
+        with open(file, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    def read_lines(self, file):
+        with open(file, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+    def repository(self, calendars=None):
+        calendars = [self.work, self.shared] if calendars is None else calendars
+        repository = FileRepository(self.folder + "/tasks.csv", self.folder + "/events.csv", "", False, calendars)
+        repository.load_events_from_csv()
+        return repository
+
+    def test_events_of_all_calendars_are_loaded(self):
+        events = self.repository().user_events.items
+        self.assertEqual([(event.name, event.privacy, event.calendar) for event in events], [
+            ("Home", False, None), ("Secret home", True, None),
+            ("Meeting", True, self.work), ("Party", False, self.work),
+            ("Concert", False, self.shared), ("Private concert", True, self.shared),
+            ])
+        self.assertEqual([event.item_id for event in events], list(range(6)))
+        self.assertEqual((events[1].repetition, events[1].frequency, events[1].status),
+                         (2, Frequency.WEEKLY, Status.IMPORTANT))
+        self.assertEqual((events[5].repetition, events[5].frequency), (1, Frequency.ONCE))
+
+    def test_events_are_saved_to_their_calendars(self):
+        repository = self.repository()
+        repository.user_events.items[2].name = "Long meeting"
+        repository.user_events.items[4].name = "Read-only concert"
+        repository.save_events_to_csv()
+        self.assertEqual(self.read_lines(self.work.file), ['2,2026,3,3,".Long meeting",1,once,normal',
+                                                           '3,2026,3,4,"+Party",1,once,done'])
+        self.assertEqual(self.read_lines(self.shared.file)[0], '0,2026,3,5,"Concert",1,once,normal')
+        self.assertEqual(self.read_lines(self.folder + "/events.csv"),
+                         ['0,2026,3,1,"Home",1,once,normal', '1,2026,3,2,".Secret home",2,weekly,important'])
+
+    def test_event_privacy_changes_marker_in_private_calendar(self):
+        repository = self.repository()
+        meeting, party = repository.user_events.items[2:4]
+        meeting.privacy, party.privacy = False, True
+        repository.save_events_to_csv()
+        self.assertEqual(self.read_lines(self.work.file), ['2,2026,3,3,"+Meeting",1,once,normal',
+                                                           '3,2026,3,4,".Party",1,once,done'])
+
+    def test_missing_calendar_files(self):
+        os.remove(self.work.file)
+        os.remove(self.shared.file)
+        repository = self.repository()
+        self.assertEqual(len(repository.user_events.items), 2)
+        self.assertTrue(os.path.exists(self.work.file))
+        self.assertFalse(os.path.exists(self.shared.file))
+
+    def test_calendar_events_in_period(self):
+        repository = FileRepository(self.folder + "/tasks.csv", self.folder + "/events.csv", "", False,
+                                    [self.work, self.shared])
+        events = list(repository.iterate_events_in_period((2026, 3, 3), (2026, 3, 5)))
+        self.assertEqual([(event.name, event.calendar) for event in events],
+                         [("Secret home", None), ("Meeting", self.work), ("Party", self.work),
+                          ("Concert", self.shared)])
+
+
+if __name__ == "__main__":
+    unittest.main()
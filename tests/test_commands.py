@@ -0,0 +1,276 @@
+"""Tests of the commands that run without the interface, each in a separate process"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import datetime
+import tempfile
+import unittest
+import subprocess
+
+from calcure.data import *
+from calcure.repository import FileRepository
+from calcure.daemon import send_to_daemon
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CommandTest(unittest.TestCase):
+    """Run the program with its config and data in a temporary home folder"""
+
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home, True)
+        self.data_folder = self.home + "/data"
+        os.makedirs(self.data_folder)
+        self.repository = FileRepository(self.data_folder + "/tasks.csv", self.data_folder + "/events.csv", "", False)
+
+    def save(self, events=(), tasks=()):
+        """Save the events and tasks into the data files"""
+        self.repository.user_events.items = list(events)
+        self.repository.user_tasks.items = list(tasks)
+        open(self.repository.tasks_file, "a", encoding="utf-8").close()
+        self.repository.save_events_to_csv()
+        self.repository.save_tasks_to_csv()
+
+    def command(self, *arguments):
+        """Command and environment that run the program with the arguments"""
+        environment = dict(os.environ, HOME=self.home, PYTHONPATH=ROOT)
+        environment.pop("XDG_CACHE_HOME", None)
+        return [sys.executable, "-m", "calcure", "--folder=" + self.data_folder, *arguments], environment
+
+    def run_calcure(self, *arguments):
+        """Run the program with the arguments and return its result"""
+        command, environment = self.command(*arguments)
+        result = subprocess.run(command, env=environment, capture_output=True, text=True, timeout=60)
+        self.assertNotIn("Traceback", result.stderr)
+        return result
+
+    def read_lines(self, file):
+        with open(file, encoding="utf-8") as f:
+            return f.read().splitlines()
+
+
+class ExportCommandTest(CommandTest):
+
+    def setUp(self):
+        super().setUp()
+        self.save([UserEvent(1, 2026, 2, 20, "Weekly", 10, Frequency.WEEKLY, Status.NORMAL, False),
+                   UserEvent(2, 2026, 3, 31, "Last day", 1, Frequency.ONCE, Status.IMPORTANT, False)],
+                  [Task(1, "Deadline", Status.NORMAL, Timer([]), False, 2026, 3, 1)])
+
+    def test_jsonl_export_of_period(self):
+        result = self.run_calcure("--export=jsonl", "--from=2026-03-01", "--to=2026-03-31")
+        self.assertEqual(result.returncode, 0)
+        dates = [(record["type"], record["date"]) for record in map(json.loads, result.stdout.splitlines())]
+        self.assertEqual(dates, [("repetition", "2026-03-06"), ("repetition", "2026-03-13"),
+                                 ("repetition", "2026-03-20"), ("repetition", "2026-03-27"),
+                                 ("event", "2026-03-31"), ("deadline", "2026-03-01")])
+
+    def test_ics_export_to_file(self):
+        output_file = self.home + "/calendar.ics"
+        self.run_calcure("--export=ics", "--from=2026-03-31", "--to=2026-03-31", "--output=" + output_file)
+        with open(output_file, encoding="utf-8", newline="") as f:
+            text = f.read()
+        self.assertEqual(text.count("BEGIN:VEVENT\r\n"), 1)
+        self.assertIn("SUMMARY:Last day\r\n", text)
+
+    def test_invalid_dates_are_reported(self):
+        for date in ["2026-02-30", "2026-1-1-1", "2026-13-40", "tomorrow"]:
+            result = self.run_calcure("--export=jsonl", "--from=" + date)
+            self.assertEqual(result.stdout, "")
+            self.assertEqual(result.returncode, 1)
+            self.assertIn("YYYY-MM-DD", result.stderr)
+
+    def test_reversed_period_is_reported(self):
+        result = self.run_calcure("--export=jsonl", "--from=2026-03-31", "--to=2026-03-01")
+        self.assertEqual(result.stdout, "")
+        self.assertIn("after its end", result.stderr)
+
+
+class QueryCommandTest(CommandTest):
+
+    def setUp(self):
+        super().setUp()
+        self.today = datetime.date.today()
+        self.save([self.event(1, 0, "Today event", status=Status.IMPORTANT),
+                   self.event(2, 1, "Tomorrow event"),
+                   self.event(3, -14, "Weekly event", 10, Frequency.WEEKLY),
+                   self.event(4, 20, "Later event")],
+                  [Task(1, "Deadline today", Status.NORMAL, Timer([]), False, *self.date(0)),
+                   Task(2, "Done task", Status.DONE, Timer([]), False)])
+
+    def date(self, days):
+        date = self.today + datetime.timedelta(days=days)
+        return date.year, date.month, date.day
+
+    def event(self, item_id, days, name, repetition=1, frequency=Frequency.ONCE, status=Status.NORMAL):
+        return UserEvent(item_id, *self.date(days), name, repetition, frequency, status, False)
+
+    def query(self, *arguments):
+        """Run the query and return names and dates of the found items"""
+        result = self.run_calcure(*arguments, "--json")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return [(record["name"], record["date"]) for record in json.loads(result.stdout)]
+
+    def iso(self, days):
+        return (self.today + datetime.timedelta(days=days)).isoformat()
+
+    def test_agenda_of_today(self):
+        self.assertCountEqual(self.query("--agenda=today"), [("Today event", self.iso(0)),
+                              ("Weekly event", self.iso(0)), ("Deadline today", self.iso(0))])
+
+    def test_agenda_of_tomorrow_and_date(self):
+        self.assertEqual(self.query("--agenda=tomorrow"), [("Tomorrow event", self.iso(1))])
+        self.assertEqual(self.query("--agenda=" + self.iso(20)), [("Later event", self.iso(20))])
+
+    def test_agenda_of_week_and_days(self):
+        week = self.query("--agenda=week")
+        self.assertEqual([date for _, date in week], sorted(date for _, date in week))
+        self.assertEqual(len(week), 4)
+        self.assertEqual(self.query("--agenda=2"), self.query("--agenda=today") + self.query("--agenda=tomorrow"))
+        self.assertEqual(len(self.query("--agenda=month")), 9)
+
+    def test_next_items_are_found_in_longer_periods(self):
+        self.assertEqual(self.query("--next=1")[0][1], self.iso(0))
+        items = self.query("--next=7")
+        self.assertEqual(items[-1], ("Later event", self.iso(20)))
+        self.assertEqual(len(items), 7)
+
+    def test_status_filter(self):
+        self.assertEqual(self.query("--agenda=today", "--status=important"), [("Today event", self.iso(0))])
+        self.assertEqual(self.query("--tasks", "--status=done"), [("Done task", "0000-00-00")])
+
+    def test_tasks_as_text(self):
+        result = self.run_calcure("--tasks")
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual([line.split(" ", 1)[1] for line in result.stdout.splitlines()],
+                         ["Deadline today", "Done task"])
+
+    def test_events_as_text(self):
+        result = self.run_calcure("--agenda=tomorrow")
+        self.assertEqual(result.stdout, f"{self.today + datetime.timedelta(days=1):%Y/%m/%d} • Tomorrow event\n")
+
+    def test_file_with_windows_line_ends_and_unquoted_names(self):
+        with open(self.repository.events_file, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        lines = [line.replace('"', '') if "Weekly" in line else line for line in lines]
+        with open(self.repository.events_file, "w", encoding="utf-8", newline="") as f:
+            f.write("\r\n".join(lines) + "\r\n")
+        self.assertIn(("Weekly event", self.iso(0)), self.query("--agenda=today"))
+        self.assertIn(("Weekly event", self.iso(7)), self.query("--agenda=" + self.iso(7)))
+
+    def test_invalid_arguments_fail(self):
+        errors = {("--next=x",): "positive integer", ("--next=0",): "positive integer",
+                  ("--agenda=yesterday",): "Agenda should be", ("--agenda=0",): "Agenda should be",
+                  ("--tasks", "--status=urgent"): "Status should be", ("--event=tomorrow",): "YYYY-MM-DD-Name"}
+        for arguments, message in errors.items():
+            result = self.run_calcure(*arguments)
+            self.assertEqual(result.returncode, 1, arguments)
+            self.assertIn(message, result.stderr)
+            self.assertEqual(result.stdout, "")
+
+
+class AddCommandTest(CommandTest):
+    """New items are added to the files directly when no daemon is running"""
+
+    def setUp(self):
+        super().setUp()
+        self.save([UserEvent(1, 2026, 2, 20, "Existing event", 1, Frequency.ONCE, Status.NORMAL, False)],
+                  [Task(1, "Existing task", Status.NORMAL, Timer([]), False)])
+
+    def test_items_are_added_to_files(self):
+        result = self.run_calcure("--task=Buy milk", "--event=2026-03-04-Trip to Paris", "--task=Call Ann")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(self.read_lines(self.repository.tasks_file)[1:],
+                         ['0,0,0,"Buy milk",normal', '0,0,0,"Call Ann",normal'])
+        self.assertEqual(self.read_lines(self.repository.events_file)[1:],
+                         ['1,2026,3,4,"Trip to Paris",1,once,normal'])
+        self.assertFalse(os.path.exists(self.data_folder + "/calcure.sock"))
+
+    def test_date_that_does_not_exist_fails(self):
+        result = self.run_calcure("--event=2026-02-30-Trip", "--task=Buy milk")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Date does not exist", result.stderr)
+        self.assertEqual(len(self.read_lines(self.repository.events_file)), 1)
+        self.assertEqual(len(self.read_lines(self.repository.tasks_file)), 2)
+
+
+@unittest.skipIf(not hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+class DaemonCommandTest(CommandTest):
+    """Daemon serves requests of other processes and saves their changes"""
+
+    def setUp(self):
+        super().setUp()
+        self.save([UserEvent(1, 2026, 3, 1, "Weekly", 3, Frequency.WEEKLY, Status.NORMAL, False)],
+                  [Task(1, "Existing task", Status.NORMAL, Timer([]), False)])
+        self.socket_file = self.data_folder + "/calcure.sock"
+        command, environment = self.command("--daemon")
+        self.daemon = subprocess.Popen(command, env=environment, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.addCleanup(self.stop_daemon)
+        for _ in range(100):
+            if self.send({"command": "ping"}) is not None:
+                break
+            time.sleep(0.1)
+        else:
+            self.fail("daemon did not start")
+
+    def stop_daemon(self):
+        """Stop the daemon like the system does, and check that it cleaned up"""
+        self.daemon.terminate()
+        _, errors = self.daemon.communicate(timeout=10)
+        self.assertNotIn(b"Traceback", errors)
+        self.assertFalse(os.path.exists(self.socket_file))
+
+    def send(self, request):
+        return send_to_daemon(self.socket_file, request)
+
+    def test_items_are_added_and_saved(self):
+        self.assertEqual(self.send({"command": "add_task", "name": "Buy milk"}), {"ok": True, "id": 1})
+        self.assertEqual(self.send({"command": "add_event", "date": "2026-03-04", "name": "Trip"}),
+                         {"ok": True, "id": 1})
+        self.assertEqual(self.read_lines(self.repository.tasks_file)[-1], '0,0,0,"Buy milk",normal')
+        self.assertEqual(self.read_lines(self.repository.events_file)[-1], '1,2026,3,4,"Trip",1,once,normal')
+        self.assertFalse(self.send({"command": "add_event", "date": "2026-02-30", "name": "Trip"})["ok"])
+
+    def test_items_of_period_are_listed(self):
+        response = self.send({"command": "list", "from": "2026-03-05", "to": "2026-03-31"})
+        self.assertEqual([(item["type"], item["date"]) for item in response["items"]],
+                         [("repetition", "2026-03-08"), ("repetition", "2026-03-15")])
+
+    def test_status_is_toggled_and_saved(self):
+        self.assertEqual(self.send({"command": "toggle", "type": "task", "id": 0, "status": "done"}), {"ok": True})
+        self.assertEqual(self.read_lines(self.repository.tasks_file), ['0,0,0,"Existing task",done'])
+        response = self.send({"command": "toggle", "type": "event", "id": 7, "status": "done"})
+        self.assertEqual(response, {"ok": False, "error": "No event with id 7"})
+
+    def test_files_edited_by_others_are_read_again(self):
+        time.sleep(0.05)
+        self.save([], [Task(1, "Edited elsewhere", Status.NORMAL, Timer([]), False)])
+        names = [item["name"] for item in self.send({"command": "search", "query": "elsewhere"})["items"]]
+        self.assertEqual(names, ["Edited elsewhere"])
+
+    def test_wrong_requests_are_answered(self):
+        self.assertIn("Unknown command", self.send({"command": "delete"})["error"])
+        self.assertIn("Wrong request", self.send({"command": "add_task"})["error"])
+        self.assertIn("JSON object", self.send([1, 2])["error"])
+
+    def test_new_items_are_sent_to_running_daemon(self):
+        result = self.run_calcure("--task=Buy milk", "--event=2026-03-04-Trip")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        names = [item["name"] for item in self.send({"command": "search", "query": ""})["items"]]
+        self.assertEqual(names, ["Weekly", "Trip", "Existing task", "Buy milk"])
+        self.assertEqual(self.read_lines(self.repository.tasks_file)[-1], '0,0,0,"Buy milk",normal')
+
+    def test_second_daemon_does_not_start(self):
+        result = self.run_calcure("--daemon")
+        self.assertIn("already running", result.stdout)
+        self.assertEqual(self.send({"command": "ping"}), {"ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
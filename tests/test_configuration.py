@@ -0,0 +1,145 @@
+"""Tests of reading the config file, its cache, and applying its edits without restart"""
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import contextlib
+from unittest import mock
+
+from calcure.configuration import Config
+from calcure.data import AppState, CALENDAR_COLORS_START
+
+
+class ConfigTest(unittest.TestCase):
+    """Load the config from a temporary home, with the given user arguments"""
+
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home, True)
+        environment = mock.patch.dict(os.environ, {"HOME": self.home, "XDG_CACHE_HOME": self.home + "/cache"})
+        environment.start()
+        self.addCleanup(environment.stop)
+        self.config_file = self.home + "/config.ini"
+        self.set_arguments()
+
+    def set_arguments(self, *arguments):
+        arguments = mock.patch.object(sys, "argv", ["calcure", *arguments])
+        arguments.start()
+        self.addCleanup(arguments.stop)
+
+    def load(self):
+        """Load the config and return it with what it printed"""
+        config = Config(self.config_file)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            config.load()
+        return config, output.getvalue()
+
+    def edit(self, old_line, new_line):
+        """Replace the line of the config file, so that its size and time change"""
+        with open(self.config_file, encoding="utf-8") as f:
+            text = f.read()
+        self.assertIn(old_line, text)
+        with open(self.config_file, "w", encoding="utf-8") as f:
+            f.write(text.replace(old_line, new_line + " "))
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class ConfigCacheTest(ConfigTest):
+
+    def test_settings_are_read_from_cache(self):
+        config, _ = self.load()
+        self.assertTrue(os.path.exists(config.cache_file))
+        with mock.patch.object(Config, "parse_config_file", side_effect=AssertionError):
+            cached_config, _ = self.load()
+        self.assertEqual(cached_config.DEFAULT_VIEW, AppState.CALENDAR)
+        self.assertEqual([vars(c) for c in cached_config.CALENDARS], [vars(c) for c in config.CALENDARS])
+        for name in ["LANG", "SPLIT_SCREEN", "WEATHER_CITY", "EVENTS_FILE"]:
+            self.assertEqual(getattr(cached_config, name), getattr(config, name))
+
+    def test_edited_file_is_parsed_again(self):
+        self.load()
+        self.edit("split_screen = Yes", "split_screen = No")
+        config, _ = self.load()
+        self.assertFalse(config.SPLIT_SCREEN)
+
+    def test_broken_cache_is_ignored(self):
+        config, _ = self.load()
+        with open(config.cache_file, "wb") as f:
+            f.write(b"broken")
+        self.assertTrue(self.load()[0].SPLIT_SCREEN)
+
+    def test_calendar_sections(self):
+        self.load()
+        with open(self.config_file, "a", encoding="utf-8") as f:
+            f.write("\n[Calendar Work]\nfile = ~/work.csv\ncolor = 3\nprivacy = Yes\n"
+                    "\n[Calendar Holidays]\nfile = /shared/holidays.csv\nread_only = Yes\n")
+        config, _ = self.load()
+        self.assertEqual([vars(calendar) for calendar in config.CALENDARS], [
+            {"name": "Work", "file": self.home + "/work.csv", "color": 3, "color_pair": CALENDAR_COLORS_START,
+             "read_only": False, "privacy": True},
+            {"name": "Holidays", "file": "/shared/holidays.csv", "color": config.COLOR_EVENTS,
+             "color_pair": CALENDAR_COLORS_START + 1, "read_only": True, "privacy": False},
+            ])
+
+
+class ConfigReloadTest(ConfigTest):
+
+    def test_unchanged_file_is_not_reloaded(self):
+        config, _ = self.load()
+        version = config.version
+        self.assertEqual(config.reload_if_changed(), set())
+        self.assertEqual(config.version, version)
+
+    def test_edits_are_applied(self):
+        config, _ = self.load()
+        version = config.version
+        self.edit("split_screen = Yes", "split_screen = No")
+        self.assertEqual(config.reload_if_changed(), {"SPLIT_SCREEN"})
+        self.assertFalse(config.SPLIT_SCREEN)
+        self.assertEqual(config.version, version + 1)
+        self.assertEqual(config.reload_if_changed(), set())
+
+    def test_restart_settings_are_not_changed(self):
+        config, _ = self.load()
+        self.edit("language = en", "language = ru")
+        self.edit("use_persian_calendar = No", "use_persian_calendar = Yes")
+        self.edit(f"folder_with_datafiles = {config.data_folder}", "folder_with_datafiles = " + self.home + "/other")
+        self.assertEqual(config.reload_if_changed(), set())
+        self.assertEqual(config.LANG, "en")
+        self.assertFalse(config.USE_PERSIAN_CALENDAR)
+        self.assertNotIn("other", config.EVENTS_FILE)
+
+    def test_file_with_errors_is_ignored(self):
+        config, _ = self.load()
+        self.edit("split_screen = Yes", "split_screen = Maybe")
+        self.assertEqual(config.reload_if_changed(), set())
+        self.assertTrue(config.SPLIT_SCREEN)
+
+    def test_user_arguments_are_not_read_again(self):
+        data_folder = self.home + "/data"
+        self.set_arguments("-v", "-p", "--folder=" + data_folder)
+        config, output = self.load()
+        self.assertEqual(output.count("version"), 1)
+        os.rmdir(data_folder)
+
+        self.edit("split_screen = Yes", "split_screen = No")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            changed_settings = config.reload_if_changed()
+        self.assertEqual(changed_settings, {"SPLIT_SCREEN"})
+        self.assertEqual(output.getvalue(), "")
+        self.assertFalse(os.path.exists(data_folder))
+
+        # Settings given in arguments keep priority over the file:
+        self.assertTrue(config.PRIVACY_MODE)
+        self.assertEqual(config.DEFAULT_VIEW, AppState.EXIT)
+        self.assertEqual(config.EVENTS_FILE, data_folder + "/events.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
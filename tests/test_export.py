@@ -0,0 +1,100 @@
+"""Tests of exporting events and tasks into iCalendar and JSON Lines formats"""
+
+import json
+import unittest
+
+from calcure.data import *
+from calcure.repository import Exporter
+
+
+def event(item_id, date, name, repetition=1, frequency=Frequency.ONCE, status=Status.NORMAL, privacy=False):
+    year, month, day = date
+    return UserEvent(item_id, year, month, day, name, repetition, frequency, status, privacy)
+
+
+def task(item_id, name, date=(0, 0, 0), status=Status.NORMAL):
+    return Task(item_id, name, status, Timer([]), False, *date)
+
+
+def records(exporter):
+    return [json.loads(line) for line in exporter.iterate_jsonl_lines()]
+
+
+class ExporterPeriodTest(unittest.TestCase):
+
+    def dates(self, exporter):
+        return [(item_type, (item.year, item.month, item.day)) for item_type, item in exporter.iterate_items()]
+
+    def test_first_and_last_days_of_period_are_included(self):
+        events = [event(1, (2026, 2, 28), "Before"), event(2, (2026, 3, 1), "First"),
+                  event(3, (2026, 3, 31), "Last"), event(4, (2026, 4, 1), "After")]
+        exporter = Exporter(events, [], False, (2026, 3, 1), (2026, 3, 31))
+        self.assertEqual(self.dates(exporter), [("event", (2026, 3, 1)), ("event", (2026, 3, 31))])
+
+    def test_repetitions_are_cut_to_period(self):
+        events = [event(1, (2026, 1, 30), "Weekly", 10, Frequency.WEEKLY)]
+        exporter = Exporter(events, [], False, (2026, 2, 13), (2026, 2, 27))
+        self.assertEqual(self.dates(exporter), [("repetition", (2026, 2, 13)), ("repetition", (2026, 2, 20)),
+                                                ("repetition", (2026, 2, 27))])
+
+    def test_repetitions_cross_year_and_month_ends(self):
+        events = [event(1, (2025, 12, 30), "Daily", 5, Frequency.DAILY),
+                  event(2, (2025, 1, 31), "Monthly", 3, Frequency.MONTHLY)]
+        exporter = Exporter(events, [], False, (2026, 1, 1), (2026, 1, 31))
+        self.assertEqual(self.dates(exporter), [("repetition", (2026, 1, 1)), ("repetition", (2026, 1, 2)),
+                                                ("repetition", (2026, 1, 3))])
+
+    def test_open_period_exports_everything(self):
+        events = [event(1, (2020, 5, 5), "Old", 3, Frequency.YEARLY)]
+        tasks = [task(1, "Deadline", (2030, 1, 1)), task(2, "No deadline")]
+        exporter = Exporter(events, tasks, False)
+        self.assertEqual(self.dates(exporter), [("event", (2020, 5, 5)), ("repetition", (2021, 5, 5)),
+                                                ("repetition", (2022, 5, 5)), ("deadline", (2030, 1, 1))])
+
+    def test_deadlines_holidays_and_birthdays_in_period(self):
+        tasks = [task(1, "Due", (2026, 6, 1)), task(2, "Later", (2026, 7, 1))]
+        holidays = Events()
+        holidays.items = [Event(2026, 6, 2, "Holiday"), Event(2027, 6, 2, "Next year")]
+        birthdays = Events()
+        birthdays.items = [Event(1990, 6, 3, "Friend"), Event(1990, 8, 3, "Other friend")]
+        exporter = Exporter([], tasks, False, (2026, 5, 1), (2026, 6, 30), holidays, birthdays)
+        self.assertEqual(self.dates(exporter), [("deadline", (2026, 6, 1)), ("holiday", (2026, 6, 2)),
+                                                ("birthday", (2026, 6, 3))])
+
+
+class ExporterFormatTest(unittest.TestCase):
+
+    def test_jsonl_records(self):
+        events = [event(7, (2026, 3, 4), "Trip to Zürich", status=Status.IMPORTANT, privacy=True)]
+        tasks = [task(3, "Report", (2026, 3, 5), Status.DONE)]
+        self.assertEqual(records(Exporter(events, tasks, False)), [
+            {"type": "event", "id": 7, "date": "2026-03-04", "name": "Trip to Zürich",
+             "status": "important", "private": True},
+            {"type": "deadline", "id": 3, "date": "2026-03-05", "name": "Report", "status": "done", "private": False},
+            ])
+
+    def test_ics_calendar(self):
+        events = [event(7, (2026, 3, 4), "Lunch; with Ann, Bob", status=Status.IMPORTANT, privacy=True)]
+        lines = list(Exporter(events, [], False).iterate_ics_lines())
+        self.assertTrue(all(line.endswith("\r\n") for line in lines))
+        text = "".join(lines)
+        self.assertTrue(text.startswith("BEGIN:VCALENDAR\r\nVERSION:2.0\r\n"))
+        self.assertTrue(text.endswith("END:VCALENDAR\r\n"))
+        self.assertIn("UID:event-7-20260304@calcure\r\n", text)
+        self.assertIn("DTSTART;VALUE=DATE:20260304\r\n", text)
+        self.assertIn("SUMMARY:Lunch\\; with Ann\\, Bob\r\n", text)
+        self.assertIn("CLASS:PRIVATE\r\n", text)
+        self.assertIn("PRIORITY:1\r\n", text)
+        self.assertRegex(text, r"DTSTAMP:\d{8}T\d{6}Z\r\n")
+
+    def test_ics_long_lines_are_folded(self):
+        name = "Встреча " * 20
+        lines = list(Exporter([event(1, (2026, 3, 4), name)], [], False).iterate_ics_lines())
+        for line in "".join(lines).split("\r\n"):
+            self.assertLessEqual(len(line.encode("utf-8")), 75)
+        unfolded = "".join(lines).replace("\r\n ", "")
+        self.assertIn(f"SUMMARY:{name}\r\n", unfolded)
+
+
+if __name__ == "__main__":
+    unittest.main()
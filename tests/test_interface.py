@@ -0,0 +1,176 @@
+"""Tests of the screens drawn into fake windows, without a terminal"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calcure.configuration import cf
+from calcure.headless import FakeWindow, headless_curses
+from calcure.benchmark import generate_events, generate_tasks
+from calcure.data import AppState, CalState, Events
+
+
+def setUpModule():
+    """Load the default config from a temporary home, so that the user's files are never touched"""
+    global home
+    home = tempfile.TemporaryDirectory()
+    environment = {name: os.environ.get(name) for name in ("HOME", "XDG_CACHE_HOME")}
+    os.environ["HOME"] = home.name
+    os.environ.pop("XDG_CACHE_HOME", None)
+    try:
+        cf.__init__()
+        cf.load()
+    finally:
+        for name, value in environment.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def tearDownModule():
+    home.cleanup()
+
+
+class MonthlyScreenTest(unittest.TestCase):
+
+    def setUp(self):
+        from calcure.screen import Screen
+        from calcure.weather import Weather
+        from calcure.data import MonthModelCache
+        import calcure.interface as interface
+
+        self.curses = headless_curses(40, 120)
+        self.curses.__enter__()
+        self.addCleanup(self.curses.__exit__, None, None, None)
+        self.window = FakeWindow(40, 120)
+        self.screen = Screen(self.window, False, AppState.CALENDAR, False, 25, False)
+        self.screen.update_frame()
+        self.user_events = generate_events(1000, start_date=self.screen.today.replace(month=1, day=1))
+        month_models = MonthModelCache(self.user_events, generate_tasks(100), Events(), Events())
+        self.monthly_view = interface.MonthlyScreenView(self.window, 0, 0, Weather(""), month_models, self.screen)
+
+    def press(self, key):
+        from calcure.controls import control_monthly_screen
+        self.window.keys.append(key)
+        control_monthly_screen(self.window, self.user_events, self.screen, None)
+
+    def test_render_does_not_change_selected_day(self):
+        self.screen.day = 3
+        self.monthly_view.render()
+        self.assertEqual(self.screen.day, 3)
+
+    def test_render_marks_today(self):
+        today = self.screen.today
+        self.monthly_view.render()
+        self.assertIn(f"{today.day}{cf.TODAY_ICON}", self.window.text())
+
+    def test_weekly_view_opens_on_today(self):
+        self.monthly_view.render()
+        self.press("w")
+        self.assertEqual(self.screen.calendar_state, CalState.WEEKLY)
+        self.assertEqual(self.screen.date, self.screen.today)
+
+    def test_agenda_of_other_month_starts_on_its_first_day(self):
+        self.press("n")
+        self.monthly_view.render()
+        self.press("s")
+        self.assertEqual(self.screen.calendar_state, CalState.AGENDA)
+        self.assertEqual(self.screen.day, 1)
+        self.assertEqual(self.screen.month, self.screen.today.month % 12 + 1)
+
+
+class JournalScreenTest(unittest.TestCase):
+
+    def setUp(self):
+        from calcure.screen import Screen
+        from calcure.weather import Weather
+        import calcure.interface as interface
+
+        self.curses = headless_curses(40, 120)
+        self.curses.__enter__()
+        self.addCleanup(self.curses.__exit__, None, None, None)
+        self.window = FakeWindow(40, 120)
+        self.screen = Screen(self.window, False, AppState.JOURNAL, False, 25, False)
+        self.screen.update_frame()
+        self.user_tasks = generate_tasks(100)
+        self.journal_view = interface.JournalScreenView(self.window, 0, 0, Weather(""), self.user_tasks, self.screen)
+
+    def press(self, *keys):
+        from calcure.controls import control_journal_screen
+        self.window.keys.extend(keys)
+        control_journal_screen(self.window, self.user_tasks, self.screen, None)
+        self.journal_view.render()
+
+    def test_scrolled_task_is_edited_on_its_row(self):
+        self.journal_view.render()
+        self.press("KEY_NPAGE")
+        self.press("KEY_NPAGE")
+        offset = self.screen.journal_offset
+        self.assertGreater(offset, 0)
+        self.press("e")
+        self.press(str(offset + 5), "Edited task")
+        self.assertEqual(self.user_tasks.items[offset + 4].name, "Edited task")
+        self.assertIn("Edited task", self.window.line(offset + 4 - self.screen.journal_offset + 2))
+
+    def test_task_out_of_view_is_edited_on_prompt_line(self):
+        self.journal_view.render()
+        self.press("e")
+        self.press("90", "Edited task")
+        self.assertEqual(self.user_tasks.items[89].name, "Edited task")
+        self.assertEqual(self.screen.journal_offset, 0)
+
+
+class SeparatorTest(unittest.TestCase):
+
+    def render(self, y_max, x_max, journal_pane_width=None):
+        """Draw the separator of the split screen into a window of this size"""
+        from calcure.screen import Screen
+        import calcure.interface as interface
+
+        window = FakeWindow(y_max, x_max)
+        screen = Screen(window, False, AppState.CALENDAR, True, 25, False)
+        screen.update_frame()
+        if journal_pane_width is not None:
+            width = mock.patch.object(Screen, "journal_pane_width", new_callable=mock.PropertyMock,
+                                      return_value=journal_pane_width)
+            width.start()
+            self.addCleanup(width.stop)
+        with headless_curses(y_max, x_max):
+            interface.SeparatorView(window, 0, 0, screen).render()
+        return window
+
+    def test_separator_is_drawn_on_full_height(self):
+        window = self.render(40, 120)
+        column = 120 - 120//4
+        self.assertEqual([window.line(y)[column] for y in range(40)], [cf.SEPARATOR_ICON]*40)
+
+    def test_small_terminals(self):
+        for boarders in [False, True]:
+            with mock.patch.object(cf, "SHOW_CALENDAR_BOARDERS", boarders):
+                for y_max, x_max in [(40, 1), (40, 2), (40, 4), (1, 120), (2, 120), (3, 120), (1, 1)]:
+                    self.render(y_max, x_max)
+
+    def test_journal_pane_wider_than_screen(self):
+        for width in [120, 121, 200, 1, 0]:
+            window = self.render(40, 120, width)
+            self.assertNotIn(cf.SEPARATOR_ICON, window.line(39)[-1])
+
+
+class JournalAllocationTest(unittest.TestCase):
+
+    def test_cached_views_are_not_allocated_again(self):
+        import io
+        import json
+        from calcure.benchmark import run_allocations
+
+        output = io.StringIO()
+        run_allocations(200, 3, 120, output)
+        results = {result["view_cache"]: result for result in map(json.loads, output.getvalue().splitlines())}
+        self.assertLess(results[True]["mean_blocks"]*5, results[False]["mean_blocks"])
+        self.assertLess(results[True]["mean_kib"]*5, results[False]["mean_kib"])
+
+
+if __name__ == "__main__":
+    unittest.main()
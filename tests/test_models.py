@@ -0,0 +1,65 @@
+"""Tests of the cached models that calendars are drawn from"""
+
+import datetime
+import unittest
+
+from calcure.data import *
+from calcure.benchmark import generate_events, generate_tasks
+
+
+class MonthModelCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.user_events = generate_events(1000)
+        self.user_tasks = generate_tasks(100)
+        self.month_models = MonthModelCache(self.user_events, self.user_tasks, Events(), Events())
+        self.deadline = next(task for task in self.user_tasks.items if task.year > 0)
+        self.month = (self.deadline.year, self.deadline.month, 1, False)
+
+    def test_timer_does_not_rebuild_month(self):
+        model = self.month_models.get(*self.month)
+        self.user_tasks.add_timestamp_for_task(self.deadline.item_id)
+        self.user_tasks.reset_timer_for_task(self.deadline.item_id)
+        self.assertGreater(self.user_tasks.version, 0)
+        self.assertIs(self.month_models.get(*self.month), model)
+
+    def test_changed_deadline_rebuilds_month(self):
+        model = self.month_models.get(*self.month)
+        day = 1 if self.deadline.day != 1 else 2
+        self.user_tasks.change_deadline(self.deadline.item_id, self.deadline.year, self.deadline.month, day)
+        new_model = self.month_models.get(*self.month)
+        self.assertIsNot(new_model, model)
+        self.assertIn(self.deadline, new_model.days[day].deadlines)
+
+    def test_renamed_deadline_rebuilds_month(self):
+        model = self.month_models.get(*self.month)
+        self.user_tasks.rename_item(self.deadline.item_id, "Renamed task")
+        self.assertIsNot(self.month_models.get(*self.month), model)
+
+    def test_task_without_deadline_does_not_rebuild_month(self):
+        model = self.month_models.get(*self.month)
+        task = next(task for task in self.user_tasks.items if task.year == 0)
+        self.user_tasks.rename_item(task.item_id, "Renamed task")
+        self.user_tasks.add_item(Task(self.user_tasks.generate_id(), "New task", Status.NORMAL, Timer([]), False))
+        self.assertIs(self.month_models.get(*self.month), model)
+
+    def test_new_event_rebuilds_month(self):
+        model = self.month_models.get(*self.month)
+        year, month = self.month[:2]
+        self.user_events.add_item(UserEvent(len(self.user_events.items), year, month, 1, "New event",
+                                            1, Frequency.ONCE, Status.NORMAL, False))
+        self.assertIsNot(self.month_models.get(*self.month), model)
+
+
+class PeriodModelCacheTest(unittest.TestCase):
+
+    def test_timer_does_not_rebuild_period(self):
+        user_tasks = generate_tasks(100)
+        period_models = PeriodModelCache(generate_events(1000), user_tasks, Events(), Events())
+        model = period_models.get(datetime.date(2024, 3, 4), 7, False)
+        user_tasks.add_timestamp_for_task(user_tasks.items[0].item_id)
+        self.assertIs(period_models.get(datetime.date(2024, 3, 4), 7, False), model)
+
+
+if __name__ == "__main__":
+    unittest.main()
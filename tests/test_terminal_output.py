@@ -0,0 +1,96 @@
+"""Tests of how much the program writes to a real terminal, run in a pseudo-terminal"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+from calcure.latency import write_data_files
+
+try:
+    import pty
+    import fcntl
+    import select
+    import struct
+    import termios
+except ImportError:
+    pty = None
+
+
+@unittest.skipIf(pty is None, "pseudo-terminals are not available")
+class TerminalOutputTest(unittest.TestCase):
+    """Run the program in a 120x40 terminal and count the bytes it writes after each key press"""
+
+    def setUp(self):
+        home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, home, True)
+        data_folder = home + "/data"
+        os.makedirs(data_folder)
+        write_data_files(data_folder, 500, 0)
+
+        # The program finds its modules, config, and data in the temporary folders:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        environment = dict(os.environ, HOME=home, TERM="xterm-256color", PYTHONPATH=root)
+        environment.pop("XDG_CACHE_HOME", None)
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:
+            os.execvpe(sys.executable, [sys.executable, "-m", "calcure", "--folder=" + data_folder], environment)
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack("HHHH", 40, 120, 0, 0))
+        self.exited = False
+        self.addCleanup(self.stop)
+        self.read_output(quiet_time=2)
+
+    def stop(self):
+        """Kill the program if it is still running and close the terminal"""
+        if not self.exited:
+            os.kill(self.pid, 9)
+            os.waitpid(self.pid, 0)
+        os.close(self.fd)
+
+    def read_output(self, quiet_time=0.3, max_time=10):
+        """Read everything written to the terminal until it stays quiet for a while"""
+        output = b""
+        end_time = time.monotonic() + max_time
+        while time.monotonic() < end_time:
+            ready, _, _ = select.select([self.fd], [], [], quiet_time)
+            if not ready:
+                break
+            try:
+                output += os.read(self.fd, 65536)
+            except OSError:
+                break
+        return output
+
+    def press(self, key):
+        """Press the key and return what the program wrote in response"""
+        os.write(self.fd, key.encode())
+        output = self.read_output()
+        self.assertNotIn(b"Traceback", output)
+        return output
+
+    def test_navigation_writes_only_changed_cells(self):
+        # Welcome screen is shown on the first run, and the first calendar is drawn in full:
+        full_screen = len(self.press(" "))
+        self.assertGreater(full_screen, 120*20)
+
+        # Month navigation changes the title and events, but not the frame and the journal:
+        for key in "nnppnG":
+            emitted = len(self.press(key))
+            self.assertGreater(emitted, 0)
+            self.assertLess(emitted, full_screen // 2, f"key {key!r} wrote {emitted} bytes")
+
+        self.press("q")
+        self.press("y")
+        for _ in range(50):
+            if os.waitpid(self.pid, os.WNOHANG)[0]:
+                self.exited = True
+                break
+            time.sleep(0.1)
+        else:
+            self.fail("program did not exit")
+
+
+if __name__ == "__main__":
+    unittest.main()
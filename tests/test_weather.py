@@ -0,0 +1,169 @@
+"""Tests of loading the weather from a local stub of the weather server"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from calcure.weather import Weather
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answer requests with the responses prepared by the test, keeping connections alive"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        status, body, delay = self.server.responses.pop(0) if self.server.responses else self.server.default
+        time.sleep(delay)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Weather server on localhost that counts connections and requests"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.connections = 0
+        self.paths = []
+        self.responses = []
+        self.default = (200, "Paris: +20°C", 0)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class WeatherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.cache_file = os.path.join(folder.name, "weather.json")
+
+    def weather(self, city="Paris", max_load_time=2):
+        weather = Weather(city, self.cache_file, 30, self.server.url, max_load_time)
+        self.addCleanup(weather.disconnect)
+        return weather
+
+    def read_cache(self):
+        with open(self.cache_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_connection_is_kept_alive_between_requests(self):
+        weather = self.weather("Paris, Tokyo")
+        weather.load_from_wttr()
+        weather.load_from_wttr()
+        self.assertEqual(self.server.paths, ["/Paris?format=3", "/Tokyo?format=3"]*2)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(weather.forcast, "Paris: +20°C  Paris: +20°C")
+
+    def test_forcast_of_one_city_is_saved_to_cache(self):
+        weather = self.weather()
+        weather.load_from_wttr()
+        self.assertEqual(weather.forcast, " +20°C")
+        entry = self.read_cache()["Paris"]
+        self.assertEqual(entry["forcast"], " +20°C")
+        self.assertEqual(entry["failures"], 0)
+        self.assertAlmostEqual(entry["loaded"], time.time(), delta=5)
+
+    def test_server_errors_are_retried_with_exponential_backoff(self):
+        self.server.default = (500, "Internal error", 0)
+        weather = self.weather()
+        for failures in range(1, 9):
+            weather.load_from_wttr()
+            entry = self.read_cache()["Paris"]
+            self.assertEqual(entry["failures"], failures)
+            retry_time = min(weather.min_retry_time * 2**(failures - 1), weather.max_retry_time)
+            self.assertEqual(weather.update_time(weather.cache_time), entry["failed"] + retry_time)
+        self.assertEqual(weather.forcast, "")
+
+        # Successful load resets the backoff:
+        self.server.default = (200, "Paris: +20°C", 0)
+        weather.load_from_wttr()
+        self.assertEqual(self.read_cache()["Paris"]["failures"], 0)
+        self.assertEqual(weather.update_time(weather.cache_time), self.read_cache()["Paris"]["loaded"] + weather.cache_time)
+
+    def test_slow_server_times_out_and_is_retried_later(self):
+        self.server.responses = [(200, "Paris: +20°C", 1)]
+        weather = self.weather(max_load_time=0.2)
+        start = time.perf_counter()
+        weather.load_from_wttr()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(weather.forcast, "")
+        entry = self.read_cache()["Paris"]
+        self.assertEqual(entry["failures"], 1)
+        self.assertEqual(weather.update_time(weather.cache_time), entry["failed"] + weather.min_retry_time)
+
+    def test_fresh_cache_is_shown_without_network(self):
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({"Paris": {"forcast": " +15°C", "loaded": time.time(), "failures": 0}}, f)
+        weather = self.weather()
+        weather.load_in_background()
+        self.assertEqual(weather.forcast, " +15°C")
+        self.assertFalse(weather.is_loading)
+        self.assertEqual(weather.next_update_time, float("inf"))
+        self.assertEqual(self.server.paths, [])
+        self.assertEqual(self.server.connections, 0)
+
+    def test_expired_cache_is_loaded_again(self):
+        with open(self.cache_file, "w", encoding="utf-8") as f:
+            json.dump({"Paris": {"forcast": " +15°C", "loaded": time.time() - 3600, "failures": 0}}, f)
+        weather = self.weather()
+        loaded = threading.Event()
+        weather.on_update = loaded.set
+        weather.load_in_background()
+        self.assertTrue(loaded.wait(5))
+        self.assertEqual(weather.forcast, " +20°C")
+        self.assertEqual(self.server.paths, ["/Paris?format=3"])
+
+    def test_unwritable_cache_does_not_cause_immediate_reload(self):
+        self.cache_file = os.path.join(self.cache_file, "missing", "weather.json")
+        weather = self.weather()
+        weather.load_from_wttr()
+        self.assertEqual(weather.forcast, " +20°C")
+        self.assertGreater(weather.update_time(weather.cache_time), time.time() + weather.cache_time - 5)
+
+        self.server.default = (500, "Internal error", 0)
+        weather.load_from_wttr()
+        weather.load_from_wttr()
+        self.assertGreater(weather.update_time(weather.cache_time), time.time() + 2*weather.min_retry_time - 5)
+
+    def test_background_loading_with_unwritable_cache_requests_once(self):
+        self.cache_file = os.path.join(self.cache_file, "missing", "weather.json")
+        for response in [(200, "Paris: +20°C", 0), (500, "Internal error", 0)]:
+            self.server.default = response
+            self.server.paths = []
+            weather = self.weather()
+            loaded = threading.Event()
+            weather.on_update = loaded.set
+            weather.load_in_background()
+            self.assertTrue(loaded.wait(5))
+            time.sleep(0.2)
+            self.assertEqual(self.server.paths, ["/Paris?format=3"])
+            self.assertEqual(weather.next_update_time, float("inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()